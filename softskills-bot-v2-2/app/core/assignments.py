@@ -0,0 +1,150 @@
+# app/core/assignments.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+# Πόσες ανθρώπινες βαθμολογίες θέλουμε ανά answer (default: 2 raters για IRR)
+DEFAULT_TARGET_RATINGS = 2
+# Διάρκεια lease (δευτερόλεπτα) πριν επιστρέψει στο pool
+DEFAULT_LEASE_SECONDS = 15 * 60
+
+
+def expire_stale(session: Session) -> int:
+    """Ληγμένα leases → 'expired' (επιστρέφουν στο pool). Δεν κάνει commit."""
+    res = session.execute(text("""
+        UPDATE rater_assignments
+           SET status = 'expired'
+         WHERE status = 'leased' AND expires_at <= now()
+    """))
+    return max(0, res.rowcount or 0)
+
+
+def lease_batch(
+    session: Session,
+    rater_id: str,
+    *,
+    limit: int = 20,
+    target: int = DEFAULT_TARGET_RATINGS,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    category: Optional[str] = None,
+    qtype: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Δίνει στον rater έως `limit` answers που:
+    - δεν έχει ήδη βαθμολογήσει / δεν κρατάει ήδη
+    - έχουν (ratings + ενεργά leases άλλων) < target
+    Δύο βήματα: (1) κλείδωμα υποψηφίων answers με FOR NO KEY UPDATE SKIP LOCKED,
+    (2) νέο statement (νέο snapshot σε READ COMMITTED) που ξαναμετράει ratings/leases
+    ΑΦΟΥ κρατάμε το lock. Έτσι όποιος κλείδωσε πριν από εμάς έχει ήδη κάνει commit
+    και το lease του μετράει → ποτέ πάνω από το target. Το NO KEY δεν μπλοκάρει
+    τα FK inserts στο human_ratings. Δεν κάνει commit.
+    """
+    expire_stale(session)
+
+    where: List[str] = []
+    params: Dict[str, Any] = {
+        "rid": rater_id,
+        "lim": int(limit),
+        "target": int(target),
+        "ttl": int(lease_seconds),
+    }
+    if category:
+        where.append("a.category = :cat"); params["cat"] = category
+    if qtype:
+        where.append("a.qtype = :qt"); params["qt"] = qtype
+    filt_sql = (" AND " + " AND ".join(where)) if where else ""
+
+    # ίδιο φίλτρο και στα δύο βήματα· στο (1) είναι μόνο προεπιλογή
+    eligible_sql = """
+        NOT EXISTS (
+            SELECT 1 FROM human_ratings h
+            WHERE h.answer_id = a.answer_id AND h.rater_id = :rid
+          )
+      AND NOT EXISTS (
+            SELECT 1 FROM rater_assignments x
+            WHERE x.answer_id = a.answer_id AND x.rater_id = :rid AND x.status = 'leased'
+          )
+      AND (
+            COALESCE((SELECT g.n FROM rating_aggregates g WHERE g.answer_id = a.answer_id), 0)
+          + (SELECT COUNT(*) FROM rater_assignments x
+              WHERE x.answer_id = a.answer_id AND x.status = 'leased')
+          ) < :target
+    """
+
+    locked = session.execute(text(f"""
+        SELECT a.answer_id
+        FROM answers a
+        WHERE {eligible_sql}
+          {filt_sql}
+        ORDER BY a.created_at, a.answer_id
+        LIMIT :lim
+        FOR NO KEY UPDATE OF a SKIP LOCKED
+    """), params).scalars().all()
+    if not locked:
+        return []
+
+    rows = session.execute(text(f"""
+        INSERT INTO rater_assignments AS r (answer_id, rater_id, status, leased_at, expires_at, completed_at)
+        SELECT a.answer_id, :rid, 'leased', now(), now() + make_interval(secs => :ttl), NULL
+        FROM answers a
+        WHERE a.answer_id = ANY(CAST(:ids AS uuid[]))
+          AND {eligible_sql}
+        ORDER BY a.created_at, a.answer_id
+        ON CONFLICT (answer_id, rater_id) DO UPDATE
+          SET status = 'leased', leased_at = now(),
+              expires_at = EXCLUDED.expires_at, completed_at = NULL
+        RETURNING r.answer_id, r.expires_at
+    """), {**params, "ids": [str(x) for x in locked]}).mappings().all()
+
+    return [{"answerId": str(r["answer_id"]), "expiresAt": r["expires_at"]} for r in rows]
+
+
+def release(session: Session, rater_id: str, answer_ids: Optional[List[str]] = None) -> int:
+    """Επιστρέφει leases στο pool (όλα του rater αν answer_ids=None). Δεν κάνει commit."""
+    sql = """
+        UPDATE rater_assignments
+           SET status = 'released'
+         WHERE rater_id = :rid AND status = 'leased'
+    """
+    params: Dict[str, Any] = {"rid": rater_id}
+    if answer_ids is not None:
+        sql += " AND answer_id = ANY(CAST(:ids AS uuid[]))"
+        params["ids"] = answer_ids
+    res = session.execute(text(sql), params)
+    return max(0, res.rowcount or 0)
+
+
+def throughput_stats(session: Session, window_minutes: int = 60) -> List[Dict[str, Any]]:
+    """Ανά rater: ενεργά leases, ολοκληρωμένα (σύνολο / στο παράθυρο), μέσος χρόνος ανά item."""
+    rows = session.execute(text("""
+        SELECT rater_id,
+               COUNT(*) FILTER (WHERE status = 'leased' AND expires_at > now())     AS active,
+               COUNT(*) FILTER (WHERE status = 'done')                             AS done,
+               COUNT(*) FILTER (WHERE status = 'done'
+                                  AND completed_at > now() - make_interval(mins => :win)) AS done_window,
+               COUNT(*) FILTER (WHERE status IN ('expired', 'released'))           AS returned,
+               AVG(EXTRACT(EPOCH FROM (completed_at - leased_at)))
+                   FILTER (WHERE status = 'done')                                  AS avg_seconds,
+               MAX(completed_at)                                                   AS last_done_at
+        FROM rater_assignments
+        GROUP BY rater_id
+        ORDER BY rater_id
+    """), {"win": int(window_minutes)}).mappings().all()
+
+    out: List[Dict[str, Any]] = []
+    for r in rows:
+        done_window = int(r["done_window"] or 0)
+        out.append({
+            "rater_id": r["rater_id"],
+            "active": int(r["active"] or 0),
+            "done": int(r["done"] or 0),
+            "done_window": done_window,
+            "per_hour": round(done_window * 60.0 / window_minutes, 2),
+            "returned": int(r["returned"] or 0),
+            "avg_seconds": round(float(r["avg_seconds"]), 1) if r["avg_seconds"] is not None else None,
+            "last_done_at": r["last_done_at"],
+        })
+    return out
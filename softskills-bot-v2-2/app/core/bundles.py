@@ -0,0 +1,160 @@
+# app/core/bundles.py
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.question_bank import get_bank
+from app.core.questions import build_bundle, bundle_rng, get_categories
+from app.core.telemetry import cache_result
+
+# Seeded quiz bundles: ίδιο (category, phase, attempt, seed, n_open, n_mc, include_correct)
+# + ίδια έκδοση τράπεζας ⇒ ίδια bytes. Τα κρατάμε rendered (body + strong ETag) σε LRU,
+# και το prerender τα γράφει σε αρχεία με το ίδιο layout με το path route
+# (/questions/bundle/{category}/{phase}/{attempt}/{seed}.json) για ανέβασμα σε CDN.
+
+MAX_ENTRIES = 1024
+# Με έκδοση τράπεζας στο ETag· αλλαγή έκδοσης ⇒ νέο ETag, άρα αρκεί revalidation
+CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+# Με τις σωστές απαντήσεις: ποτέ σε shared cache
+CACHE_CONTROL_PRIVATE = "private, max-age=3600"
+
+_LOCK = threading.Lock()
+_CACHE: "OrderedDict[Tuple, Tuple[bytes, str]]" = OrderedDict()
+
+
+def _payload(
+    category: str, phase: str, attempt: int, seed: Any, n_open: int, n_mc: int, include_correct: bool
+) -> Dict[str, Any]:
+    resp = build_bundle(
+        category=category,
+        n_open=n_open,
+        n_mc=n_mc,
+        hide_correct=not include_correct,
+        phase=phase,
+        attempt=attempt,
+        rng=bundle_rng(category, phase, attempt, seed),
+    )
+    resp["used_fallback"] = False
+    resp["phase"] = phase
+    resp["attempt"] = attempt
+    resp["seed"] = seed
+    resp["bank_version"] = get_bank().version
+    return resp
+
+
+def render_bundle(
+    category: str,
+    phase: str,
+    attempt: int,
+    seed: Any,
+    *,
+    n_open: int = 6,
+    n_mc: int = 6,
+    include_correct: bool = False,
+) -> Tuple[bytes, str, bool]:
+    """(body, strong ETag, cache hit). Το body είναι canonical JSON (σταθερή σειρά / separators)."""
+    key = (get_bank().version, category, phase, attempt, str(seed), n_open, n_mc, include_correct)
+    with _LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+    cache_result("bundle", hit is not None)
+    if hit is not None:
+        return hit[0], hit[1], True
+
+    resp = _payload(category, phase, attempt, seed, n_open, n_mc, include_correct)
+    body = json.dumps(resp, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    with _LOCK:
+        _CACHE[key] = (body, etag)
+        while len(_CACHE) > MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+    return body, etag, False
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+
+
+# ---------------------------------------------------------------------
+# Prerender για CDN: python -m app.core.bundles --out dist --seeds 0-99
+# ---------------------------------------------------------------------
+def _seed_range(spec: str) -> List[int]:
+    out: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            out.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            out.append(int(part))
+    return out
+
+
+def prerender(
+    out_dir: Path,
+    seeds: Iterable[int],
+    *,
+    categories: Optional[Iterable[str]] = None,
+    phases: Iterable[str] = ("PRE", "POST"),
+    attempts: Iterable[int] = (1, 2),
+    n_open: int = 6,
+    n_mc: int = 6,
+) -> Dict[str, Any]:
+    """Γράφει όλα τα bundles (χωρίς σωστές απαντήσεις) + manifest.json με τα ETags."""
+    seeds = list(seeds)
+    cats = list(categories) if categories else get_categories("PRE") + ["ALL"]
+    files: Dict[str, str] = {}
+    for cat in cats:
+        for phase in phases:
+            for attempt in attempts:
+                for seed in seeds:
+                    body, etag, _ = render_bundle(cat, phase, attempt, seed, n_open=n_open, n_mc=n_mc)
+                    rel = f"questions/bundle/{cat}/{phase}/{attempt}/{seed}.json"
+                    path = out_dir / rel
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_bytes(body)
+                    files[rel] = etag
+    manifest = {
+        "bank_version": get_bank().version,
+        "n_open": n_open,
+        "n_mc": n_mc,
+        "cache_control": CACHE_CONTROL,
+        "files": files,
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Prerender seeded quiz bundles για CDN")
+    ap.add_argument("--out", required=True, type=Path)
+    ap.add_argument("--seeds", default="0-99", help="π.χ. 0-99 ή 1,2,5-9")
+    ap.add_argument("--category", action="append", dest="categories")
+    ap.add_argument("--phase", action="append", dest="phases", choices=["PRE", "POST"])
+    ap.add_argument("--attempt", action="append", dest="attempts", type=int, choices=[1, 2])
+    ap.add_argument("--n-open", type=int, default=6)
+    ap.add_argument("--n-mc", type=int, default=6)
+    args = ap.parse_args(argv)
+
+    manifest = prerender(
+        args.out,
+        _seed_range(args.seeds),
+        categories=args.categories,
+        phases=args.phases or ("PRE", "POST"),
+        attempts=args.attempts or (1, 2),
+        n_open=args.n_open,
+        n_mc=args.n_mc,
+    )
+    print(f"[bundles] wrote {len(manifest['files'])} files to {args.out} (bank {manifest['bank_version']})")
+
+
+if __name__ == "__main__":
+    main()
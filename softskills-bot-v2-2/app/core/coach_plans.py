@@ -0,0 +1,268 @@
+# app/core/coach_plans.py
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.coach import make_heuristic_session_plan
+from app.core.settings import settings
+from app.core.telemetry import cache_result, llm_fallback, observe_llm
+from app.core.tracing import span
+
+# Cache για τα session plans του /coach/session-plan.
+# Το prompt εξαρτάται μόνο από τους μέσους όρους (aggregate_session) και το
+# pick_weakest, οπότε τα κβαντίζουμε σε κάδους των BUCKET μονάδων (0..10):
+#   key    = weakest kind:name:κάδος | κάδοι dimensions | κάδοι criteria
+#   coarse = μόνο weakest kind:name:κάδος (τα προ-παραγμένα plans)
+# Σειρά: cache στη μνήμη → προ-παραγμένο αρχείο → LLM εντός COACH_PLAN_BUDGET_SECONDS
+# → make_heuristic_session_plan. Αν το LLM απαντήσει αργότερα, το plan μπαίνει
+# στο cache για τον επόμενο. Ένα LLM call ανά key: όποιος έρθει ενώ τρέχει,
+# περιμένει το ίδιο future μέσα στο δικό του budget.
+
+BUCKET = 2.0
+DIM_KEYS = ("Knowledge_Decision", "Content_Structure", "Delivery_Presence")
+CRIT_KEYS = ("Clarity", "Relevance", "Structure", "Examples")
+MAX_ENTRIES = 512
+DEFAULT_FILE = Path(__file__).resolve().parent.parent / "data" / "coach_plans.json"
+
+_LOCK = threading.Lock()
+_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_INFLIGHT: Dict[str, "Future[Optional[Dict[str, Any]]]"] = {}
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="coach-plan")
+_PREGEN: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def bucket(v: Any) -> Optional[int]:
+    if not isinstance(v, (int, float)):
+        return None
+    return int(min(max(float(v), 0.0), 10.0 - 1e-9) // BUCKET)
+
+
+def midpoint(b: Optional[int]) -> Optional[float]:
+    return None if b is None else round(b * BUCKET + BUCKET / 2, 2)
+
+
+def coarse_key(kind: str, name: str, value: float) -> str:
+    return f"{kind}:{name}:{bucket(value)}"
+
+
+def plan_key(aggr: Dict[str, Any], kind: str, name: str, value: float) -> str:
+    def profile(d: Dict[str, Any], keys: Tuple[str, ...]) -> str:
+        return ",".join("-" if bucket(d.get(k)) is None else str(bucket(d.get(k))) for k in keys)
+
+    dims = aggr.get("dimensions") or {}
+    crit = aggr.get("criteria") or {}
+    return f"{coarse_key(kind, name, value)}|d={profile(dims, DIM_KEYS)}|c={profile(crit, CRIT_KEYS)}"
+
+
+def quantized_summary(aggr: Dict[str, Any], kind: str, name: str, value: float) -> Dict[str, Any]:
+    """Το summary που βλέπει το LLM: μέσα κάδων, ώστε το plan να ισχύει για όλο τον κάδο."""
+    dims = aggr.get("dimensions") or {}
+    crit = aggr.get("criteria") or {}
+    return {
+        "aggregates": {
+            "dimensions": {k: midpoint(bucket(dims.get(k))) for k in DIM_KEYS},
+            "criteria": {k: midpoint(bucket(crit.get(k))) for k in CRIT_KEYS},
+        },
+        "weakest_area": {"type": kind, "name": name, "score": midpoint(bucket(value))},
+    }
+
+
+def session_plan_prompt(summary: Dict[str, Any]) -> str:
+    """
+    Ελάχιστο prompt: δίνουμε aggregates & weakest και ζητάμε 3 βήματα + micro-drill.
+    """
+    dims = summary.get("aggregates", {}).get("dimensions", {})
+    crit = summary.get("aggregates", {}).get("criteria", {})
+    wk   = summary.get("weakest_area", {})
+
+    return (
+        "Είσαι coach soft skills. Με βάση τα παρακάτω aggregates φτιάξε ένα "
+        "σύντομο πλάνο 3 βημάτων + 1 micro-drill για άμεσα βελτίωση.\n\n"
+        f"Dimensions(avg/10): {dims}\n"
+        f"Criteria(avg/10): {crit}\n"
+        f"Weakest: {wk}\n\n"
+        "Επιστροφή ΜΟΝΟ JSON:\n"
+        "{\n"
+        "  \"overview\": \"μία πρόταση με λογική / rationale\",\n"
+        "  \"steps\": [\"βήμα1\",\"βήμα2\",\"βήμα3\"],\n"
+        "  \"practice\": \"μία μικρο-άσκηση (micro-drill)\",\n"
+        "  \"resources\": [{\"title\":\"...\",\"url\":\"...\"}]\n"
+        "}\n"
+    )
+
+
+def llm_enabled() -> bool:
+    return settings.LLM_configured and not settings.HEURISTIC_ONLY
+
+
+def _llm_plan(summary: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Μία (blocking) κλήση στο LLM· None σε οποιοδήποτε σφάλμα ή άκυρο JSON."""
+    model = settings.OPENAI_MODEL or "gpt-4o-mini"
+    t0 = time.perf_counter()
+    try:
+        from app.core.llm import _get_client
+
+        client = _get_client()
+        with span("llm.chat", model=model, kind="session_plan"):
+            resp = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "system", "content": "Return ONLY valid JSON."},
+                          {"role": "user", "content": session_plan_prompt(summary)}],
+                response_format={"type": "json_object"},
+                temperature=getattr(settings, "OPENAI_TEMPERATURE", 0.2) or 0.2,
+            )
+        observe_llm(model, "session_plan", time.perf_counter() - t0, getattr(resp, "usage", None))
+        plan = json.loads(resp.choices[0].message.content or "{}")
+    except Exception as e:
+        observe_llm(model, "session_plan", time.perf_counter() - t0, error=True)
+        print(f"[coach_plans] LLM plan failed: {e!r}")
+        return None
+    if not isinstance(plan, dict) or not plan.get("steps"):
+        return None
+    return plan
+
+
+def pregenerated() -> Dict[str, Dict[str, Any]]:
+    global _PREGEN
+    if _PREGEN is None:
+        path = Path(settings.COACH_PLANS_FILE) if settings.COACH_PLANS_FILE else DEFAULT_FILE
+        try:
+            doc = json.loads(path.read_text(encoding="utf-8"))
+            if float(doc.get("bucket", BUCKET)) != BUCKET:
+                raise ValueError(f"bucket {doc.get('bucket')} != {BUCKET}")
+            _PREGEN = dict(doc.get("plans") or {})
+            print(f"[coach_plans] loaded {len(_PREGEN)} pre-generated plans from {path.name}")
+        except FileNotFoundError:
+            _PREGEN = {}
+        except (OSError, ValueError) as e:
+            print(f"[coach_plans] ignoring {path}: {e}")
+            _PREGEN = {}
+    return _PREGEN
+
+
+def _store(key: str, plan: Dict[str, Any]) -> None:
+    with _LOCK:
+        _CACHE[key] = plan
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+
+
+def lookup(key: str, coarse: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    with _LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+            return hit, "cache"
+    pre = pregenerated()
+    hit = pre.get(key) or pre.get(coarse)
+    if hit is not None:
+        return hit, "pregenerated"
+    return None, None
+
+
+def _generate(key: str, summary: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    plan = _llm_plan(summary)
+    if plan is not None:
+        _store(key, plan)
+    return plan
+
+
+def _forget(key: str, fut: Future) -> None:
+    with _LOCK:
+        if _INFLIGHT.get(key) is fut:
+            del _INFLIGHT[key]
+
+
+def generate(key: str, summary: Dict[str, Any]) -> "Future[Optional[Dict[str, Any]]]":
+    """
+    LLM plan για το key· ένα in-flight ανά key (οι επόμενοι παίρνουν το ίδιο future),
+    το αποτέλεσμα μένει στο cache.
+    """
+    with _LOCK:
+        fut = _INFLIGHT.get(key)
+        if fut is not None:
+            return fut
+        # copy_context: τα spans του LLM call μένουν στο trace του πρώτου request
+        fut = _EXECUTOR.submit(contextvars.copy_context().run, _generate, key, summary)
+        _INFLIGHT[key] = fut
+    # εκτός lock: αν έχει ήδη τελειώσει, το callback τρέχει αμέσως εδώ
+    fut.add_done_callback(lambda f: _forget(key, f))
+    return fut
+
+
+async def session_plan_for(
+    aggr: Dict[str, Any], kind: str, name: str, value: float
+) -> Tuple[Dict[str, Any], str]:
+    """(plan, source) με source ∈ cache | pregenerated | llm | heuristic."""
+    key = plan_key(aggr, kind, name, value)
+    plan, source = lookup(key, coarse_key(kind, name, value))
+    cache_result("coach_plan", plan is not None)
+    if plan is not None:
+        return dict(plan), source
+
+    if llm_enabled():
+        summary = quantized_summary(aggr, kind, name, value)
+        try:
+            # shield: το timeout μας δεν ακυρώνει το κοινό future· το LLM call
+            # συνεχίζει και γεμίζει το cache
+            plan = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(generate(key, summary))),
+                timeout=settings.COACH_PLAN_BUDGET_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            print(f"[coach_plans] budget exceeded for {key}, heuristic fallback")
+            llm_fallback("session_plan", "budget")
+            plan = None
+        else:
+            if plan is None:
+                llm_fallback("session_plan", "error")
+        if plan is not None:
+            return dict(plan), "llm"
+
+    return make_heuristic_session_plan(kind, name, value), "heuristic"
+
+
+def clear_cache() -> None:
+    global _PREGEN
+    with _LOCK:
+        _CACHE.clear()
+        _PREGEN = None
+
+
+if __name__ == "__main__":
+    # python -m app.core.coach_plans [--out app/data/coach_plans.json]
+    # Offline: ένα LLM plan ανά (kind, name, κάδο) για το weakest area.
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default=str(DEFAULT_FILE))
+    args = ap.parse_args()
+    if not llm_enabled():
+        raise SystemExit("χρειάζεται OPENAI_API_KEY (και HEURISTIC_ONLY=false)")
+
+    plans: Dict[str, Dict[str, Any]] = {}
+    combos = [("criterion", n) for n in CRIT_KEYS] + [("dimension", n) for n in DIM_KEYS]
+    for kind, name in combos:
+        for b in range(int(10 // BUCKET)):
+            value = midpoint(b)
+            aggr = ({"dimensions": {}, "criteria": {name: value}} if kind == "criterion"
+                    else {"dimensions": {name: value}, "criteria": {}})
+            plan = _llm_plan(quantized_summary(aggr, kind, name, value))
+            if plan is None:
+                print(f"[coach_plans] skip {kind}:{name}:{b}")
+                continue
+            plans[coarse_key(kind, name, value)] = plan
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"bucket": BUCKET, "plans": plans}, ensure_ascii=False, indent=2),
+                   encoding="utf-8")
+    print(f"[coach_plans] wrote {len(plans)} plans → {out}")
@@ -0,0 +1,168 @@
+# app/core/cohorts.py
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.settings import settings
+from app.core.study_token import make_tokens
+
+# Μαζική έκδοση study tokens για ένα cohort (migration 79f08069040d).
+#   participant_id = uuid5(cohort, student_id) → το ίδιο cohort ξανατρέχει
+#   χωρίς διπλότυπα και με τα ίδια tokens (όσο δεν αλλάζει το STUDY_SECRET).
+# Το CSV έχει το ίδιο layout με το softskills-tokens/quiz_links_out.csv.
+
+LINK_FIELDS = ("#", "student_id", "token", "pre_test_link", "post_test_link")
+MAX_COHORT = 50_000
+BATCH = 5_000
+CSV_CHUNK_ROWS = 1_000
+
+
+def participant_id(cohort_id: str, external_id: str) -> uuid.UUID:
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"softskills-cohort:{cohort_id}:{external_id}")
+
+
+def default_ids(count: int) -> List[str]:
+    width = max(2, len(str(count)))
+    return [f"S{i:0{width}d}" for i in range(1, count + 1)]
+
+
+def links(base_url: str, token: str) -> Dict[str, str]:
+    base = base_url.rstrip("/")
+    return {
+        "pre_test_link": f"{base}/?token={token}&attempt=1",
+        "post_test_link": f"{base}/?token={token}&attempt=2",
+    }
+
+
+def _row(seq: int, external_id: str, token: str, base_url: str) -> Dict[str, Any]:
+    return {"#": seq, "student_id": external_id, "token": token, **links(base_url, token)}
+
+
+def provision(
+    session: Session,
+    cohort_id: str,
+    external_ids: Sequence[str],
+    *,
+    base_url: Optional[str] = None,
+    label: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Εκδίδει tokens για όλα τα external_ids (ήδη υπάρχοντα μένουν ως έχουν) και
+    επιστρέφει όλο το cohort ταξινομημένο κατά seq. Χωρίς base_url κρατάει το
+    base_url του cohort (ή PUBLIC_UI_BASE για νέο cohort).
+    """
+    explicit_base = base_url.rstrip("/") if base_url else None
+    external_ids = list(dict.fromkeys(external_ids))
+    # Το DO UPDATE κλειδώνει τη γραμμή του cohort ως το commit → ταυτόχρονα provision
+    # του ίδιου cohort σειριοποιούνται και το MAX(seq) παρακάτω δεν διπλασιάζεται.
+    session.execute(text("""
+        INSERT INTO study_cohorts (cohort_id, label, base_url)
+        VALUES (:c, :label, COALESCE(:base, :default_base))
+        ON CONFLICT (cohort_id) DO UPDATE
+          SET label = COALESCE(EXCLUDED.label, study_cohorts.label),
+              base_url = COALESCE(:base, study_cohorts.base_url)
+    """), {"c": cohort_id, "label": label, "base": explicit_base,
+           "default_base": settings.PUBLIC_UI_BASE.rstrip("/")})
+
+    start = int(session.execute(
+        text("SELECT COALESCE(MAX(seq), 0) FROM study_participants WHERE cohort_id = :c"),
+        {"c": cohort_id},
+    ).scalar() or 0)
+
+    # seq μόνο για όσους γράφονται τώρα (όχι κενά στην αρίθμηση σε re-run)
+    existing = set(session.execute(
+        text("SELECT external_id FROM study_participants WHERE cohort_id = :c"),
+        {"c": cohort_id},
+    ).scalars())
+    new_ids = [x for x in external_ids if x not in existing]
+
+    pids = [participant_id(cohort_id, x) for x in new_ids]
+    tokens = make_tokens(pids)
+    for i in range(0, len(pids), BATCH):
+        batch = [
+            {"pid": str(p), "seq": start + i + j + 1, "ext": x, "tok": t}
+            for j, (p, x, t) in enumerate(zip(pids[i:i + BATCH], new_ids[i:i + BATCH], tokens[i:i + BATCH]))
+        ]
+        session.execute(text("""
+            INSERT INTO study_participants (participant_id, cohort_id, seq, external_id, token)
+            SELECT CAST(r.pid AS uuid), :c, r.seq, r.ext, r.tok
+            FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(pid TEXT, seq INT, ext TEXT, tok TEXT)
+            ON CONFLICT (participant_id) DO NOTHING
+        """), {"c": cohort_id, "rows": json.dumps(batch, ensure_ascii=False)})
+    session.commit()
+    return cohort_links(session, cohort_id) or []
+
+
+def cohort_links(session: Session, cohort_id: str) -> Optional[List[Dict[str, Any]]]:
+    """Όλα τα links του cohort, ή None αν δεν υπάρχει."""
+    base = session.execute(
+        text("SELECT base_url FROM study_cohorts WHERE cohort_id = :c"), {"c": cohort_id}
+    ).scalar()
+    if base is None:
+        return None
+    rows = session.execute(text("""
+        SELECT seq, external_id, token
+        FROM study_participants
+        WHERE cohort_id = :c
+        ORDER BY seq
+    """), {"c": cohort_id}).all()
+    return [_row(r[0], r[1], r[2], base) for r in rows]
+
+
+def csv_chunks(rows: Sequence[Dict[str, Any]]) -> Iterator[str]:
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=LINK_FIELDS)
+    w.writeheader()
+    for i, r in enumerate(rows, start=1):
+        w.writerow(r)
+        if i % CSV_CHUNK_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+if __name__ == "__main__":
+    # python -m app.core.cohorts --cohort 2026A --count 300 [--out links.csv]
+    # python -m app.core.cohorts --cohort 2026A --ids tokens.csv  (στήλη student_id)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cohort", required=True)
+    ap.add_argument("--label")
+    ap.add_argument("--base-url")
+    ap.add_argument("--count", type=int)
+    ap.add_argument("--ids", help="CSV με στήλη student_id")
+    ap.add_argument("--out", help="CSV εξόδου (default: stdout)")
+    args = ap.parse_args()
+
+    if args.ids:
+        with open(args.ids, newline="", encoding="utf-8") as f:
+            ids = [r["student_id"].strip() for r in csv.DictReader(f) if (r.get("student_id") or "").strip()]
+    elif args.count:
+        ids = default_ids(args.count)
+    else:
+        sys.exit("δώσε --count ή --ids")
+    if len(ids) > MAX_COHORT:
+        sys.exit(f"μέγιστο {MAX_COHORT} συμμετέχοντες ανά κλήση")
+
+    from app.core.db import get_engine
+
+    with Session(get_engine()) as s:
+        out_rows = provision(s, args.cohort, ids, base_url=args.base_url, label=args.label)
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for chunk in csv_chunks(out_rows):
+            out.write(chunk)
+    finally:
+        if args.out:
+            out.close()
+    print(f"[cohorts] {args.cohort}: {len(out_rows)} participants", file=sys.stderr)
@@ -0,0 +1,207 @@
+# app/core/dataset_export.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.db import get_engine
+from app.core.export_stream import stream_query
+
+# Πίνακες του research dataset. pyarrow φορτώνεται lazily (βαρύ import,
+# και δεν χρειάζεται σε κανένα άλλο endpoint).
+
+
+@dataclass(frozen=True)
+class DatasetTable:
+    name: str
+    ts_column: Optional[str]                # για date_from / date_to
+    answer_key: Optional[str] = "answer_id"  # για category/attempt μέσω interaction
+
+
+DATASET_TABLES: Dict[str, DatasetTable] = {
+    "answers": DatasetTable("answers", "created_at"),
+    "interaction": DatasetTable("interaction", "created_at"),
+    "autorating": DatasetTable("autorating", "created_at"),
+    "human_ratings": DatasetTable("human_ratings", "rated_at"),
+    "final_scores": DatasetTable("final_scores", "completed_at"),
+    # score / label / dim_* είναι ήδη typed στήλες του evaluation (trigger)
+    "evaluation": DatasetTable("evaluation", "created_at", answer_key=None),
+}
+
+
+DATASET_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def _pa():
+    try:
+        import pyarrow as pa  # type: ignore
+        return pa
+    except ImportError as e:  # pragma: no cover
+        raise RuntimeError("pyarrow is not installed (pip install pyarrow)") from e
+
+
+# ---------------------------------------------------------------------
+# Schema από information_schema → SELECT list + Arrow schema
+# ---------------------------------------------------------------------
+_PG_TO_ARROW = {
+    "smallint": ("int64", "{c}::bigint"),
+    "integer": ("int64", "{c}::bigint"),
+    "bigint": ("int64", "{c}"),
+    "numeric": ("float64", "{c}::float8"),
+    "real": ("float64", "{c}::float8"),
+    "double precision": ("float64", "{c}"),
+    "boolean": ("bool", "{c}"),
+    "timestamp with time zone": ("timestamp_tz", "{c}"),
+    "timestamp without time zone": ("timestamp", "{c}"),
+    "date": ("date32", "{c}"),
+}
+
+
+def _arrow_type(pa, name: str):
+    if name == "timestamp_tz":
+        return pa.timestamp("us", tz="UTC")
+    if name == "timestamp":
+        return pa.timestamp("us")
+    return getattr(pa, name)() if name != "bool" else pa.bool_()
+
+
+def _columns(table: str) -> List[Tuple[str, str]]:
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = :t
+            ORDER BY ordinal_position
+        """), {"t": table}).all()
+    return [(r[0], r[1]) for r in rows]
+
+
+def build_query(
+    spec: DatasetTable,
+    *,
+    category: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    attempt: Optional[int] = None,
+):
+    """Επιστρέφει (sql, params, arrow_schema). Όλες οι στήλες typed· uuid/json → string."""
+    pa = _pa()
+    cols = _columns(spec.name)
+    if not cols:
+        raise LookupError(f"table '{spec.name}' not found")
+    col_names = {c for c, _ in cols}
+
+    select_parts: List[str] = []
+    fields = []
+    for name, pg_type in cols:
+        arrow_name, expr = _PG_TO_ARROW.get(pg_type, ("string", "{c}::text"))
+        select_parts.append(f'{expr.format(c=f"t.{name}")} AS "{name}"')
+        fields.append(pa.field(name, _arrow_type(pa, arrow_name)))
+
+    where: List[str] = []
+    params: Dict[str, Any] = {}
+    if category:
+        if "category" in col_names:
+            where.append("t.category = :cat")
+        elif spec.answer_key:
+            where.append(f"EXISTS (SELECT 1 FROM interaction i WHERE i.answer_id::text = t.{spec.answer_key}::text AND i.category = :cat)")
+        params["cat"] = category
+    if spec.ts_column and spec.ts_column in col_names:
+        if date_from:
+            where.append(f"t.{spec.ts_column} >= :dfrom"); params["dfrom"] = date_from
+        if date_to:
+            where.append(f"t.{spec.ts_column} < :dto"); params["dto"] = date_to
+    if attempt in (1, 2):
+        if "attempt_no" in col_names:
+            where.append("t.attempt_no = :att")
+        elif spec.answer_key:
+            where.append(f"EXISTS (SELECT 1 FROM interaction i WHERE i.answer_id::text = t.{spec.answer_key}::text AND i.attempt_no = :att)")
+        params["att"] = attempt
+
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    order = f"ORDER BY t.{spec.ts_column}" if spec.ts_column in col_names else ""
+    sql = f"SELECT {', '.join(select_parts)} FROM {spec.name} t {where_sql} {order}"
+    return sql, params, pa.schema(fields)
+
+
+# ---------------------------------------------------------------------
+# Writers (row group ανά batch, bytes βγαίνουν αμέσως)
+# ---------------------------------------------------------------------
+class _ChunkSink:
+    """Write-only file-like: ό,τι γράφει ο pyarrow writer το δίνουμε αμέσως στο response."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._pos = 0
+        self.closed = False
+
+    def write(self, b) -> int:
+        self._buf += b
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+
+def _batches(sql: str, params: Dict[str, Any], schema, batch_rows: int) -> Iterator[Any]:
+    pa = _pa()
+    rows: List[Dict[str, Any]] = []
+    for r in stream_query(sql, params, yield_per=batch_rows):
+        rows.append(dict(r))
+        if len(rows) >= batch_rows:
+            yield pa.RecordBatch.from_pylist(rows, schema=schema)
+            rows = []
+    if rows:
+        yield pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+def dataset_chunks(
+    sql: str,
+    params: Dict[str, Any],
+    schema,
+    *,
+    fmt: str = "parquet",
+    batch_rows: int = 50_000,
+) -> Iterator[bytes]:
+    """fmt: 'parquet' (ένα row group ανά batch) ή 'arrow' (Arrow IPC stream)."""
+    pa = _pa()
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq  # type: ignore
+        writer = pq.ParquetWriter(out, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(out, schema)
+
+    for batch in _batches(sql, params, schema, batch_rows):
+        if fmt == "parquet":
+            writer.write_batch(batch, row_group_size=batch.num_rows)
+        else:
+            writer.write_batch(batch)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+
+    writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Generator
 from sqlmodel import SQLModel, Session, create_engine
 from app.core.settings import settings
+from app.core import tracing
+from app.core.telemetry import instrument_engine
 
 # 🔹 Import όλων των μοντέλων ώστε να “γραφτούν” στο metadata
 from app import models  # noqa: F401
@@ -29,6 +31,8 @@ def get_engine():
             pool_pre_ping=True,  # αποφεύγει broken connections
             connect_args=connect_args,
         )
+        instrument_engine(_engine)
+        tracing.instrument_engine(_engine)
 
     return _engine
 
@@ -0,0 +1,36 @@
+# app/core/evaluation_rollup.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+# Το evaluation_daily και οι typed στήλες του evaluation (score, label, dim_*) υπάρχουν
+# μόνο μετά το migration 90e2d0b7f0d8 (PostgreSQL). Σε SQLite / create_all ή σε βάση που
+# δεν έχει κάνει upgrade, τα reports πέφτουν στα παλιά queries πάνω στο result JSON.
+TABLE = "evaluation_daily"
+# Το "λείπει" ξαναελέγχεται (π.χ. τρέχει το migration ενώ ζει το process)
+RECHECK_SECONDS = 60.0
+
+_LOCK = threading.Lock()
+_HAS_ROLLUP: Optional[bool] = None
+_CHECKED_AT = 0.0
+
+
+def has_rollup(session: Session) -> bool:
+    global _HAS_ROLLUP, _CHECKED_AT
+    with _LOCK:
+        if _HAS_ROLLUP or (_HAS_ROLLUP is False and time.monotonic() - _CHECKED_AT < RECHECK_SECONDS):
+            return _HAS_ROLLUP
+    try:
+        found = inspect(session.connection()).has_table(TABLE)
+    except SQLAlchemyError:
+        session.rollback()
+        found = False
+    with _LOCK:
+        _HAS_ROLLUP, _CHECKED_AT = found, time.monotonic()
+    return found
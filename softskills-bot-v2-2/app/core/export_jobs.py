@@ -0,0 +1,518 @@
+# app/core/export_jobs.py
+from __future__ import annotations
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.db import get_engine
+from app.core.export_stream import content_disposition
+from app.core.settings import settings
+
+# Μετά από τόσα δευτερόλεπτα χωρίς heartbeat ένα 'running' job θεωρείται ορφανό
+STALE_SECONDS = 5 * 60
+MAX_ATTEMPTS = 3
+# Κάθε πόσο γράφουμε πρόοδο στη βάση (όχι σε κάθε chunk)
+PROGRESS_EVERY_SECONDS = 2.0
+# Heartbeat από ξεχωριστό thread, ακόμη κι όταν δεν βγαίνουν chunks (αργό query / upload)
+HEARTBEAT_SECONDS = 30.0
+
+EXPORT_KINDS = (
+    "all-csv",
+    "report-user-csv",
+    "report-overview-csv",
+    "rater-results-csv",
+    "dataset-parquet",
+    "dataset-arrow",
+)
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+
+# ---------------------------------------------------------------------
+# Kinds: params → (filename, media_type, chunks)
+# ---------------------------------------------------------------------
+def _opt_str(params: Dict[str, Any], key: str) -> Optional[str]:
+    v = params.get(key)
+    if v is None or v == "":
+        return None
+    if not isinstance(v, str):
+        raise ValueError(f"'{key}' must be a string")
+    return v
+
+
+def _opt_choice(params: Dict[str, Any], key: str, choices: Tuple[Any, ...], default: Any = None) -> Any:
+    v = params.get(key, default)
+    if v is not None and v not in choices:
+        raise ValueError(f"'{key}' must be one of {list(choices)}")
+    return v
+
+
+def _opt_dt(params: Dict[str, Any], key: str) -> Optional[datetime]:
+    v = _opt_str(params, key)
+    if v is None:
+        return None
+    try:
+        return datetime.fromisoformat(v)
+    except ValueError:
+        raise ValueError(f"'{key}' must be an ISO datetime")
+
+
+def validate_params(kind: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Ελέγχει/κανονικοποιεί τα params πριν μπει το job στην ουρά (ValueError αν είναι λάθος)."""
+    p = dict(params or {})
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"unknown export kind '{kind}'")
+    if kind == "all-csv":
+        return {
+            "category": _opt_str(p, "category"),
+            "qtype": _opt_choice(p, "qtype", ("open", "mc")),
+            "fmt": _opt_choice(p, "fmt", ("long", "wide"), "long"),
+        }
+    if kind == "report-user-csv":
+        user_id = _opt_str(p, "user_id")
+        if not user_id:
+            raise ValueError("'user_id' is required")
+        return {"user_id": user_id}
+    if kind == "report-overview-csv":
+        from app.core.overview import OVERVIEW_SORTS
+        _opt_dt(p, "date_from"); _opt_dt(p, "date_to")
+        return {
+            "category": _opt_str(p, "category"),
+            "date_from": _opt_str(p, "date_from"),
+            "date_to": _opt_str(p, "date_to"),
+            "sort": _opt_choice(p, "sort", OVERVIEW_SORTS, "user_id"),
+            "order": _opt_choice(p, "order", ("asc", "desc"), "asc"),
+        }
+    if kind in ("dataset-parquet", "dataset-arrow"):
+        from app.core.dataset_export import DATASET_TABLES
+        _opt_dt(p, "date_from"); _opt_dt(p, "date_to")
+        return {
+            "table": _opt_choice(p, "table", tuple(DATASET_TABLES), "answers"),
+            "category": _opt_str(p, "category"),
+            "date_from": _opt_str(p, "date_from"),
+            "date_to": _opt_str(p, "date_to"),
+            "attempt": _opt_choice(p, "attempt", (1, 2)),
+        }
+    return {}
+
+
+def build_export(session: Session, kind: str, params: Dict[str, Any]) -> Tuple[str, str, Iterator[bytes]]:
+    """Οι ίδιοι generators με τα αντίστοιχα endpoints (lazy imports: μόνο ο worker τα χρειάζεται)."""
+    if kind == "all-csv":
+        from app.routers.export_all import all_csv_export
+        filename, chunks = all_csv_export(session, params.get("category"), params.get("qtype"), params.get("fmt") or "long")
+        return filename, "text/csv", chunks
+    if kind == "report-user-csv":
+        from app.routers.report_csv import user_csv_export
+        filename, chunks = user_csv_export(session, params["user_id"])
+        return filename, CSV_MEDIA_TYPE, chunks
+    if kind == "report-overview-csv":
+        from app.routers.report_csv import overview_csv_export
+        filename, chunks = overview_csv_export(
+            params.get("category"),
+            _opt_dt(params, "date_from"),
+            _opt_dt(params, "date_to"),
+            params.get("sort") or "user_id",
+            params.get("order") or "asc",
+        )
+        return filename, CSV_MEDIA_TYPE, chunks
+    if kind == "rater-results-csv":
+        from app.routers.rater_final import results_csv_export
+        now = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        return f"results_{now}.csv", CSV_MEDIA_TYPE, results_csv_export(session)
+    if kind in ("dataset-parquet", "dataset-arrow"):
+        from app.core.dataset_export import DATASET_MEDIA_TYPES, DATASET_TABLES, build_query, dataset_chunks
+        fmt = "parquet" if kind == "dataset-parquet" else "arrow"
+        table = params.get("table") or "answers"
+        sql, qparams, schema = build_query(
+            DATASET_TABLES[table],
+            category=params.get("category"),
+            date_from=_opt_dt(params, "date_from"),
+            date_to=_opt_dt(params, "date_to"),
+            attempt=params.get("attempt"),
+        )
+        now = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        ext = "parquet" if fmt == "parquet" else "arrows"
+        return f"{table}_{now}.{ext}", DATASET_MEDIA_TYPES[fmt], dataset_chunks(sql, qparams, schema, fmt=fmt)
+    raise ValueError(f"unknown export kind '{kind}'")
+
+
+# ---------------------------------------------------------------------
+# Artifact stores
+# ---------------------------------------------------------------------
+class LocalStore:
+    """Artifacts σε τοπικό φάκελο (dev / single host). Γράφει σε .part και κάνει rename στο τέλος."""
+
+    name = "local"
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        p = (self.root / key).resolve()
+        if self.root.resolve() not in p.parents:
+            raise ValueError("invalid artifact key")
+        return p
+
+    def put(self, key: str, chunks: Iterable[bytes], on_chunk: Callable[[int], None]) -> int:
+        dest = self.path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".part")
+        size = 0
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+                    on_chunk(size)
+            os.replace(tmp, dest)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return size
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        p = self.path(key)
+        if p.exists():
+            p.unlink()
+        try:
+            p.parent.rmdir()
+        except OSError:
+            pass
+
+
+class S3Store:
+    """Artifacts σε S3. Spool στο /tmp και upload_file (multipart)· το download γίνεται με presigned URL."""
+
+    name = "s3"
+
+    def __init__(self, bucket: str) -> None:
+        import boto3  # type: ignore
+        self.bucket = bucket
+        self.s3 = boto3.client("s3")
+
+    def put(self, key: str, chunks: Iterable[bytes], on_chunk: Callable[[int], None]) -> int:
+        size = 0
+        with tempfile.NamedTemporaryFile(prefix="export-", delete=True) as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+                on_chunk(size)
+            f.flush()
+            self.s3.upload_file(f.name, self.bucket, key)
+        return size
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.s3.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except Exception:
+            return False
+
+    def delete(self, key: str) -> None:
+        self.s3.delete_object(Bucket=self.bucket, Key=key)
+
+    def presign(self, key: str, filename: str, media_type: str, expires_sec: int = 3600) -> str:
+        return self.s3.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentDisposition": content_disposition(filename),
+                "ResponseContentType": media_type,
+            },
+            ExpiresIn=expires_sec,
+        )
+
+
+_STORE = None
+
+
+def get_store():
+    global _STORE
+    if _STORE is None:
+        if settings.EXPORT_STORE == "s3":
+            if not settings.EXPORT_BUCKET:
+                raise RuntimeError("EXPORT_STORE=s3 requires EXPORT_BUCKET")
+            _STORE = S3Store(settings.EXPORT_BUCKET)
+        else:
+            _STORE = LocalStore(settings.EXPORT_DIR)
+    return _STORE
+
+
+# ---------------------------------------------------------------------
+# Queue
+# ---------------------------------------------------------------------
+JOB_COLUMNS = """
+    job_id, kind, params, status, attempts, bytes_written, filename, media_type,
+    artifact_key, error, worker_id, created_at, started_at, heartbeat_at, finished_at, expires_at
+"""
+
+
+def create_job(session: Session, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Νέο job σε 'queued'. Δεν κάνει commit."""
+    row = session.execute(text(f"""
+        INSERT INTO export_jobs (kind, params)
+        VALUES (:kind, CAST(:params AS jsonb))
+        RETURNING {JOB_COLUMNS}
+    """), {"kind": kind, "params": json.dumps(params)}).mappings().one()
+    return dict(row)
+
+
+def get_job(session: Session, job_id: str) -> Optional[Dict[str, Any]]:
+    row = session.execute(text(f"""
+        SELECT {JOB_COLUMNS} FROM export_jobs WHERE job_id = CAST(:id AS uuid)
+    """), {"id": job_id}).mappings().first()
+    return dict(row) if row else None
+
+
+def list_jobs(session: Session, *, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    where = "WHERE status = :st" if status else ""
+    rows = session.execute(text(f"""
+        SELECT {JOB_COLUMNS} FROM export_jobs {where}
+        ORDER BY created_at DESC
+        LIMIT :lim
+    """), {"st": status, "lim": int(limit)}).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def claim_job(session: Session, worker_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Παίρνει ένα job (το συγκεκριμένο ή το παλαιότερο διαθέσιμο) και το κάνει 'running'.
+    FOR UPDATE SKIP LOCKED: δύο workers δεν παίρνουν ποτέ το ίδιο job.
+    Ορφανά 'running' (χωρίς heartbeat για STALE_SECONDS) ξαναμπαίνουν, μέχρι MAX_ATTEMPTS. Δεν κάνει commit.
+    """
+    params: Dict[str, Any] = {"wid": worker_id, "stale": STALE_SECONDS, "max": MAX_ATTEMPTS}
+    only = ""
+    if job_id:
+        only = "AND job_id = CAST(:id AS uuid)"
+        params["id"] = job_id
+    row = session.execute(text(f"""
+        UPDATE export_jobs j
+           SET status = 'running', attempts = j.attempts + 1, worker_id = :wid,
+               started_at = now(), heartbeat_at = now(), bytes_written = 0, error = NULL
+         WHERE j.job_id = (
+                SELECT job_id FROM export_jobs
+                 WHERE (status = 'queued'
+                        OR (status = 'running' AND heartbeat_at < now() - make_interval(secs => :stale)))
+                   AND attempts < :max
+                   {only}
+                 ORDER BY created_at
+                 LIMIT 1
+                 FOR UPDATE SKIP LOCKED
+               )
+        RETURNING {JOB_COLUMNS}
+    """), params).mappings().first()
+    return dict(row) if row else None
+
+
+def _update(job_id: str, sql: str, params: Dict[str, Any]) -> int:
+    # ξεχωριστή σύντομη transaction: η πρόοδος φαίνεται αμέσως στο polling
+    with Session(get_engine()) as s:
+        res = s.execute(text(sql), {"id": job_id, **params})
+        s.commit()
+        return max(0, res.rowcount or 0)
+
+
+# Όλα τα updates ενός worker ισχύουν μόνο όσο το job είναι ακόμη δικό του:
+# αν θεωρήθηκε ορφανό και το πήρε άλλος worker, δεν πατάμε το status του.
+_OWNED = "job_id = CAST(:id AS uuid) AND worker_id = :wid AND status = 'running'"
+
+
+class JobLost(RuntimeError):
+    """Το job πέρασε σε άλλο worker (stale heartbeat) ενώ έτρεχε."""
+
+
+class _Heartbeat:
+    """
+    Timer thread όσο τρέχει ένα job: γράφει bytes_written ανά PROGRESS_EVERY_SECONDS
+    όταν αλλάζει και heartbeat τουλάχιστον ανά HEARTBEAT_SECONDS, ώστε ένα export που
+    περιμένει το πρώτο chunk (ή το upload στο S3) να μη θεωρηθεί ορφανό.
+    Καλείται ως on_chunk από το store· αν χαθεί η κυριότητα, το επόμενο chunk σηκώνει JobLost.
+    """
+
+    def __init__(self, job_id: str, wid: str) -> None:
+        self.job_id = job_id
+        self.wid = wid
+        self.size = 0
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"export-heartbeat-{job_id[:8]}", daemon=True)
+
+    def __call__(self, size: int) -> None:
+        if self.lost:
+            raise JobLost(f"job {self.job_id} was taken over by another worker")
+        self.size = size
+
+    def _run(self) -> None:
+        written, last = -1, time.monotonic()
+        while not self._stop.wait(PROGRESS_EVERY_SECONDS):
+            size, now = self.size, time.monotonic()
+            if size == written and now - last < HEARTBEAT_SECONDS:
+                continue
+            try:
+                n = _update(self.job_id, f"""
+                    UPDATE export_jobs SET bytes_written = :b, heartbeat_at = now()
+                    WHERE {_OWNED}
+                """, {"b": size, "wid": self.wid})
+            except Exception as e:
+                print(f"[export_jobs] heartbeat {self.job_id} failed: {e}")
+                continue
+            written, last = size, now
+            if n == 0:
+                self.lost = True
+                return
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join(timeout=10)
+
+
+def run_job(job: Dict[str, Any], store=None) -> Dict[str, Any]:
+    """Παράγει το artifact ενός claimed job και ενημερώνει το status (done/failed)."""
+    store = store or get_store()
+    job_id = str(job["job_id"])
+    wid = job.get("worker_id") or worker_id()
+    params = job["params"] if isinstance(job["params"], dict) else json.loads(job["params"] or "{}")
+    key = None
+    try:
+        with Session(get_engine()) as session, _Heartbeat(job_id, wid) as hb:
+            filename, media_type, chunks = build_export(session, job["kind"], params)
+            key = f"exports/{job_id}/{filename}"
+            size = store.put(key, chunks, hb)
+        n = _update(job_id, f"""
+            UPDATE export_jobs
+               SET status = 'done', bytes_written = :b, filename = :fn, media_type = :mt,
+                   artifact_key = :key, heartbeat_at = now(), finished_at = now(),
+                   expires_at = now() + make_interval(secs => :ttl)
+             WHERE {_OWNED}
+        """, {"b": size, "fn": filename, "mt": media_type, "key": key, "wid": wid,
+              "ttl": int(settings.EXPORT_JOB_TTL_HOURS * 3600)})
+        if n == 0:
+            raise JobLost(f"job {job_id} was taken over by another worker")
+        return {"job_id": job_id, "status": "done", "bytes": size}
+    except JobLost as e:
+        # το artifact μας δεν θα το δείξει κανείς· το job το ολοκληρώνει ο άλλος worker
+        if key:
+            try:
+                store.delete(key)
+            except Exception:
+                pass
+        return {"job_id": job_id, "status": "lost", "error": str(e)}
+    except Exception as e:
+        _update(job_id, f"""
+            UPDATE export_jobs
+               SET status = 'failed', error = :err, finished_at = now()
+             WHERE {_OWNED}
+        """, {"err": f"{type(e).__name__}: {e}"[:2000], "wid": wid})
+        return {"job_id": job_id, "status": "failed", "error": str(e)}
+
+
+def purge_expired(session: Session, store=None, limit: int = 200) -> int:
+    """Σβήνει artifacts που έληξαν ('done' → 'expired') και κλείνει ορφανά jobs. Κάνει commit."""
+    store = store or get_store()
+    rows = session.execute(text("""
+        SELECT job_id, artifact_key FROM export_jobs
+        WHERE status = 'done' AND expires_at <= now()
+        ORDER BY expires_at
+        LIMIT :lim
+        FOR UPDATE SKIP LOCKED
+    """), {"lim": int(limit)}).mappings().all()
+    for r in rows:
+        if r["artifact_key"]:
+            try:
+                store.delete(r["artifact_key"])
+            except Exception as e:
+                print(f"[export_jobs] delete {r['artifact_key']} failed: {e}")
+    if rows:
+        session.execute(text("""
+            UPDATE export_jobs SET status = 'expired', artifact_key = NULL
+            WHERE job_id = ANY(CAST(:ids AS uuid[]))
+        """), {"ids": [str(r["job_id"]) for r in rows]})
+
+    # ορφανά που εξάντλησαν τις προσπάθειες
+    session.execute(text("""
+        UPDATE export_jobs
+           SET status = 'failed', error = COALESCE(error, 'worker lost'), finished_at = now()
+         WHERE status = 'running' AND attempts >= :max
+           AND heartbeat_at < now() - make_interval(secs => :stale)
+    """), {"max": MAX_ATTEMPTS, "stale": STALE_SECONDS})
+    session.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_pending(
+    *,
+    job_id: Optional[str] = None,
+    max_jobs: Optional[int] = None,
+    should_continue: Callable[[], bool] = lambda: True,
+) -> List[Dict[str, Any]]:
+    """Τρέχει jobs μέχρι να αδειάσει η ουρά (ή max_jobs / should_continue() == False)."""
+    done: List[Dict[str, Any]] = []
+    wid = worker_id()
+    while should_continue() and (max_jobs is None or len(done) < max_jobs):
+        with Session(get_engine()) as session:
+            job = claim_job(session, wid, job_id)
+            session.commit()
+        if not job:
+            break
+        done.append(run_job(job))
+        if job_id:
+            break
+    return done
+
+
+def lambda_handler(event, context):
+    """Scheduled Lambda (π.χ. EventBridge ανά λεπτό) με EXPORT_WORKER=external και EXPORT_STORE=s3."""
+    with Session(get_engine()) as session:
+        purged = purge_expired(session)
+    # δεν ξεκινάμε νέο job αν απομένουν < 2 λεπτά
+    keep_going = (lambda: context.get_remaining_time_in_millis() > 120_000) if context else (lambda: True)
+    results = run_pending(should_continue=keep_going)
+    return {"ok": True, "purged": purged, "jobs": results}
+
+
+def main() -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(description="softskills export worker")
+    ap.add_argument("--once", action="store_true", help="άδειασε την ουρά και τερμάτισε")
+    ap.add_argument("--poll", type=float, default=5.0, help="δευτερόλεπτα ανάμεσα στους ελέγχους")
+    args = ap.parse_args()
+
+    while True:
+        with Session(get_engine()) as session:
+            purge_expired(session)
+        for r in run_pending():
+            print(f"[export_jobs] {r['job_id']} {r['status']} {r.get('bytes', r.get('error', ''))}")
+        if args.once:
+            break
+        time.sleep(args.poll)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# app/core/export_stream.py
+from __future__ import annotations
+
+import csv
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from urllib.parse import quote
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.sql import Executable
+
+from app.core.db import get_engine
+
+
+# ---------------------------------------------------------------------
+# Dialects
+# ---------------------------------------------------------------------
+@dataclass(frozen=True)
+class CsvDialect:
+    delimiter: str = ";"
+    bom: bool = True              # BOM ώστε το Excel να ανοίγει σωστά τα ελληνικά
+    decimal_comma: bool = True    # 7.5 → "7,5"
+    float_digits: Optional[int] = None  # None = όπως είναι
+
+
+# Excel/ελληνικά: ;  +  BOM  +  δεκαδικό κόμμα  (/rater/results.csv)
+EXCEL_GR = CsvDialect()
+# Απλό CSV με BOM (report-csv)
+EXCEL_BOM = CsvDialect(delimiter=",", bom=True, decimal_comma=False)
+# Απλό CSV χωρίς BOM (export/all-csv)
+PLAIN = CsvDialect(delimiter=",", bom=False, decimal_comma=False)
+
+
+def format_cell(v: Any, dialect: CsvDialect) -> Any:
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, (float, Decimal)):
+        s = f"{float(v):.{dialect.float_digits}f}" if dialect.float_digits is not None else str(v)
+        return s.replace(".", ",") if dialect.decimal_comma else s
+    return v
+
+
+# ---------------------------------------------------------------------
+# Incremental writer
+# ---------------------------------------------------------------------
+class _LineBuffer:
+    """file-like για csv.writer: μαζεύει κείμενο μέχρι το επόμενο flush."""
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, s: str) -> int:
+        self.parts.append(s)
+        self.size += len(s)
+        return len(s)
+
+    def drain(self) -> str:
+        out = "".join(self.parts)
+        self.parts.clear()
+        self.size = 0
+        return out
+
+
+def csv_chunks(
+    header: Sequence[Any],
+    rows: Iterable[Sequence[Any]],
+    *,
+    dialect: CsvDialect = EXCEL_GR,
+    empty_row: Optional[Sequence[Any]] = None,
+    flush_bytes: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    Γράφει CSV σταδιακά: BOM + header βγαίνουν αμέσως (χαμηλό time-to-first-byte),
+    μετά chunks ~flush_bytes. Η μνήμη μένει σταθερή όσο κι αν είναι τα rows.
+    Οι τιμές περνάνε από format_cell (δεκαδικό κόμμα, None → "").
+    """
+    buf = _LineBuffer()
+    writer = csv.writer(buf, delimiter=dialect.delimiter, quoting=csv.QUOTE_MINIMAL)
+
+    if dialect.bom:
+        buf.write("\ufeff")
+    writer.writerow(header)
+    yield buf.drain().encode("utf-8")
+
+    wrote_any = False
+    for row in rows:
+        wrote_any = True
+        writer.writerow([format_cell(v, dialect) for v in row])
+        if buf.size >= flush_bytes:
+            yield buf.drain().encode("utf-8")
+
+    if not wrote_any and empty_row is not None:
+        writer.writerow(empty_row)
+
+    if buf.size:
+        yield buf.drain().encode("utf-8")
+
+
+# ---------------------------------------------------------------------
+# Server-side cursor
+# ---------------------------------------------------------------------
+def stream_query(
+    stmt: Union[str, Executable],
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    yield_per: int = 2000,
+) -> Iterator[Any]:
+    """
+    Εκτελεί το query με server-side cursor (stream_results + yield_per) και
+    επιστρέφει rows (RowMapping) ένα-ένα.
+
+    Ανοίγει δική του connection από το engine: το Session του Depends(get_session)
+    μπορεί να έχει κλείσει πριν το StreamingResponse αρχίσει να διαβάζει.
+    """
+    if isinstance(stmt, str):
+        stmt = text(stmt)
+    with get_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=yield_per).execute(stmt, params or {})
+        try:
+            for row in result.mappings():
+                yield row
+        finally:
+            result.close()
+
+
+def content_disposition(filename: str) -> str:
+    """attachment με ASCII fallback (χωρίς " \\ ; κενά, μη-ASCII) + filename* (RFC 5987)."""
+    fallback = re.sub(r"[^A-Za-z0-9._-]+", "_", filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def csv_response(
+    chunks: Iterator[bytes],
+    filename: Optional[str] = None,
+    *,
+    media_type: str = "text/csv; charset=utf-8",
+) -> StreamingResponse:
+    headers: Dict[str, str] = {}
+    if filename:
+        headers["Content-Disposition"] = content_disposition(filename)
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+def stream_csv(
+    stmt: Union[str, Executable],
+    header: Sequence[Any],
+    to_row: Callable[[Any], Sequence[Any]],
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    dialect: CsvDialect = EXCEL_GR,
+    filename: Optional[str] = None,
+    yield_per: int = 2000,
+) -> StreamingResponse:
+    """query → rows → CSV → StreamingResponse, χωρίς να κρατιέται τίποτα ολόκληρο στη μνήμη."""
+    rows = (to_row(r) for r in stream_query(stmt, params, yield_per=yield_per))
+    return csv_response(csv_chunks(header, rows, dialect=dialect), filename)
@@ -0,0 +1,143 @@
+# app/core/final_scores.py
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+# Seed τιμή του final_score_config (η πραγματική τιμή ζει στη βάση).
+# Ο τύπος fusion ορίζεται ΜΟΝΟ στη SQL συνάρτηση _fuse_final
+# (migration 7c1e4b9a2d30 / fix_final_triggers.sql) ώστε Python και triggers
+# να μη διαφωνούν.
+HUMAN_WEIGHT = 0.6
+
+
+# ---------------------------------------------------------------------
+# Config (βάρος ανθρώπου)
+# ---------------------------------------------------------------------
+def get_human_weight(session: Session) -> float:
+    row = session.execute(text("SELECT _final_human_weight()")).first()
+    return float(row[0]) if row and row[0] is not None else HUMAN_WEIGHT
+
+
+def set_human_weight(session: Session, human_weight: float) -> None:
+    """Αλλάζει το βάρος για triggers + recompute. Δεν κάνει commit."""
+    session.execute(
+        text("""
+          INSERT INTO final_score_config (id, human_weight, updated_at)
+          VALUES (1, :w, now())
+          ON CONFLICT (id) DO UPDATE
+            SET human_weight = EXCLUDED.human_weight, updated_at = now()
+        """),
+        {"w": float(human_weight)},
+    )
+
+
+# ---------------------------------------------------------------------
+# Set-based recompute
+# ---------------------------------------------------------------------
+def _filters_sql(
+    answer_ids: Optional[List[str]],
+    attempt: Optional[int],
+    category: Optional[str],
+    params: Dict[str, Any],
+) -> List[str]:
+    where: List[str] = []
+    if answer_ids is not None:
+        where.append("a.answer_id = ANY(CAST(:ids AS uuid[]))")
+        params["ids"] = answer_ids
+    if attempt in (1, 2):
+        where.append("a.answer_id IN (SELECT answer_id FROM interaction WHERE attempt_no = :att)")
+        params["att"] = attempt
+    if category:
+        where.append("a.category = :cat")
+        params["cat"] = category
+    return where
+
+
+def _recompute_sql(where: List[str]) -> str:
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    return f"""
+        SELECT _recompute_final_set(ARRAY(
+            SELECT a.answer_id FROM answers a {where_sql}
+        ))
+    """
+
+
+def recompute_final_scores(
+    session: Session,
+    *,
+    answer_ids: Optional[List[str]] = None,
+    attempt: Optional[int] = None,
+    category: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Υπολογίζει/ενημερώνει final_scores μέσω της _recompute_final_set
+    (ίδια συνάρτηση με τα statement-level triggers).
+
+    - answer_ids: μόνο αυτά τα answers (None = όλα)
+    - attempt / category: προαιρετικά φίλτρα
+    - chunk_size: για τεράστιους πίνακες, τρέχει σε κομμάτια (keyset στο answer_id)
+      και κάνει commit ανά κομμάτι ώστε να μην κρατιούνται locks για πολύ.
+
+    Δεν κάνει commit στο non-chunked mode (το αφήνει στον caller).
+    Επιστρέφει {"rows_changed", "chunks", "elapsed_ms"}.
+    """
+    t0 = time.perf_counter()
+    if answer_ids is not None and not answer_ids:
+        return {"rows_changed": 0, "chunks": 0, "elapsed_ms": 0.0}
+
+    params: Dict[str, Any] = {}
+    where = _filters_sql(answer_ids, attempt, category, params)
+
+    if not chunk_size:
+        changed = session.execute(text(_recompute_sql(where)), params).scalar() or 0
+        return {
+            "rows_changed": int(changed),
+            "chunks": 1,
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        }
+
+    # ---- chunked mode: (lo, hi] ανά chunk_size answers
+    filt_sql = (" AND " + " AND ".join(where)) if where else ""
+    bound_sql = text(f"""
+        SELECT a.answer_id
+        FROM answers a
+        WHERE (CAST(:lo AS uuid) IS NULL OR a.answer_id > CAST(:lo AS uuid)){filt_sql}
+        ORDER BY a.answer_id
+        OFFSET :off
+        LIMIT 1
+    """)
+
+    changed = 0
+    chunks = 0
+    lo: Optional[str] = None
+    while True:
+        hi_row = session.execute(bound_sql, {**params, "lo": lo, "off": int(chunk_size) - 1}).first()
+        hi = str(hi_row[0]) if hi_row else None
+
+        chunk_where = list(where)
+        chunk_params = dict(params)
+        if lo is not None:
+            chunk_where.append("a.answer_id > CAST(:lo AS uuid)")
+            chunk_params["lo"] = lo
+        if hi is not None:
+            chunk_where.append("a.answer_id <= CAST(:hi AS uuid)")
+            chunk_params["hi"] = hi
+
+        changed += int(session.execute(text(_recompute_sql(chunk_where)), chunk_params).scalar() or 0)
+        session.commit()
+        chunks += 1
+
+        if hi is None:
+            break
+        lo = hi
+
+    return {
+        "rows_changed": changed,
+        "chunks": chunks,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+    }
@@ -6,6 +6,8 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 import uuid
 
+from app.core.tracing import span
+
 # ------------------------- helpers -------------------------
 def _norm_cat(cat: Optional[str]) -> str:
     if not cat:
@@ -249,4 +251,5 @@ def evaluate_glmp_payload(payload: Dict[str, Any], rules: Optional[Dict[str, Any
     meta = payload.get("meta") or {}
     mcq = payload.get("mcq")
     text = payload.get("text")
-    return evaluate_glmp(meta=meta, mcq=mcq, text=text, rules=rules)
+    with span("glmp.evaluate"):
+        return evaluate_glmp(meta=meta, mcq=mcq, text=text, rules=rules)
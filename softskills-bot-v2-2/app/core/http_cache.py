@@ -0,0 +1,145 @@
+# app/core/http_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.core.telemetry import CACHE
+
+# Cache για read endpoints (reports / metrics):
+#   κλειδί  = path + query params + watermark (data_versions.version + γραμμές data_changes)
+#   ETag    = hash του κλειδιού → το If-None-Match απαντιέται με 304 χωρίς υπολογισμό
+# Ο watermark αλλάζει σε κάθε INSERT/UPDATE/DELETE (triggers, migration 95d8fccad91b).
+
+MAX_ENTRIES = 256
+# Χωρίς data_versions (SQLite / πριν το migration) ξαναδοκιμάζουμε μετά από τόσο
+RETRY_SECONDS = 60.0
+
+_LOCK = threading.Lock()
+_CACHE: "OrderedDict[str, Tuple[bytes, Optional[datetime]]]" = OrderedDict()
+_HAS_VERSIONS: Optional[bool] = None
+_MISSING_AT = 0.0
+
+
+def data_watermark(session: Session, tables: Iterable[str]) -> Optional[Tuple[str, Optional[datetime]]]:
+    """(token, last_changed) για τους πίνακες, ή None αν δεν υπάρχει data_versions (π.χ. SQLite)."""
+    global _HAS_VERSIONS, _MISSING_AT
+    if _HAS_VERSIONS is False and time.monotonic() - _MISSING_AT < RETRY_SECONDS:
+        return None
+    names = sorted(set(tables))
+    try:
+        rows = session.execute(text("""
+            SELECT t.table_name,
+                   COALESCE(v.version, 0) + c.n AS version,
+                   GREATEST(v.changed_at, c.changed_at) AS changed_at
+            FROM unnest(CAST(:t AS text[])) AS t(table_name)
+            LEFT JOIN data_versions v USING (table_name)
+            CROSS JOIN LATERAL (
+              SELECT COUNT(*) AS n, MAX(d.changed_at) AS changed_at
+              FROM data_changes d
+              WHERE d.table_name = t.table_name
+            ) c
+        """), {"t": names}).all()
+    except SQLAlchemyError:
+        session.rollback()
+        _HAS_VERSIONS, _MISSING_AT = False, time.monotonic()
+        return None
+    _HAS_VERSIONS = True
+
+    versions = {r[0]: int(r[1]) for r in rows}
+    changed = [r[2] for r in rows if r[2] is not None]
+    token = ",".join(f"{t}:{versions.get(t, 0)}" for t in names)
+    return token, (max(changed) if changed else None)
+
+
+def _etag(key: str) -> str:
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+        return etag in tags or "*" in tags
+    ims = request.headers.get("if-modified-since")
+    if ims and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+        # το HTTP-date έχει ακρίβεια δευτερολέπτου
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cached_json(
+    request: Request,
+    session: Session,
+    tables: Iterable[str],
+    compute: Callable[[], Any],
+    *,
+    extra_key: str = "",
+    max_age: int = 0,
+) -> Response:
+    """
+    Επιστρέφει JSON με ETag / Last-Modified. Αν ο client έχει ήδη το ίδιο ETag → 304,
+    αλλιώς από το in-process cache, αλλιώς compute(). extra_key: ό,τι άλλο επηρεάζει
+    το αποτέλεσμα (π.χ. η σημερινή ημέρα για "τελευταίες N ημέρες").
+    """
+    wm = data_watermark(session, tables)
+    if wm is None:
+        return Response(
+            content=json.dumps(jsonable_encoder(compute()), ensure_ascii=False),
+            media_type="application/json",
+        )
+
+    token, last_modified = wm
+    params = sorted(request.query_params.multi_items())
+    key = f"{request.url.path}?{params}|{extra_key}|{token}"
+    etag = _etag(key)
+    headers: Dict[str, str] = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}, must-revalidate",
+    }
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    if not_modified(request, etag, last_modified):
+        CACHE.inc("http", "not_modified")
+        return Response(status_code=304, headers=headers)
+
+    with _LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+    CACHE.inc("http", "hit" if hit is not None else "miss")
+    if hit is not None:
+        headers["X-Cache"] = "hit"
+        return Response(content=hit[0], media_type="application/json", headers=headers)
+
+    body = json.dumps(jsonable_encoder(compute()), ensure_ascii=False).encode("utf-8")
+    with _LOCK:
+        _CACHE[key] = (body, last_modified)
+        while len(_CACHE) > MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+    headers["X-Cache"] = "miss"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
@@ -1,6 +1,6 @@
-from langdetect import detect
 def detect_language(text: str) -> str:
     try:
+        from langdetect import detect  # lazy: φορτώνει profiles μόνο όταν χρειαστεί
         return detect(text)
     except Exception:
         return 'unknown'
@@ -2,17 +2,24 @@
 from __future__ import annotations
 
 import json, re, math
-from typing import Any, Dict, Optional, List
-import httpx
-from openai import OpenAI
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, List
 from app.core.settings import settings
+from app.core.telemetry import llm_fallback, observe_llm
+from app.core.tracing import span
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 _CLIENT: Optional[OpenAI] = None
 
 def _get_client() -> OpenAI:
-    """OpenAI v1 client με explicit timeout."""
+    """OpenAI v1 client με explicit timeout (openai/httpx φορτώνονται εδώ, όχι στο cold start)."""
     global _CLIENT
     if _CLIENT is None:
+        import httpx
+        from openai import OpenAI
+
         http_client = httpx.Client(timeout=30)
         _CLIENT = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
     return _CLIENT
@@ -169,23 +176,27 @@ def _normalize_mc_payload(d: dict) -> dict:
     out["criteria"] = crit
     return out
 
-def _chat_json(messages: list[dict]) -> tuple[Optional[dict], Optional[str], Optional[str]]:
+def _chat_json(messages: list[dict], kind: str = "chat") -> tuple[Optional[dict], Optional[str], Optional[str]]:
     """
     Κάνει κλήση στο OpenAI και επιστρέφει (json_dict, model_name, raw_text) ή (None, model, raw_text) σε αποτυχία.
     """
-    client = _get_client()
     model_name = getattr(settings, "OPENAI_MODEL", None) or "gpt-4o-mini"
+    t0 = time.perf_counter()
     try:
-        resp = client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            response_format={"type": "json_object"},
-            temperature=getattr(settings, "OPENAI_TEMPERATURE", 0.3) or 0.3,
-        )
+        client = _get_client()
+        with span("llm.chat", model=model_name, kind=kind):
+            resp = client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=getattr(settings, "OPENAI_TEMPERATURE", 0.3) or 0.3,
+            )
+        observe_llm(model_name, kind, time.perf_counter() - t0, getattr(resp, "usage", None))
         content = resp.choices[0].message.content
         data = _extract_json(content) or {}
         return data, getattr(resp, "model", model_name), content
     except Exception as e:
+        observe_llm(model_name, kind, time.perf_counter() - t0, error=True)
         # επιστρέφουμε raw error για debug
         return {"__error__": str(e)}, model_name, None
 
@@ -195,13 +206,15 @@ def llm_coach_open(category: str, question_id: str, user_text: str) -> Dict[str,
     data, model_name, raw = _chat_json([
         {"role":"system","content": SYSTEM_OPEN},
         {"role":"user","content": USER_OPEN.format(category=category, question_id=question_id, user_text=user_text)}
-    ])
+    ], kind="open")
 
     # Σφάλμα client
     if isinstance(data, dict) and data.get("__error__"):
+        llm_fallback("open", "error")
         return {"error": data["__error__"], "model_name": model_name}
 
     if not isinstance(data, dict) or not data:
+        llm_fallback("open", "empty")
         return {"error": "empty_llm_response", "model_name": model_name, "raw": (raw[:500] if raw else None)}
 
     norm = _normalize_open_payload(data)
@@ -209,6 +222,7 @@ def llm_coach_open(category: str, question_id: str, user_text: str) -> Dict[str,
     all_zero = norm["score"] == 0 and all(c["score"] == 0 for c in norm["criteria"])
     all_dash = all((norm[k] == "—") for k in ("keep","change","action","drill"))
     if all_zero and all_dash:
+        llm_fallback("open", "unusable")
         return {"error": "unusable_llm_payload", "model_name": model_name, "raw": (raw[:500] if raw else None)}
 
     norm["model_name"] = model_name
@@ -237,18 +251,21 @@ def llm_coach_mc(
             selected_id=selected_id, selected_text=selected_text,
             correct_id=(correct_id or "—"), correct_text=correct_text,
         )}
-    ])
+    ], kind="mc")
 
     if isinstance(data, dict) and data.get("__error__"):
+        llm_fallback("mc", "error")
         return {"error": data["__error__"], "model_name": model_name}
 
     if not isinstance(data, dict) or not data:
+        llm_fallback("mc", "empty")
         return {"error": "empty_llm_response", "model_name": model_name, "raw": (raw[:500] if raw else None)}
 
     norm = _normalize_mc_payload(data)
     all_zero = norm["score"] == 0 and all(c["score"] == 0 for c in norm["criteria"])
     all_dash = all((norm[k] == "—") for k in ("keep","change","action","drill"))
     if all_zero and all_dash:
+        llm_fallback("mc", "unusable")
         return {"error": "unusable_llm_payload", "model_name": model_name, "raw": (raw[:500] if raw else None)}
 
     norm["model_name"] = model_name
@@ -0,0 +1,216 @@
+# app/core/materials.py
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from app.core.settings import settings
+from app.core.telemetry import cache_result
+
+# Κατάλογος υλικού μελέτης (materials/<cat>/[<phase>/[attempt<N>/]]<level>.pdf).
+#   - ΕΝΑ listing του prefix ανά MATERIALS_CATALOG_TTL_SECONDS → set με keys στη μνήμη
+#   - η αλυσίδα fallback (phase/attempt → phase → category) λύνεται χωρίς S3 calls
+#   - ένας client ανά process· presigned URLs ξαναχρησιμοποιούνται για λίγα λεπτά
+#     (URL_CACHE_SEC) και ποτέ πέρα από τη λήξη των credentials που τα υπέγραψαν:
+#     στη Lambda είναι προσωρινά (session token) και το URL πεθαίνει μαζί τους (403)
+# MATERIALS_STORE=local: ίδιο layout σε τοπικό φάκελο (dev / tests, χωρίς AWS).
+#
+# IAM (MATERIALS_STORE=s3): εκτός από s3:GetObject στο arn:aws:s3:::<bucket>/materials/*
+# χρειάζεται και s3:ListBucket στο arn:aws:s3:::<bucket> (condition s3:prefix = "materials/*").
+# Χωρίς ListBucket το listing αποτυγχάνει (AccessDenied) και το resolve πέφτει στον
+# παλιό δρόμο: ένα head_object ανά υποψήφιο key (λειτουργεί, αλλά πιο αργά).
+
+PREFIX = "materials/"
+URL_EXPIRES_SEC = 24 * 3600
+# Πόσο κρατάμε ένα presigned URL στη μνήμη
+URL_CACHE_SEC = 15 * 60
+# Δεν δίνουμε cached URL αν τα credentials λήγουν σε λιγότερο από αυτό → νέο presign
+URL_MIN_REMAINING_SEC = 300
+# Χωρίς credentials: ξαναδοκιμάζουμε μετά από τόσο (π.χ. role που δόθηκε αργότερα)
+CREDS_RETRY_SEC = 60.0
+
+
+class S3Materials:
+    name = "s3"
+
+    def __init__(self, bucket: str) -> None:
+        self.bucket = bucket
+        self._client = None
+        self._creds = None
+        self._no_creds_at: Optional[float] = None
+
+    def client(self):
+        if self._client is None:
+            if self._no_creds_at is not None and time.monotonic() - self._no_creds_at < CREDS_RETRY_SEC:
+                return None
+            import boto3  # type: ignore
+
+            session = boto3.session.Session()
+            self._creds = session.get_credentials()
+            if self._creds is None:
+                # 🚫 Δεν έχουμε AWS credentials → κανένα υλικό (ξαναδοκιμάζουμε μετά από CREDS_RETRY_SEC)
+                self._no_creds_at = time.monotonic()
+                return None
+            self._no_creds_at = None
+            self._client = session.client("s3")  # region από το Lambda runtime
+        return self._client
+
+    def list_keys(self, prefix: str) -> FrozenSet[str]:
+        s3 = self.client()
+        if s3 is None:
+            return frozenset()
+        keys = set()
+        for page in s3.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix):
+            keys.update(o["Key"] for o in page.get("Contents", ()))
+        return frozenset(keys)
+
+    def exists(self, key: str) -> bool:
+        s3 = self.client()
+        if s3 is None:
+            return False
+        from botocore.exceptions import ClientError  # type: ignore
+
+        try:
+            s3.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code not in ("404", "NoSuchKey", "NotFound"):
+                print(f"[materials] head_object {key}: {e}")
+            return False
+
+    def signer(self) -> Tuple[Optional[str], Optional[float]]:
+        """(access key, λήξη σε epoch ή None) των credentials με τα οποία υπογράφει ο client."""
+        if self.client() is None or self._creds is None:
+            return None, None
+        # ίδιο object με του client· το access_key κάνει refresh αν χρειάζεται
+        access_key = self._creds.access_key
+        expiry = getattr(self._creds, "_expiry_time", None)  # μόνο στα RefreshableCredentials
+        return access_key, (expiry.timestamp() if expiry is not None else None)
+
+    def presign(self, key: str, expires_sec: int) -> Optional[str]:
+        s3 = self.client()
+        if s3 is None:
+            return None
+        return s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_sec,
+        )
+
+
+class LocalMaterials:
+    name = "local"
+
+    def __init__(self, root: str, base_url: Optional[str] = None) -> None:
+        self.root = Path(root)
+        self.base_url = (base_url or "").rstrip("/")
+
+    def list_keys(self, prefix: str) -> FrozenSet[str]:
+        base = self.root / prefix
+        if not base.is_dir():
+            return frozenset()
+        return frozenset(p.relative_to(self.root).as_posix() for p in base.rglob("*") if p.is_file())
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).is_file()
+
+    def signer(self) -> Tuple[Optional[str], Optional[float]]:
+        return None, None
+
+    def presign(self, key: str, expires_sec: int) -> Optional[str]:
+        if self.base_url:
+            return f"{self.base_url}/{key}"
+        return (self.root / key).resolve().as_uri()
+
+
+def candidate_keys(cat: str, level: str, phase: str, attempt: int) -> Tuple[str, ...]:
+    phase_norm = "post" if str(phase).strip().upper() == "POST" else "pre"
+    return (
+        f"{PREFIX}{cat}/{phase_norm}/attempt{attempt}/{level}.pdf",
+        f"{PREFIX}{cat}/{phase_norm}/{level}.pdf",
+        f"{PREFIX}{cat}/{level}.pdf",
+    )
+
+
+class MaterialsCatalog:
+    def __init__(self, store, ttl_sec: float) -> None:
+        self.store = store
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        # None → δεν έχουμε (ακόμη) επιτυχημένο listing: resolve με exists() ανά key
+        self._keys: Optional[FrozenSet[str]] = None
+        self._loaded_at: Optional[float] = None
+        self._urls: Dict[str, Tuple[str, float]] = {}
+        self._signer: Optional[str] = None
+
+    def keys(self) -> Optional[FrozenSet[str]]:
+        now = time.monotonic()
+        fresh = self._loaded_at is not None and now - self._loaded_at < self.ttl_sec
+        cache_result("materials_manifest", fresh)
+        if fresh:
+            return self._keys
+        with self._lock:
+            if self._loaded_at is not None and now - self._loaded_at < self.ttl_sec:
+                return self._keys
+            try:
+                self._keys = self.store.list_keys(PREFIX)
+                print(f"[materials] {self.store.name}: {len(self._keys)} keys under {PREFIX}")
+            except Exception as e:
+                # κρατάμε το προηγούμενο set (ή None → head_object ανά key)·
+                # ξαναδοκιμάζουμε στο επόμενο TTL
+                print(f"[materials] listing failed: {e!r}")
+            self._loaded_at = now
+            return self._keys
+
+    def resolve(self, cat: str, level: str, phase: str, attempt: int) -> Optional[str]:
+        keys = self.keys()
+        exists = keys.__contains__ if keys is not None else self.store.exists
+        for key in candidate_keys(cat, level, phase, attempt):
+            if exists(key):
+                return key
+        return None
+
+    def url(self, key: str) -> Optional[str]:
+        now = time.time()
+        signer, creds_expiry = self.store.signer()
+        with self._lock:
+            if signer != self._signer:
+                # νέα credentials → τα URLs των παλιών θα πάψουν να ισχύουν μαζί τους
+                self._urls.clear()
+                self._signer = signer
+            hit = self._urls.get(key)
+        fresh = hit is not None and hit[1] > now
+        cache_result("presigned_url", fresh)
+        if fresh:
+            return hit[0]
+        url = self.store.presign(key, URL_EXPIRES_SEC)
+        if url:
+            cache_until = now + URL_CACHE_SEC
+            if creds_expiry is not None:
+                cache_until = min(cache_until, creds_expiry - URL_MIN_REMAINING_SEC)
+            if cache_until > now:
+                with self._lock:
+                    self._urls[key] = (url, cache_until)
+        return url
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+            self._urls.clear()
+
+
+_CATALOG: Optional[MaterialsCatalog] = None
+
+
+def get_materials() -> MaterialsCatalog:
+    global _CATALOG
+    if _CATALOG is None:
+        if settings.MATERIALS_STORE == "local":
+            store = LocalMaterials(settings.MATERIALS_DIR, settings.MATERIALS_BASE_URL)
+        else:
+            store = S3Materials(settings.MATERIALS_BUCKET)
+        _CATALOG = MaterialsCatalog(store, settings.MATERIALS_CATALOG_TTL_SECONDS)
+    return _CATALOG
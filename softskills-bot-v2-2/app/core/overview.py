@@ -0,0 +1,112 @@
+# app/core/overview.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select
+
+from app.models.db_models import AutoRating, HumanRating, Interaction
+
+# Ένα grouped query για όλους τους users (αντί για queries ανά user):
+# auto/human ratings προ-αθροίζονται ανά answer και μετά ανά user.
+
+# Οι 4 πρώτες στήλες είναι του αρχικού overview-csv (καταναλωτές διαβάζουν κατά θέση)·
+# νέες στήλες μόνο στο τέλος.
+OVERVIEW_COLUMNS = [
+    "user_id", "n_interactions", "n_human_ratings", "n_auto_ratings",
+    "n_categories", "auto_mean", "human_mean", "first_at", "last_at",
+]
+OVERVIEW_SORTS = (
+    "user_id", "n_interactions", "n_human_ratings", "n_auto_ratings",
+    "n_categories", "auto_mean", "human_mean", "first_at", "last_at",
+)
+SORT_PATTERN = "^(" + "|".join(OVERVIEW_SORTS) + ")$"
+
+
+def overview_stmt(
+    *,
+    category: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    sort: str = "user_id",
+    order: str = "asc",
+    limit: Optional[int] = None,
+    offset: int = 0,
+    with_total: bool = False,
+):
+    """
+    Μία γραμμή ανά user. Τα means είναι μέσοι όροι των per-answer means
+    (ίδια λογική με το /report/user). with_total → στήλη total (COUNT(*) OVER ()).
+    """
+    a = (
+        select(
+            AutoRating.answer_id,
+            func.count().label("n"),
+            func.avg(AutoRating.score).label("mean"),
+        )
+        .group_by(AutoRating.answer_id)
+        .subquery()
+    )
+    h = (
+        select(
+            HumanRating.answer_id,
+            func.count().label("n"),
+            func.avg(HumanRating.score).label("mean"),
+        )
+        .group_by(HumanRating.answer_id)
+        .subquery()
+    )
+    cols = {
+        "user_id": Interaction.user_id,
+        "n_interactions": func.count(Interaction.answer_id).label("n_interactions"),
+        "n_human_ratings": func.coalesce(func.sum(h.c.n), 0).label("n_human_ratings"),
+        "n_auto_ratings": func.coalesce(func.sum(a.c.n), 0).label("n_auto_ratings"),
+        "n_categories": func.count(func.distinct(Interaction.category)).label("n_categories"),
+        "auto_mean": func.avg(a.c.mean).label("auto_mean"),
+        "human_mean": func.avg(h.c.mean).label("human_mean"),
+        "first_at": func.min(Interaction.created_at).label("first_at"),
+        "last_at": func.max(Interaction.created_at).label("last_at"),
+    }
+    selected = [cols[c] for c in OVERVIEW_COLUMNS]
+    if with_total:
+        selected.append(func.count().over().label("total"))
+
+    stmt = (
+        select(*selected)
+        .select_from(Interaction)
+        .outerjoin(h, h.c.answer_id == Interaction.answer_id)
+        .outerjoin(a, a.c.answer_id == Interaction.answer_id)
+        .where(Interaction.user_id.is_not(None), Interaction.user_id != "")
+    )
+    if category:
+        stmt = stmt.where(Interaction.category == category)
+    if date_from:
+        stmt = stmt.where(Interaction.created_at >= date_from)
+    if date_to:
+        stmt = stmt.where(Interaction.created_at < date_to)
+
+    key = cols[sort] if sort in OVERVIEW_SORTS else cols["user_id"]
+    key = key.desc().nulls_last() if order == "desc" else key.asc().nulls_last()
+    stmt = stmt.group_by(Interaction.user_id).order_by(key, Interaction.user_id)
+
+    if limit is not None:
+        stmt = stmt.limit(limit).offset(offset)
+    return stmt
+
+
+def overview_row(r: Any) -> Dict[str, Any]:
+    def _r3(x):
+        return round(float(x), 3) if x is not None else None
+
+    return {
+        "user_id": r["user_id"],
+        "n_interactions": int(r["n_interactions"] or 0),
+        "n_human_ratings": int(r["n_human_ratings"] or 0),
+        "n_auto_ratings": int(r["n_auto_ratings"] or 0),
+        "n_categories": int(r["n_categories"] or 0),
+        "auto_mean": _r3(r["auto_mean"]),
+        "human_mean": _r3(r["human_mean"]),
+        "first_at": r["first_at"],
+        "last_at": r["last_at"],
+    }
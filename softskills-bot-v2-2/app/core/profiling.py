@@ -0,0 +1,152 @@
+# app/core/profiling.py
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Profiling κατ' απαίτηση σε ζωντανό instance (GET /_diag/profile, /_diag/memory).
+#   - sampler: κάθε INTERVAL διαβάζει sys._current_frames() για ΟΛΑ τα threads
+#     (event loop + threadpool των sync endpoints) → collapsed stacks
+#     ("thread;module:func;... count"), έτοιμα για flamegraph.pl / speedscope
+#   - memory: tracemalloc snapshots· κάθε κλήση δείχνει τη διαφορά από την προηγούμενη
+# Ένα profile τη φορά ανά process· το tracemalloc μένει ανοιχτό μέχρι stop=true.
+
+DEFAULT_INTERVAL = 0.005
+MAX_SECONDS = 60.0
+MAX_DEPTH = 64
+
+# Threads που απλώς περιμένουν (idle workers, select του event loop) → εκτός profile
+_IDLE_FILES = (
+    os.sep + "threading.py",
+    os.sep + "selectors.py",
+    os.sep + "queue.py",
+    os.sep + os.path.join("concurrent", "futures", "thread.py"),
+)
+
+_PROFILE_LOCK = threading.Lock()
+_MEM_LOCK = threading.Lock()
+_BASELINE: Optional[tracemalloc.Snapshot] = None
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    parts = path.replace("\\", "/").split("/")
+    if "app" in parts:
+        mod = "/".join(parts[parts.index("app"):])
+    else:
+        mod = parts[-1]
+    return f"{mod}:{code.co_name}"
+
+
+def _collapse(frame, thread_name: str, idle: bool = False) -> Optional[str]:
+    if not idle and frame.f_code.co_filename.endswith(_IDLE_FILES):
+        return None
+    stack: List[str] = []
+    f = frame
+    while f is not None and len(stack) < MAX_DEPTH:
+        stack.append(_frame_label(f.f_code))
+        f = f.f_back
+    stack.append(thread_name)
+    return ";".join(reversed(stack))
+
+
+def sample_stacks(seconds: float, interval: float = DEFAULT_INTERVAL, idle: bool = False) -> Dict[str, Any]:
+    """
+    Statistical sampler: μετράει πόσες φορές εμφανίστηκε κάθε stack.
+    Blocking για `seconds`· καλείται από thread (asyncio.to_thread).
+    """
+    seconds = min(max(float(seconds), 0.1), MAX_SECONDS)
+    interval = max(float(interval), 0.001)
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        raise ProfilerBusy("another profile is running")
+    try:
+        me = threading.get_ident()
+        counts: Counter = Counter()
+        samples = 0
+        t_end = time.perf_counter() + seconds
+        while time.perf_counter() < t_end:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = _collapse(frame, names.get(ident, str(ident)), idle)
+                if stack:
+                    counts[stack] += 1
+            samples += 1
+            time.sleep(interval)
+    finally:
+        _PROFILE_LOCK.release()
+    return {
+        "seconds": seconds,
+        "interval": interval,
+        "samples": samples,
+        "stacks": counts.most_common(),
+    }
+
+
+def collapsed_text(result: Dict[str, Any]) -> str:
+    return "".join(f"{stack} {n}\n" for stack, n in result["stacks"])
+
+
+# ---------------------------------------------------------------------
+# tracemalloc
+# ---------------------------------------------------------------------
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+
+
+def memory_report(top: int = 25, frames: int = 1, group_by: str = "lineno",
+                  reset: bool = True, stop: bool = False) -> Dict[str, Any]:
+    """
+    1η κλήση: ξεκινά tracemalloc και κρατά baseline.
+    Επόμενες: top allocation sites ως διαφορά από το baseline (reset=true → νέο baseline).
+    stop=true: κλείνει το tracemalloc (έχει overhead σε κάθε allocation).
+    """
+    global _BASELINE
+    with _MEM_LOCK:
+        if stop:
+            tracemalloc.stop()
+            _BASELINE = None
+            return {"tracing": False}
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, int(frames)))
+            _BASELINE = _snapshot()
+            return {"tracing": True, "started": True, "frames": tracemalloc.get_traceback_limit(),
+                    "hint": "call again after some traffic to see the diff"}
+
+        snap = _snapshot()
+        base = _BASELINE or snap
+        stats = snap.compare_to(base, group_by)
+        if reset:
+            _BASELINE = snap
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": True,
+        "frames": tracemalloc.get_traceback_limit(),
+        "traced_current_kb": round(current / 1024, 1),
+        "traced_peak_kb": round(peak / 1024, 1),
+        "top": [
+            {
+                "site": [f"{fr.filename}:{fr.lineno}" for fr in st.traceback],
+                "size_kb": round(st.size / 1024, 1),
+                "size_diff_kb": round(st.size_diff / 1024, 1),
+                "count": st.count,
+                "count_diff": st.count_diff,
+            }
+            for st in stats[:max(1, int(top))]
+        ],
+    }
@@ -0,0 +1,298 @@
+# app/core/question_bank.py
+from __future__ import annotations
+
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.core.settings import settings
+
+# Ευρετήριο της τράπεζας ερωτήσεων: χτίζεται ΜΙΑ φορά ανά έκδοση και δεν αλλάζει.
+#   by_id        → QuestionRecord (frozen), με έτοιμο options map + correct_id
+#   pools        → (category, qtype) → tuple εγγραφών (PRE + POST, όπως πριν)
+#   phase_pools  → (phase, category, qtype) → tuple εγγραφών
+# Τα routers κάνουν O(1) lookups χωρίς να αντιγράφουν λίστες ανά request.
+#
+# Τα δεδομένα ζουν στο app/data/questions/questions_<version>.json (schema 1).
+# Φορτώνονται στην πρώτη χρήση (get_bank) και ξαναδιαβάζονται όταν εμφανιστεί
+# νεότερο αρχείο ή αλλάξει το τρέχον (έλεγχος το πολύ κάθε QUESTION_BANK_CHECK_SECONDS).
+
+PHASES = ("PRE", "POST")
+QTYPES = ("open", "mc")
+SCHEMA_VERSION = 1
+FILE_PATTERN = "questions_*.json"
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "questions"
+
+
+def normalize_phase(phase: Optional[str]) -> str:
+    return "POST" if str(phase or "PRE").strip().upper() == "POST" else "PRE"
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionRecord:
+    id: str
+    category: str
+    qtype: str
+    phase: str
+    text: str
+    choices: Tuple[str, ...] = ()
+    correct: Optional[int] = None
+    correct_id: Optional[str] = None
+    options: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+    def public(self) -> Dict[str, Any]:
+        return {"id": self.id, "text": self.text}
+
+    def public_mc(self, hide_correct: bool = True, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+        """MC με ανακατεμένες επιλογές· το correct ακολουθεί τη μετάθεση (όχι αναζήτηση κειμένου)."""
+        rng = rng or random.Random()
+        perm = rng.sample(range(len(self.choices)), len(self.choices))
+        item: Dict[str, Any] = {"id": self.id, "text": self.text, "choices": [self.choices[i] for i in perm]}
+        if not hide_correct and self.correct is not None:
+            item["correct"] = perm.index(self.correct)
+        return item
+
+
+def _record(raw: Dict[str, Any], category: str, qtype: str, phase: str) -> QuestionRecord:
+    choices: Tuple[str, ...] = ()
+    options: Dict[str, str] = {}
+    if isinstance(raw.get("options"), list):
+        for o in raw["options"]:
+            options[str(o.get("id"))] = str(o.get("text") or "")
+        choices = tuple(options.values())
+    elif isinstance(raw.get("choices"), list):
+        choices = tuple(str(t) for t in raw["choices"])
+        options = {str(i): t for i, t in enumerate(choices)}
+
+    correct: Optional[int] = None
+    try:
+        correct = int(raw["correct"]) if raw.get("correct") is not None else None
+    except (TypeError, ValueError):
+        correct = None
+    if raw.get("correct_id") is not None:
+        correct_id: Optional[str] = str(raw["correct_id"])
+    else:
+        correct_id = str(correct) if correct is not None else None
+
+    return QuestionRecord(
+        id=str(raw["id"]),
+        category=category,
+        qtype=qtype,
+        phase=phase,
+        text=str(raw.get("text") or ""),
+        choices=choices,
+        correct=correct,
+        correct_id=correct_id,
+        options=MappingProxyType(options),
+    )
+
+
+@dataclass(frozen=True)
+class QuestionBank:
+    by_id: Mapping[str, QuestionRecord]
+    pools: Mapping[Tuple[str, str], Tuple[QuestionRecord, ...]]
+    phase_pools: Mapping[Tuple[str, str, str], Tuple[QuestionRecord, ...]]
+    ids: Mapping[Tuple[str, str], Tuple[str, ...]]
+    categories: Mapping[str, Tuple[str, ...]]
+    version: str = ""
+    scenes: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+    # το έγγραφο όπως φορτώθηκε (μόνο για τα legacy QUESTIONS_PRE / QUESTIONS_POST)
+    phases: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}), repr=False)
+
+    def get(self, qid: Any) -> Optional[QuestionRecord]:
+        return self.by_id.get(str(qid))
+
+    def lookup(self, category: str, qtype: str, qid: Any) -> Optional[QuestionRecord]:
+        """Εγγραφή μόνο αν ανήκει στο (category, qtype) — ίδια σημασιολογία με το παλιό scan του bucket."""
+        rec = self.by_id.get(str(qid))
+        if rec is None or rec.category != category or rec.qtype != qtype:
+            return None
+        return rec
+
+    def pool(self, category: str, qtype: str) -> Tuple[QuestionRecord, ...]:
+        # άγνωστη κατηγορία → κενό pool (όπως πριν), άγνωστος τύπος → ValueError
+        if qtype not in QTYPES:
+            raise ValueError(f"Άγνωστος τύπος: {qtype}")
+        return self.pools.get((category, qtype), ())
+
+    def sample(
+        self, category: str, qtype: str, n: int, rng: Optional[random.Random] = None
+    ) -> List[QuestionRecord]:
+        pool = self.pool(category, qtype)
+        if n <= 0:
+            return []
+        if n >= len(pool):
+            return list(pool)
+        return (rng or random.Random()).sample(pool, n)
+
+
+def build_index(
+    banks: Mapping[str, Mapping[str, Mapping[str, Iterable[Dict[str, Any]]]]],
+    *,
+    version: str = "",
+    scenes: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> QuestionBank:
+    """banks: {phase: {category: {qtype: [raw question, ...]}}}. Σε διπλό id κρατάμε το πρώτο (PRE πριν το POST)."""
+    by_id: Dict[str, QuestionRecord] = {}
+    pools: Dict[Tuple[str, str], List[QuestionRecord]] = {}
+    phase_pools: Dict[Tuple[str, str, str], Tuple[QuestionRecord, ...]] = {}
+    categories: Dict[str, Tuple[str, ...]] = {}
+
+    for phase in PHASES:
+        bank = banks.get(phase) or {}
+        categories[phase] = tuple(bank.keys())
+        for cat, by_type in bank.items():
+            for qtype in QTYPES:
+                recs = tuple(_record(q, cat, qtype, phase) for q in (by_type or {}).get(qtype) or [])
+                phase_pools[(phase, cat, qtype)] = recs
+                pools.setdefault((cat, qtype), []).extend(recs)
+                for r in recs:
+                    by_id.setdefault(r.id, r)
+
+    frozen_pools = {k: tuple(v) for k, v in pools.items()}
+    return QuestionBank(
+        by_id=MappingProxyType(by_id),
+        pools=MappingProxyType(frozen_pools),
+        phase_pools=MappingProxyType(phase_pools),
+        ids=MappingProxyType({k: tuple(r.id for r in v) for k, v in frozen_pools.items()}),
+        categories=MappingProxyType(categories),
+        version=version,
+        scenes=MappingProxyType({k: MappingProxyType(dict(v)) for k, v in (scenes or {}).items()}),
+        phases=MappingProxyType(dict(banks)),
+    )
+
+
+# ---------------------------------------------------------------------
+# Data file: schema check + lazy / hot-reload φόρτωση
+# ---------------------------------------------------------------------
+class QuestionBankError(ValueError):
+    pass
+
+
+def validate(doc: Any) -> None:
+    """Schema 1: {schema, version, phases: {PRE|POST: {category: {open: [...], mc: [...]}}}, scenes}."""
+    def fail(msg: str) -> None:
+        raise QuestionBankError(msg)
+
+    if not isinstance(doc, dict):
+        fail("το έγγραφο πρέπει να είναι object")
+    if doc.get("schema") != SCHEMA_VERSION:
+        fail(f"μη υποστηριζόμενο schema: {doc.get('schema')!r} (αναμένεται {SCHEMA_VERSION})")
+    if not isinstance(doc.get("version"), str) or not doc["version"]:
+        fail("λείπει το version")
+    phases = doc.get("phases")
+    if not isinstance(phases, dict) or not phases:
+        fail("λείπει το phases")
+    for phase, bank in phases.items():
+        if phase not in PHASES:
+            fail(f"άγνωστο phase: {phase!r}")
+        if not isinstance(bank, dict):
+            fail(f"{phase}: αναμένεται object κατηγοριών")
+        seen: set = set()
+        for cat, by_type in bank.items():
+            if not isinstance(by_type, dict) or set(by_type) - set(QTYPES):
+                fail(f"{phase}/{cat}: επιτρέπονται μόνο τα κλειδιά {QTYPES}")
+            for qtype, items in by_type.items():
+                if not isinstance(items, list):
+                    fail(f"{phase}/{cat}/{qtype}: αναμένεται λίστα")
+                for q in items:
+                    where = f"{phase}/{cat}/{qtype}"
+                    if not isinstance(q, dict) or not q.get("id") or not isinstance(q.get("text"), str):
+                        fail(f"{where}: κάθε ερώτηση χρειάζεται id και text")
+                    if q["id"] in seen:
+                        fail(f"{where}: διπλό id {q['id']!r}")
+                    seen.add(q["id"])
+                    if qtype == "mc":
+                        choices = q.get("choices")
+                        if not isinstance(choices, list) or len(choices) < 2:
+                            fail(f"{where}/{q['id']}: χρειάζονται τουλάχιστον 2 choices")
+                        c = q.get("correct")
+                        if not isinstance(c, int) or isinstance(c, bool) or not 0 <= c < len(choices):
+                            fail(f"{where}/{q['id']}: το correct πρέπει να είναι index στο choices")
+    if not isinstance(doc.get("scenes", {}), dict):
+        fail("το scenes πρέπει να είναι object")
+
+
+def load_file(path: Path) -> QuestionBank:
+    try:
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise QuestionBankError(f"{path}: {e}") from e
+    validate(doc)
+    return build_index(doc["phases"], version=doc["version"], scenes=doc.get("scenes"))
+
+
+def bank_dir() -> Path:
+    return Path(settings.QUESTION_BANK_DIR) if settings.QUESTION_BANK_DIR else DEFAULT_DIR
+
+
+def latest_file(directory: Optional[Path] = None) -> Optional[Path]:
+    """Το αρχείο με τη μεγαλύτερη έκδοση (τα ονόματα είναι questions_<UTC timestamp>.json)."""
+    files = sorted((directory or bank_dir()).glob(FILE_PATTERN))
+    return files[-1] if files else None
+
+
+_LOCK = threading.Lock()
+_BANK: Optional[QuestionBank] = None
+_SIG: Optional[Tuple[str, int, int]] = None
+_CHECKED_AT = 0.0
+
+
+def get_bank() -> QuestionBank:
+    """Η τρέχουσα τράπεζα· ο έλεγχος για νέα έκδοση γίνεται το πολύ κάθε CHECK_SECONDS."""
+    global _BANK, _SIG, _CHECKED_AT
+    bank = _BANK
+    if bank is not None and time.monotonic() - _CHECKED_AT < settings.QUESTION_BANK_CHECK_SECONDS:
+        return bank
+    with _LOCK:
+        if _BANK is not None and time.monotonic() - _CHECKED_AT < settings.QUESTION_BANK_CHECK_SECONDS:
+            return _BANK
+        _CHECKED_AT = time.monotonic()
+        path = latest_file()
+        if path is None:
+            if _BANK is None:
+                raise QuestionBankError(f"δεν βρέθηκε {FILE_PATTERN} στο {bank_dir()}")
+            return _BANK
+        st = path.stat()
+        sig = (str(path), st.st_mtime_ns, st.st_size)
+        if sig == _SIG and _BANK is not None:
+            return _BANK
+        try:
+            _BANK = load_file(path)
+            _SIG = sig
+            print(f"[questions] loaded {path.name} (version {_BANK.version}, {len(_BANK.by_id)} questions)")
+        except QuestionBankError as e:
+            if _BANK is None:
+                raise
+            # κακό νέο αρχείο: κρατάμε την προηγούμενη έκδοση
+            print(f"[questions] ignoring {path.name}: {e}")
+            _SIG = sig
+        return _BANK
+
+
+def reload_bank() -> QuestionBank:
+    """Άμεσος έλεγχος για νέα έκδοση (π.χ. μετά από deploy του αρχείου)."""
+    global _CHECKED_AT
+    with _LOCK:
+        _CHECKED_AT = 0.0
+    return get_bank()
+
+
+if __name__ == "__main__":
+    # python -m app.core.question_bank [αρχείο.json] → schema check πριν το deploy
+    target = Path(sys.argv[1]) if len(sys.argv) > 1 else latest_file()
+    if target is None:
+        sys.exit(f"δεν βρέθηκε {FILE_PATTERN} στο {bank_dir()}")
+    try:
+        b = load_file(target)
+    except QuestionBankError as e:
+        sys.exit(f"INVALID {target}: {e}")
+    counts = {f"{c}/{t}": len(v) for (c, t), v in b.pools.items()}
+    print(json.dumps({"file": str(target), "version": b.version, "questions": len(b.by_id),
+                      "pools": counts}, ensure_ascii=False, indent=2))
@@ -0,0 +1,173 @@
+# app/core/question_catalog.py
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.core.http_cache import data_watermark
+from app.core.question_bank import QuestionBank, get_bank
+from app.core.telemetry import cache_result
+
+# Κατάλογος ερωτήσεων για το Rater UI / quiz aliases (id → text/category/qtype).
+# Ο πίνακας question_catalog (migration 4e96d35a5d37) γεμίζει από την τράπεζα και
+# από trigger στο answers όταν εμφανίζεται νέο question_id, οπότε τα endpoints δεν
+# κάνουν πια DISTINCT ON σε όλο το answers. Εδώ κρατάμε ένα snapshot στη μνήμη που
+# ακυρώνεται όταν αλλάξει το data_versions.version του πίνακα.
+# Χωρίς τον πίνακα (παλιό schema) πέφτουμε στο αρχικό query πάνω στο answers.
+
+TABLE = "question_catalog"
+# Το "λείπει" ξαναελέγχεται (π.χ. τρέχει το migration ενώ ζει το process)
+RECHECK_SECONDS = 60.0
+NO_TEXT = "[no question text]"
+
+CATALOG_SQL = """
+    SELECT question_id AS id,
+           COALESCE(NULLIF(text, ''), :no_text) AS text,
+           category,
+           qtype
+    FROM question_catalog
+    WHERE first_seen_at IS NOT NULL
+    ORDER BY question_id
+"""
+
+LEGACY_SQL = """
+    SELECT DISTINCT ON (question_id)
+           question_id AS id,
+           COALESCE(NULLIF(prompt, ''), :no_text) AS text,
+           COALESCE(category, '') AS category,
+           COALESCE(qtype, '')    AS qtype
+    FROM answers
+    WHERE question_id IS NOT NULL
+    ORDER BY question_id, created_at DESC
+"""
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    token: Optional[str]
+    items: Tuple[Dict[str, Any], ...]
+    qmap: Mapping[str, Dict[str, Any]]
+
+    def bundle_payload(self) -> Dict[str, Any]:
+        return {"items": list(self.items)}
+
+    def index_payload(self) -> Dict[str, Any]:
+        return {"items": list(self.items), "map": dict(self.qmap)}
+
+
+_LOCK = threading.Lock()
+_SNAPSHOT: Optional[CatalogSnapshot] = None
+_HAS_TABLE: Optional[bool] = None
+_CHECKED_AT = 0.0
+
+
+def has_catalog(session: Session) -> bool:
+    global _HAS_TABLE, _CHECKED_AT
+    with _LOCK:
+        if _HAS_TABLE or (_HAS_TABLE is False and time.monotonic() - _CHECKED_AT < RECHECK_SECONDS):
+            return _HAS_TABLE
+    try:
+        found = bool(session.execute(
+            text("SELECT to_regclass('public.question_catalog') IS NOT NULL")
+        ).scalar())
+    except SQLAlchemyError:
+        session.rollback()
+        found = False
+    with _LOCK:
+        _HAS_TABLE, _CHECKED_AT = found, time.monotonic()
+    return found
+
+
+def catalog_tables(session: Session) -> Tuple[str, ...]:
+    """Οι πίνακες από τους οποίους εξαρτάται το snapshot (για watermark / ETag)."""
+    return (TABLE,) if has_catalog(session) else ("answers",)
+
+
+def _build(rows: List[Mapping[str, Any]], token: Optional[str]) -> CatalogSnapshot:
+    items: List[Dict[str, Any]] = []
+    qmap: Dict[str, Dict[str, Any]] = {}
+    for r in rows:
+        obj = {
+            "id": r["id"],
+            "text": r["text"],
+            "category": r["category"],
+            "qtype": r["qtype"],
+            "options": [],
+        }
+        items.append(obj)
+        qmap[r["id"]] = {k: v for k, v in obj.items() if k != "id"}
+    return CatalogSnapshot(token=token, items=tuple(items), qmap=MappingProxyType(qmap))
+
+
+def catalog_snapshot(session: Session) -> CatalogSnapshot:
+    """Το τρέχον snapshot· ξαναδιαβάζεται μόνο όταν αλλάξει ο watermark."""
+    global _SNAPSHOT
+    tables = catalog_tables(session)
+    wm = data_watermark(session, tables)
+    token = wm[0] if wm is not None else None
+
+    snap = _SNAPSHOT
+    hit = token is not None and snap is not None and snap.token == token
+    cache_result("question_catalog", hit)
+    if hit:
+        return snap
+
+    sql = CATALOG_SQL if tables == (TABLE,) else LEGACY_SQL
+    rows = session.execute(text(sql), {"no_text": NO_TEXT}).mappings().all()
+    snap = _build(rows, token)
+    if token is not None:
+        with _LOCK:
+            _SNAPSHOT = snap
+    return snap
+
+
+def sync_from_bank(session: Session, bank: Optional[QuestionBank] = None) -> int:
+    """
+    Upsert των ερωτήσεων της τράπεζας (π.χ. μετά από νέο questions_<version>.json).
+    Δεν πειράζει κείμενα που ήρθαν από answers, εκτός αν λείπουν. Επιστρέφει #γραμμών.
+    """
+    bank = bank or get_bank()
+    rows = [
+        {"id": r.id, "text": r.text or None, "category": r.category, "qtype": r.qtype}
+        for r in bank.by_id.values()
+    ]
+    if not rows:
+        return 0
+    res = session.execute(text("""
+        INSERT INTO question_catalog AS q (question_id, text, category, qtype, source)
+        SELECT x.id, x.text, x.category, x.qtype, 'bank'
+        FROM jsonb_to_recordset(CAST(:rows AS jsonb))
+             AS x(id TEXT, text TEXT, category TEXT, qtype TEXT)
+        ON CONFLICT (question_id) DO UPDATE
+          SET text       = CASE WHEN q.source = 'bank' OR q.text IS NULL
+                                THEN EXCLUDED.text ELSE q.text END,
+              category   = CASE WHEN q.source = 'bank' THEN EXCLUDED.category ELSE q.category END,
+              qtype      = CASE WHEN q.source = 'bank' THEN EXCLUDED.qtype ELSE q.qtype END,
+              updated_at = now()
+          WHERE (q.text IS NULL AND EXCLUDED.text IS NOT NULL)
+             OR (q.source = 'bank'
+                 AND (q.text, q.category, q.qtype)
+                     IS DISTINCT FROM (EXCLUDED.text, EXCLUDED.category, EXCLUDED.qtype))
+    """), {"rows": json.dumps(rows, ensure_ascii=False)})
+    session.commit()
+    return int(res.rowcount or 0)
+
+
+if __name__ == "__main__":
+    # python -m app.core.question_catalog sync → μετά από deploy νέας τράπεζας
+    if sys.argv[1:] != ["sync"]:
+        sys.exit("usage: python -m app.core.question_catalog sync")
+    from app.core.db import get_engine
+
+    with Session(get_engine()) as s:
+        n = sync_from_bank(s)
+    print(f"[question_catalog] {n} rows upserted from bank {get_bank().version}")
@@ -0,0 +1,125 @@
+# app/core/ratings.py
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+# Μορφή rater_id (ίδια με το CHECK του human_ratings, migration be9f18ee2aa5)
+RATER_ID_PATTERN = r"^[A-Za-z0-9_.-]{1,64}$"
+
+
+def normalize_score(score: Any) -> Optional[float]:
+    """0..10 ή 0..1 → 0..1 (3 δεκαδικά, όπως NUMERIC(4,3)). None αν είναι άκυρο."""
+    try:
+        s = float(score)
+    except Exception:
+        return None
+    if math.isnan(s) or s < 0.0 or s > 10.0:
+        return None
+    if s > 1.0:
+        s = s / 10.0
+    return round(s, 3)
+
+
+def bulk_upsert_ratings(
+    session: Session,
+    rater_id: str,
+    items: Sequence[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Upsert ενός ολόκληρου batch στο human_ratings με ΕΝΑ statement (unnest arrays).
+
+    items: [{"answerId": ..., "score": ...}, ...]
+    Επιστρέφει per-row outcomes (ίδια σειρά με το input):
+      inserted | updated | unchanged | not_found | invalid | duplicate
+    Το final_scores ενημερώνεται από τα statement-level triggers (ένα recompute
+    για όλα τα answer_ids του batch). Δεν κάνει commit.
+    """
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    last_idx: Dict[str, int] = {}
+
+    # ---- validation στη μνήμη (όλο το batch)
+    for i, it in enumerate(items):
+        raw_id = it.get("answerId")
+        res: Dict[str, Any] = {"index": i, "answerId": raw_id}
+        results[i] = res
+        try:
+            aid = str(UUID(str(raw_id)))
+        except Exception:
+            res.update(status="invalid", error="answerId is not a UUID")
+            continue
+        s = normalize_score(it.get("score"))
+        if s is None:
+            res.update(status="invalid", error="score must be in 0..1 or 0..10")
+            continue
+        res.update(answerId=aid, score=s)
+        if aid in last_idx:
+            # το τελευταίο κερδίζει
+            results[last_idx[aid]].update(status="duplicate")
+        last_idx[aid] = i
+
+    ids = list(last_idx.keys())
+    if not ids:
+        return _summary(results)
+
+    # ---- ποια answers υπάρχουν (ένα query)
+    existing = {
+        str(r[0])
+        for r in session.execute(
+            text("SELECT answer_id FROM answers WHERE answer_id = ANY(CAST(:ids AS uuid[]))"),
+            {"ids": ids},
+        ).all()
+    }
+    for aid in ids:
+        if aid not in existing:
+            results[last_idx[aid]].update(status="not_found")
+
+    write_ids = [aid for aid in ids if aid in existing]
+    if not write_ids:
+        return _summary(results)
+
+    # ---- ΕΝΑ upsert για όλο το batch
+    rows = session.execute(
+        text("""
+          INSERT INTO human_ratings AS h (answer_id, rater_id, score)
+          SELECT t.answer_id, :rid, t.score
+          FROM unnest(CAST(:ids AS uuid[]), CAST(:scores AS numeric[])) AS t(answer_id, score)
+          ON CONFLICT (answer_id, rater_id)
+          DO UPDATE SET score = EXCLUDED.score, rated_at = now()
+          WHERE h.score IS DISTINCT FROM EXCLUDED.score
+          RETURNING h.answer_id, (xmax = 0) AS inserted
+        """),
+        {
+            "rid": rater_id,
+            "ids": write_ids,
+            "scores": [results[last_idx[aid]]["score"] for aid in write_ids],
+        },
+    ).all()
+
+    written = {str(r[0]): bool(r[1]) for r in rows}
+    for aid in write_ids:
+        res = results[last_idx[aid]]
+        if aid not in written:
+            res["status"] = "unchanged"
+        else:
+            res["status"] = "inserted" if written[aid] else "updated"
+
+    return _summary(results)
+
+
+def _summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return {
+        "inserted": counts.get("inserted", 0),
+        "updated": counts.get("updated", 0),
+        "unchanged": counts.get("unchanged", 0),
+        "rejected": counts.get("invalid", 0) + counts.get("not_found", 0),
+        "duplicates": counts.get("duplicate", 0),
+        "results": results,
+    }
@@ -0,0 +1,422 @@
+# app/core/reliability.py
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+# Reliability από τα αθροίσματα που συντηρούν τα triggers (migration 90baf8b452d3):
+#   reliability_cells  → confusion matrix 21×21 ανά ζεύγος raters → QWK
+#   reliability_pairs  → Σa, Σb, Σa², Σb², Σab ανά ζεύγος       → ICC
+#   reliability_totals → n, Σd, Σd² (auto − human)              → bias / LoA
+# Το κόστος ανά request είναι O(ζεύγη × 21²), ανεξάρτητο από το πλήθος των βαθμολογιών.
+# Χωρίς τους πίνακες (SQLite / create_all, βάση χωρίς upgrade) τα ίδια αθροίσματα
+# υπολογίζονται απευθείας από τις βαθμολογίες (load_stats_direct, μόνο study flow).
+
+SOURCE_RATER = "human_ratings"   # answers / human_ratings / llm_scores, κλίμακα 0..1
+SOURCE_STUDY = "humanrating"     # interaction / humanrating / autorating, κλίμακα 0..10
+
+N_LEVELS = 21
+# level = round(score * LEVELS_PER_UNIT[source])
+LEVELS_PER_UNIT = {SOURCE_RATER: 20, SOURCE_STUDY: 2}
+
+MAX_BOOTSTRAP = 5000
+_BOOT_CHUNK_CELLS = 2_000_000   # B × unique d ανά chunk στο bootstrap του bias
+
+_W21 = (np.subtract.outer(np.arange(N_LEVELS), np.arange(N_LEVELS)) ** 2).astype(float)
+
+TABLE = "reliability_pairs"
+# Το "λείπει" ξαναελέγχεται (π.χ. τρέχει το migration ενώ ζει το process)
+RECHECK_SECONDS = 60.0
+
+_LOCK = threading.Lock()
+_HAS_STATS: Optional[bool] = None
+_CHECKED_AT = 0.0
+
+
+@dataclass
+class ReliabilityStats:
+    source: str
+    pairs: List[Tuple[str, str]] = field(default_factory=list)
+    moments: np.ndarray = field(default_factory=lambda: np.zeros((0, 6)))      # n, Σa, Σb, Σaa, Σbb, Σab
+    cells: np.ndarray = field(default_factory=lambda: np.zeros((0, N_LEVELS, N_LEVELS)))
+    raters: Dict[str, int] = field(default_factory=dict)
+    n_answers: int = 0
+    n_multi: int = 0          # answers με ≥ 2 βαθμολογίες (μόνο αυτά μπαίνουν στο ICC)
+    ratings_multi: int = 0    # Σ n_raters πάνω σε αυτά
+    n_auto: int = 0
+    sum_d: float = 0.0
+    sum_dd: float = 0.0
+    d_values: Optional[np.ndarray] = None   # μόνο στο load_stats_direct (bootstrap χωρίς reliability_answers)
+
+
+def has_stats(session: Session) -> bool:
+    global _HAS_STATS, _CHECKED_AT
+    with _LOCK:
+        if _HAS_STATS or (_HAS_STATS is False and time.monotonic() - _CHECKED_AT < RECHECK_SECONDS):
+            return _HAS_STATS
+    try:
+        found = inspect(session.connection()).has_table(TABLE)
+    except SQLAlchemyError:
+        session.rollback()
+        found = False
+    with _LOCK:
+        _HAS_STATS, _CHECKED_AT = found, time.monotonic()
+    return found
+
+
+def _filters(category: Optional[str], qtype: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+    return (
+        "source = :src"
+        " AND (CAST(:cat AS TEXT) IS NULL OR category = :cat)"
+        " AND (CAST(:qt AS TEXT) IS NULL OR qtype = :qt)",
+        {"cat": category, "qt": qtype},
+    )
+
+
+def load_stats(
+    session: Session,
+    source: str,
+    *,
+    category: Optional[str] = None,
+    qtype: Optional[str] = None,
+) -> ReliabilityStats:
+    """Φορτώνει τα αθροίσματα (άθροισμα πάνω από category / qtype όταν είναι None)."""
+    where, params = _filters(category, qtype)
+    params["src"] = source
+    st = ReliabilityStats(source=source)
+
+    rows = session.execute(text(f"""
+        SELECT rater_a, rater_b, SUM(n), SUM(sum_a), SUM(sum_b), SUM(sum_aa), SUM(sum_bb), SUM(sum_ab)
+        FROM reliability_pairs
+        WHERE {where} AND n > 0
+        GROUP BY rater_a, rater_b
+        ORDER BY rater_a, rater_b
+    """), params).all()
+    st.pairs = [(r[0], r[1]) for r in rows]
+    st.moments = np.array([[float(v) for v in r[2:]] for r in rows], dtype=float).reshape(-1, 6)
+
+    index = {p: i for i, p in enumerate(st.pairs)}
+    st.cells = np.zeros((len(st.pairs), N_LEVELS, N_LEVELS), dtype=float)
+    cells = session.execute(text(f"""
+        SELECT rater_a, rater_b, la, lb, SUM(n)
+        FROM reliability_cells
+        WHERE {where} AND n > 0
+        GROUP BY rater_a, rater_b, la, lb
+    """), params).all()
+    if cells:
+        idx = np.array([index.get((r[0], r[1]), -1) for r in cells])
+        la = np.array([int(r[2]) for r in cells])
+        lb = np.array([int(r[3]) for r in cells])
+        n = np.array([float(r[4]) for r in cells])
+        ok = idx >= 0
+        np.add.at(st.cells, (idx[ok], la[ok], lb[ok]), n[ok])
+
+    st.raters = {
+        r[0]: int(r[1])
+        for r in session.execute(text(f"""
+            SELECT rater_id, SUM(n) FROM reliability_raters
+            WHERE {where} AND n > 0
+            GROUP BY rater_id
+        """), params).all()
+    }
+
+    tot = session.execute(text(f"""
+        SELECT COALESCE(SUM(n_answers), 0), COALESCE(SUM(n_auto), 0),
+               COALESCE(SUM(sum_d), 0), COALESCE(SUM(sum_dd), 0)
+        FROM reliability_totals
+        WHERE {where}
+    """), params).one()
+    st.n_answers, st.n_auto = int(tot[0]), int(tot[1])
+    st.sum_d, st.sum_dd = float(tot[2]), float(tot[3])
+
+    multi = session.execute(text(f"""
+        SELECT COUNT(*), COALESCE(SUM(n_raters), 0)
+        FROM reliability_answers
+        WHERE {where} AND n_raters >= 2
+    """), params).one()
+    st.n_multi, st.ratings_multi = int(multi[0]), int(multi[1])
+    return st
+
+
+def load_stats_direct(session: Session, *, category: str, qtype: str) -> ReliabilityStats:
+    """
+    Ίδια αθροίσματα με τα triggers του study flow, από humanrating / autorating
+    (τελευταία εγγραφή κατά id ανά (answer, rater) και ανά answer). O(βαθμολογίες).
+    """
+    params = {"cat": category, "qt": qtype}
+    lpu = LEVELS_PER_UNIT[SOURCE_STUDY]
+    st = ReliabilityStats(source=SOURCE_STUDY)
+
+    by_answer: Dict[str, Dict[str, float]] = {}
+    for aid, rid, score in session.execute(text("""
+        SELECT h.answer_id, h.rater_id, h.score
+        FROM humanrating h JOIN interaction i ON i.answer_id = h.answer_id
+        WHERE i.category = :cat AND i.qtype = :qt AND h.score IS NOT NULL
+        ORDER BY h.id
+    """), params):
+        by_answer.setdefault(aid, {})[rid] = float(score)
+    auto: Dict[str, float] = {
+        aid: float(score)
+        for aid, score in session.execute(text("""
+            SELECT a.answer_id, a.score
+            FROM autorating a JOIN interaction i ON i.answer_id = a.answer_id
+            WHERE i.category = :cat AND i.qtype = :qt AND a.score IS NOT NULL
+            ORDER BY a.id
+        """), params)
+    }
+
+    def level(x: float) -> int:
+        # round() της PostgreSQL (μισό → μακριά από το 0), όπως στα triggers
+        return min(max(int(np.floor(x * lpu + 0.5)), 0), N_LEVELS - 1)
+
+    index: Dict[Tuple[str, str], int] = {}
+    moments: List[List[float]] = []
+    cells: List[Tuple[int, int, int]] = []
+    ds: List[float] = []
+    for aid, scores in by_answer.items():
+        for rid in scores:
+            st.raters[rid] = st.raters.get(rid, 0) + 1
+        if len(scores) >= 2:
+            st.n_multi += 1
+            st.ratings_multi += len(scores)
+        raters = sorted(scores)
+        for i, ra in enumerate(raters):
+            for rb in raters[i + 1:]:
+                a, b = scores[ra], scores[rb]
+                j = index.setdefault((ra, rb), len(index))
+                if j == len(moments):
+                    moments.append([0.0] * 6)
+                m = moments[j]
+                m[0] += 1; m[1] += a; m[2] += b; m[3] += a * a; m[4] += b * b; m[5] += a * b
+                cells.append((j, level(a), level(b)))
+        if aid in auto:
+            ds.append(auto[aid] - sum(scores.values()) / len(scores))
+
+    st.pairs = list(index)
+    st.moments = np.array(moments, dtype=float).reshape(-1, 6)
+    st.cells = np.zeros((len(st.pairs), N_LEVELS, N_LEVELS), dtype=float)
+    if cells:
+        np.add.at(st.cells, tuple(np.array(cells).T), 1.0)
+    st.n_answers = len(by_answer)
+    st.d_values = np.array(ds, dtype=float)
+    st.n_auto = len(ds)
+    st.sum_d = float(st.d_values.sum())
+    st.sum_dd = float((st.d_values * st.d_values).sum())
+    return st
+
+
+# ---------------------------------------------------------------------
+# Στατιστικά (vectorized, δέχονται και batch διαστάσεις για το bootstrap)
+# ---------------------------------------------------------------------
+def qwk(O: np.ndarray) -> np.ndarray:
+    """Quadratic-weighted kappa για confusion matrices (..., K, K). NaN όπου δεν ορίζεται."""
+    O = np.asarray(O, dtype=float)
+    K = O.shape[-1]
+    W = _W21 if K == N_LEVELS else (np.subtract.outer(np.arange(K), np.arange(K)) ** 2).astype(float)
+    N = O.sum(axis=(-2, -1))
+    rows = O.sum(axis=-1)
+    cols = O.sum(axis=-2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        num = (W * O).sum(axis=(-2, -1)) / N
+        # Σ W_ij r_i c_j / N² χωρίς να σχηματιστεί ο πίνακας E
+        den = np.einsum("...i,ij,...j->...", rows, W, cols) / (N * N)
+        return np.where((N > 0) & (den > 0), 1.0 - num / den, np.nan)
+
+
+def rebin(O: np.ndarray, bins: int, levels_per_unit: int) -> np.ndarray:
+    """21×21 levels → bins×bins, bin = min(int(x * bins), bins − 1), x = level / levels_per_unit."""
+    lv = np.arange(N_LEVELS)
+    b = np.minimum((lv * bins) // levels_per_unit, bins - 1)
+    M = np.zeros((N_LEVELS, bins))
+    M[lv, b] = 1.0
+    return M.T @ O @ M
+
+
+def icc_from_moments(m: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ICC(2,1) και ICC(2,2) (two-way random, absolute agreement) ανά ζεύγος από
+    n, Σa, Σb, Σa², Σb², Σab — το two-way ANOVA για k = 2 χωρίς τα δεδομένα.
+    """
+    m = np.asarray(m, dtype=float)
+    n, sa, sb, saa, sbb, sab = (m[..., i] for i in range(6))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gm = (sa + sb) / (2 * n)
+        sst = saa + sbb - 2 * n * gm ** 2
+        ssr = n * ((sa / n - gm) ** 2 + (sb / n - gm) ** 2)              # raters
+        ssc = (saa + sbb + 2 * sab) / 2 - 2 * n * gm ** 2                # targets
+        sse = sst - ssr - ssc
+        msr = ssr
+        msc = ssc / (n - 1)
+        mse = sse / (n - 1)
+        icc1 = (msc - mse) / (msc + mse + 2 * (msr - mse) / n)
+        icc2 = (msc - mse) / (msc + (msr - mse) / n)
+    ok = n >= 2
+    return np.where(ok, icc1, np.nan), np.where(ok, icc2, np.nan)
+
+
+def _spearman_brown(r: np.ndarray, k: float) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return k * r / (1 + (k - 1) * r)
+
+
+def _mean_kappa(cells: np.ndarray) -> np.ndarray:
+    """Μέσος όρος QWK πάνω στα ζεύγη με n ≥ 2 (άξονας -3)."""
+    k = qwk(cells)
+    k = np.where(cells.sum(axis=(-2, -1)) >= 2, k, np.nan)
+    with np.errstate(invalid="ignore"):
+        cnt = np.sum(~np.isnan(k), axis=-1)
+        return np.where(cnt > 0, np.nansum(k, axis=-1) / np.maximum(cnt, 1), np.nan)
+
+
+def _pooled_icc(moments: np.ndarray, k: float) -> np.ndarray:
+    icc1, _ = icc_from_moments(moments)
+    w = np.where(np.isnan(icc1), 0.0, moments[..., 0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.nansum(np.where(np.isnan(icc1), 0.0, icc1) * w, axis=-1) / w.sum(axis=-1)
+    return _spearman_brown(r, k) if k >= 2 else np.full_like(r, np.nan)
+
+
+def _moments_from_cells(cells: np.ndarray, levels_per_unit: int) -> np.ndarray:
+    v = np.arange(N_LEVELS) / levels_per_unit
+    n = cells.sum(axis=(-2, -1))
+    sa = np.einsum("...ij,i->...", cells, v)
+    sb = np.einsum("...ij,j->...", cells, v)
+    saa = np.einsum("...ij,i->...", cells, v * v)
+    sbb = np.einsum("...ij,j->...", cells, v * v)
+    sab = np.einsum("...ij,i,j->...", cells, v, v)
+    return np.stack([n, sa, sb, saa, sbb, sab], axis=-1)
+
+
+def _ci(samples: np.ndarray) -> Optional[List[float]]:
+    s = samples[~np.isnan(samples)]
+    if s.size < 2:
+        return None
+    lo, hi = np.percentile(s, [2.5, 97.5])
+    return [float(lo), float(hi)]
+
+
+def _num(x: Any) -> Optional[float]:
+    try:
+        x = float(x)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(x) or np.isinf(x) else x
+
+
+def _mean_k(st: ReliabilityStats) -> float:
+    """
+    Μέσο πλήθος raters ανά answer (το k του ICC(2,k)), μόνο πάνω στα answers με ≥ 2
+    βαθμολογίες: αυτά δίνουν τα ζεύγη του ICC, και τα μονο-βαθμολογημένα θα έριχναν
+    το k κάτω από 2 (→ NaN) ενώ υπάρχουν επαρκή ζεύγη.
+    """
+    return st.ratings_multi / st.n_multi if st.n_multi else 0.0
+
+
+def _bias_loa(n, sum_d, sum_dd):
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = sum_d / n
+        var = np.where(n > 1, (sum_dd - n * m * m) / (n - 1), 0.0)
+        sd = np.sqrt(np.maximum(var, 0.0))
+    m = np.where(n > 0, m, np.nan)
+    return m, m - 1.96 * sd, m + 1.96 * sd
+
+
+def summarize(
+    session: Session,
+    st: ReliabilityStats,
+    *,
+    category: Optional[str] = None,
+    qtype: Optional[str] = None,
+    bootstrap: int = 0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Kappa / ICC(2,k) / bias & LoA. bootstrap > 0 → 95% CI (percentile) ανά στατιστικό."""
+    lpu = LEVELS_PER_UNIT[st.source]
+    k = _mean_k(st)
+    kappa = _mean_kappa(st.cells)
+    icc = _pooled_icc(st.moments, k)
+    bias, loa_low, loa_high = _bias_loa(st.n_auto, st.sum_d, st.sum_dd)
+    n_pairs = int(np.sum(~np.isnan(np.where(st.cells.sum(axis=(-2, -1)) >= 2, qwk(st.cells), np.nan))))
+
+    out: Dict[str, Any] = {
+        "n_interactions_used": st.n_answers,
+        "n_unique_raters": len(st.raters),
+        "kappa": {"mean": _num(kappa), "weights": "quadratic", "pairs": n_pairs},
+        "icc": {"ICC2k": _num(icc), "k": _num(round(k, 3)) if k else None},
+        "auto_vs_human": {
+            "bias": _num(bias), "loa_low": _num(loa_low), "loa_high": _num(loa_high),
+            "n": st.n_auto,
+        },
+    }
+    if bootstrap <= 0:
+        return out
+
+    B = min(int(bootstrap), MAX_BOOTSTRAP)
+    rng = np.random.default_rng(seed)
+
+    # ζεύγη: multinomial πάνω στα cells κάθε ζεύγους → (B, pairs, 21, 21)
+    if len(st.pairs):
+        boot = np.zeros((B,) + st.cells.shape)
+        for i, c in enumerate(st.cells):
+            n = int(c.sum())
+            if n > 0:
+                boot[:, i] = rng.multinomial(n, (c / n).ravel(), size=B).reshape(B, N_LEVELS, N_LEVELS)
+        out["kappa"]["ci95"] = _ci(_mean_kappa(boot))
+        out["icc"]["ci95"] = _ci(_pooled_icc(_moments_from_cells(boot, lpu), k))
+
+    # bias / LoA: resampling των d ανά answer (μοναδικές τιμές + multinomial, σε chunks)
+    if st.n_auto > 1:
+        if st.d_values is not None:
+            d, p = np.unique(st.d_values, return_counts=True)
+            p = p.astype(float)
+        else:
+            where, params = _filters(category, qtype)
+            params["src"] = st.source
+            rows = session.execute(text(f"""
+                SELECT d, COUNT(*) FROM reliability_answers
+                WHERE {where} AND d IS NOT NULL
+                GROUP BY d
+            """), params).all()
+            d = np.array([float(r[0]) for r in rows])
+            p = np.array([float(r[1]) for r in rows])
+        n = int(p.sum())
+        p /= p.sum()
+        s1, s2 = np.empty(B), np.empty(B)
+        step = max(1, _BOOT_CHUNK_CELLS // max(len(d), 1))
+        for lo in range(0, B, step):
+            c = rng.multinomial(n, p, size=min(step, B - lo))
+            s1[lo:lo + len(c)] = c @ d
+            s2[lo:lo + len(c)] = c @ (d * d)
+        b, l, h = _bias_loa(np.full(B, n), s1, s2)
+        out["auto_vs_human"].update(bias_ci95=_ci(b), loa_low_ci95=_ci(l), loa_high_ci95=_ci(h))
+
+    out["bootstrap"] = {"B": B, "seed": seed}
+    return out
+
+
+def pair_qwk(session: Session, rater_a: str, rater_b: str, bins: int) -> Tuple[int, Optional[float]]:
+    """(n_common, QWK) για δύο raters του rater flow, σε `bins` κατηγορίες."""
+    a, b = sorted((rater_a, rater_b))
+    rows = session.execute(text("""
+        SELECT la, lb, SUM(n)
+        FROM reliability_cells
+        WHERE source = :src AND rater_a = :a AND rater_b = :b AND n > 0
+        GROUP BY la, lb
+    """), {"src": SOURCE_RATER, "a": a, "b": b}).all()
+    O = np.zeros((N_LEVELS, N_LEVELS))
+    for la, lb, n in rows:
+        O[int(la), int(lb)] += float(n)
+    if (a, b) != (rater_a, rater_b):
+        O = O.T
+    n_common = int(O.sum())
+    if n_common < 2:
+        return n_common, None
+    return n_common, _num(qwk(rebin(O, bins, LEVELS_PER_UNIT[SOURCE_RATER])))
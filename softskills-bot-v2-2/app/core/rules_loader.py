@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import Tuple
 from fastapi import HTTPException
 
+from app.core.tracing import span
+
 RULES_PATH = Path("app/rules/rules_v2.json")
 
 def _load_from_env() -> Tuple[dict | None, str]:
@@ -28,10 +30,13 @@ def _load_from_file() -> Tuple[dict, str]:
         raise HTTPException(status_code=500, detail=f"failed to read rules file: {e}")
 
 def load_rules() -> Tuple[dict, str]:
-    data, src = _load_from_env()
-    if data is not None:
+    with span("rules.load") as sp:
+        data, src = _load_from_env()
+        if data is None:
+            data, src = _load_from_file()
+        sp["source"] = src
+    if src == "env":
         print("[rules] loaded from ENV RULES_OVERRIDE_JSON")
-        return data, src
-    data, src = _load_from_file()
-    print(f"[rules] loaded from {src}")
+    else:
+        print(f"[rules] loaded from {src}")
     return data, src
@@ -37,6 +37,56 @@ class Settings:
     OPENAI_TEMPERATURE: float = _get_float("OPENAI_TEMPERATURE", 0.2)
     OPENAI_BASE_URL: str | None = os.getenv("OPENAI_BASE_URL") or None
 
+    # Εκκίνηση: "create_all" (dev / SQLite) ή "skip" όταν το schema το κρατάει το alembic
+    # (Lambda: γλιτώνουμε τα metadata queries του create_all σε κάθε cold start)
+    DB_INIT_MODE: str = os.getenv("DB_INIT_MODE", "create_all").strip().lower()
+
+    # GET /metrics (Prometheus) και το middleware που μετράει latency ανά route
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Tracing (spans ανά request → rotating JSONL + GET /_diag/traces/slowest)
+    # Κρατάμε TRACE_SAMPLE_RATE των requests και όλα όσα ξεπερνούν TRACE_SLOW_MS.
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_SAMPLE_RATE: float = _get_float("TRACE_SAMPLE_RATE", 0.05)
+    TRACE_SLOW_MS: float = _get_float("TRACE_SLOW_MS", 1000.0)
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "/tmp/softskills-traces/traces.jsonl")
+    TRACE_FILE_MAX_BYTES: float = _get_float("TRACE_FILE_MAX_BYTES", 5_000_000)
+    TRACE_FILE_BACKUPS: float = _get_float("TRACE_FILE_BACKUPS", 3)
+    TRACE_BUFFER: float = _get_float("TRACE_BUFFER", 200)
+    # "otel": export και στο OpenTelemetry SDK (ό,τι exporter έχει ρυθμιστεί εκεί)
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "").strip().lower()
+
+    # Export jobs: "local" (φάκελος EXPORT_DIR) ή "s3" (EXPORT_BUCKET)
+    EXPORT_STORE: str = os.getenv("EXPORT_STORE", "local")
+    EXPORT_DIR: str = os.getenv("EXPORT_DIR", "/tmp/softskills-exports")
+    EXPORT_BUCKET: str | None = os.getenv("EXPORT_BUCKET") or None
+    EXPORT_JOB_TTL_HOURS: float = _get_float("EXPORT_JOB_TTL_HOURS", 24.0)
+    # "external" (default): μόνο ο worker (python -m app.core.export_jobs / scheduled Lambda)
+    # "inline": το job τρέχει στο ίδιο process μετά το response (μόνο uvicorn/dev·
+    #  στη Lambda το process παγώνει μετά το response και το job μένει ορφανό)
+    EXPORT_WORKER: str = os.getenv("EXPORT_WORKER", "external").strip().lower()
+
+    # Τράπεζα ερωτήσεων: φάκελος με questions_<version>.json (κενό → app/data/questions)
+    QUESTION_BANK_DIR: str | None = os.getenv("QUESTION_BANK_DIR") or None
+    QUESTION_BANK_CHECK_SECONDS: float = _get_float("QUESTION_BANK_CHECK_SECONDS", 30.0)
+
+    # Study tokens (HMAC) και links προς το UI για PRE/POST
+    STUDY_SECRET: str = os.getenv("STUDY_SECRET", "")
+    PUBLIC_UI_BASE: str = os.getenv("PUBLIC_UI_BASE", "https://soft-skills-project.vercel.app")
+
+    # Υλικό μελέτης μετά το quiz: "s3" (MATERIALS_BUCKET) ή "local" (MATERIALS_DIR)
+    # (s3: το role χρειάζεται s3:GetObject + s3:ListBucket, βλ. app/core/materials.py)
+    MATERIALS_STORE: str = os.getenv("MATERIALS_STORE", "s3")
+    MATERIALS_BUCKET: str = os.getenv("MATERIALS_BUCKET", "softskills-quiz-ihu")
+    MATERIALS_DIR: str = os.getenv("MATERIALS_DIR", "./materials-local")
+    MATERIALS_BASE_URL: str | None = os.getenv("MATERIALS_BASE_URL") or None
+    MATERIALS_CATALOG_TTL_SECONDS: float = _get_float("MATERIALS_CATALOG_TTL_SECONDS", 300.0)
+
+    # Coach session plans: χρόνος αναμονής για LLM πριν το heuristic fallback,
+    # και αρχείο με προ-παραγμένα plans (κενό → app/data/coach_plans.json)
+    COACH_PLAN_BUDGET_SECONDS: float = _get_float("COACH_PLAN_BUDGET_SECONDS", 2.5)
+    COACH_PLANS_FILE: str | None = os.getenv("COACH_PLANS_FILE") or None
+
     # Ανάλυση μόνο με κανόνες
     HEURISTIC_ONLY: bool = bool(os.getenv("HEURISTIC_ONLY", "false").lower() == "true")
 
@@ -1,36 +1,63 @@
 # app/core/study_token.py
 from __future__ import annotations
-import hmac, hashlib, base64, uuid
-from typing import Optional
+import hmac, hashlib, base64, uuid, threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional
 from app.core.settings import settings
+from app.core.telemetry import cache_result
 
 _SECRET = (getattr(settings, "STUDY_SECRET", "") or "").encode()
 
+# Tokens που έχουν ήδη επαληθευτεί (κανονικοποιημένο token → participant_id).
+# Το score path καλεί parse_token σε κάθε request· έτσι γλιτώνουμε base32 + HMAC.
+MAX_VERIFIED = 10_000
+_VERIFIED_LOCK = threading.Lock()
+_VERIFIED: "OrderedDict[str, uuid.UUID]" = OrderedDict()
+
 def _require_secret():
     if not _SECRET:
         raise RuntimeError("STUDY_SECRET not configured")
 
-def make_token(participant_id: uuid.UUID) -> str:
-    _require_secret()
-    pid = participant_id.bytes  # 16 bytes
-    sig = hmac.new(_SECRET, pid, hashlib.sha256).digest()[:6]  # 6 bytes
-    raw = pid + sig  # 22 bytes
+def _format(pid: bytes, mac: "hmac.HMAC") -> str:
+    mac.update(pid)
+    raw = pid + mac.digest()[:6]  # 16 + 6 bytes
     b32 = base64.b32encode(raw).decode().rstrip("=")  # A-Z2-7
-    
     return "-".join(b32[i:i+4] for i in range(0, len(b32), 4))
 
+def make_token(participant_id: uuid.UUID) -> str:
+    _require_secret()
+    return _format(participant_id.bytes, hmac.new(_SECRET, digestmod=hashlib.sha256))
+
+def make_tokens(participant_ids: Iterable[uuid.UUID]) -> List[str]:
+    """Ίδια tokens με make_token, για χιλιάδες ids (το HMAC key setup γίνεται μία φορά)."""
+    _require_secret()
+    base = hmac.new(_SECRET, digestmod=hashlib.sha256)
+    return [_format(p.bytes, base.copy()) for p in participant_ids]
+
 def parse_token(token: str) -> Optional[uuid.UUID]:
     if not token:
         return None
+    b32 = token.replace("-", "").upper()
+    with _VERIFIED_LOCK:
+        hit = _VERIFIED.get(b32)
+        if hit is not None:
+            _VERIFIED.move_to_end(b32)
+    cache_result("study_token", hit is not None)
+    if hit is not None:
+        return hit
     _require_secret()
     try:
-        b32 = token.replace("-", "").upper()
         pad = "=" * ((8 - (len(b32) % 8)) % 8)
         raw = base64.b32decode(b32 + pad)
         pid, sig = raw[:16], raw[16:]
-        check = hmac.new(_SECRET, pid, hashlib.sha256).digest()[:len(sig)]
-        if hmac.compare_digest(sig, check):
-            return uuid.UUID(bytes=pid)
+        check = hmac.new(_SECRET, pid, hashlib.sha256).digest()[:6]
+        if len(sig) == 6 and hmac.compare_digest(sig, check):
+            u = uuid.UUID(bytes=pid)
+            with _VERIFIED_LOCK:
+                _VERIFIED[b32] = u
+                while len(_VERIFIED) > MAX_VERIFIED:
+                    _VERIFIED.popitem(last=False)
+            return u
     except Exception:
         return None
     return None
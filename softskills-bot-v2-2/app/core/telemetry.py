@@ -0,0 +1,230 @@
+# app/core/telemetry.py
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.settings import settings
+
+# Metrics σε μορφή Prometheus (text exposition 0.0.4) χωρίς εξωτερικό client.
+#   - HTTP: latency ανά route template, in-flight, requests ανά status
+#   - LLM: latency / tokens / errors ανά model, fallbacks ανά αιτία
+#   - DB: πλήθος και χρόνος queries ανά request (SQLAlchemy cursor events)
+#   - caches: hit / miss ανά cache (ratio = hit / (hit + miss) στο PromQL)
+# Κάθε μέτρηση είναι ένα dict update κάτω από lock· το render γίνεται μόνο στο GET /metrics.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED = "<unmatched>"
+
+_LOCK = threading.Lock()
+_REGISTRY: List["_Metric"] = []
+
+
+def _escape(v: Any) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        _REGISTRY.append(self)
+
+    def _labelstr(self, key: Tuple[str, ...], extra: str = "") -> str:
+        parts = [f'{n}="{_escape(v)}"' for n, v in zip(self.labels, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        with _LOCK:
+            items = sorted(self._values.items())
+        for key, v in items:
+            out.extend(self._lines(key, v))
+        return out
+
+    def _lines(self, key: Tuple[str, ...], v: Any) -> List[str]:
+        return [f"{self.name}{self._labelstr(key)} {_fmt(v)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = tuple(str(x) for x in labels)
+        with _LOCK:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = tuple(str(x) for x in labels)
+        with _LOCK:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: Any, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = tuple(str(x) for x in labels)
+        i = bisect_left(self.buckets, value)
+        with _LOCK:
+            st = self._values.get(key)
+            if st is None:
+                # [counts ανά bucket (μη αθροιστικά) ..., +Inf, sum]
+                st = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            st[i] += 1
+            st[-1] += value
+
+    def _lines(self, key: Tuple[str, ...], st: List[float]) -> List[str]:
+        out, acc = [], 0
+        for b, n in zip(self.buckets + (float("inf"),), st[:-1]):
+            acc += n
+            le = 'le="%s"' % _fmt(b)
+            out.append(f"{self.name}_bucket{self._labelstr(key, le)} {acc}")
+        out.append(f"{self.name}_sum{self._labelstr(key)} {_fmt(st[-1])}")
+        out.append(f"{self.name}_count{self._labelstr(key)} {acc}")
+        return out
+
+
+# ---------------------------------------------------------------------
+# Τα metrics της εφαρμογής
+# ---------------------------------------------------------------------
+HTTP_REQUESTS = Counter("softskills_http_requests_total", "HTTP requests",
+                        ("method", "route", "status"))
+HTTP_LATENCY = Histogram("softskills_http_request_duration_seconds", "HTTP request latency",
+                         ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("softskills_http_requests_in_flight", "HTTP requests in progress")
+
+LLM_LATENCY = Histogram("softskills_llm_request_duration_seconds", "LLM call latency",
+                        ("model", "kind"))
+LLM_TOKENS = Counter("softskills_llm_tokens_total", "LLM tokens", ("model", "type"))
+LLM_ERRORS = Counter("softskills_llm_errors_total", "Failed LLM calls", ("model", "kind"))
+LLM_FALLBACKS = Counter("softskills_llm_fallbacks_total", "Heuristic fallbacks instead of LLM output",
+                        ("kind", "reason"))
+
+DB_QUERIES = Histogram("softskills_db_queries_per_request", "DB statements per HTTP request",
+                       ("route",), buckets=COUNT_BUCKETS)
+DB_TIME = Histogram("softskills_db_time_per_request_seconds", "DB time per HTTP request", ("route",))
+
+CACHE = Counter("softskills_cache_requests_total", "Cache lookups", ("cache", "result"))
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    CACHE.inc(cache, "hit" if hit else "miss")
+
+
+def observe_llm(model: str, kind: str, seconds: float, usage: Any = None, error: bool = False) -> None:
+    model = model or "unknown"
+    LLM_LATENCY.observe(seconds, model, kind)
+    if error:
+        LLM_ERRORS.inc(model, kind)
+    if usage is not None:
+        for t in ("prompt_tokens", "completion_tokens"):
+            n = getattr(usage, t, None)
+            if n:
+                LLM_TOKENS.inc(model, t.split("_")[0], amount=float(n))
+
+
+def llm_fallback(kind: str, reason: str) -> None:
+    LLM_FALLBACKS.inc(kind, reason)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for m in _REGISTRY:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------
+# DB: μετρητής ανά request (contextvar) από τα cursor events του engine
+# ---------------------------------------------------------------------
+_REQUEST_DB: ContextVar[Optional[List[float]]] = ContextVar("softskills_request_db", default=None)
+
+
+def instrument_engine(engine) -> None:
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_telemetry_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("_telemetry_t0")
+        if not starts:
+            return
+        dt = time.perf_counter() - starts.pop()
+        acc = _REQUEST_DB.get()
+        if acc is not None:
+            acc[0] += 1
+            acc[1] += dt
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        starts = ctx.connection.info.get("_telemetry_t0") if ctx.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class MetricsMiddleware:
+    """ASGI middleware (όχι BaseHTTPMiddleware): δεν αγγίζει το body, μόνο χρόνους / status."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        status = [500]
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        db = [0, 0.0]
+        token = _REQUEST_DB.set(db)
+        HTTP_IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            dt = time.perf_counter() - t0
+            HTTP_IN_FLIGHT.dec()
+            _REQUEST_DB.reset(token)
+            # route template (π.χ. /api/softskills/questions/bundle/{category}/...), όχι το raw path
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(method, route, status[0])
+            HTTP_LATENCY.observe(dt, method, route)
+            DB_QUERIES.observe(db[0], route)
+            DB_TIME.observe(db[1], route)
@@ -0,0 +1,281 @@
+# app/core/tracing.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.settings import settings
+
+# Ελαφρύ tracing χωρίς εξωτερικό dependency.
+#   - κάθε HTTP request παίρνει trace id (header x-trace-id στο response)
+#   - spans: LLM calls, DB statements (cursor events), φόρτωση rules, GLMP evaluate / fusion
+#   - sampling: κρατάμε TRACE_SAMPLE_RATE των requests + ΟΛΑ όσα ξεπερνούν TRACE_SLOW_MS
+#   - τα κρατημένα traces → rotating JSONL (TRACE_FILE) και ring buffer για /_diag/traces/slowest
+#   - TRACE_EXPORTER=otel: τα ίδια spans ξαναπαίζονται στο OpenTelemetry SDK (αν είναι εγκατεστημένο)
+# Χωρίς ενεργό trace (scripts, workers) το span() δεν κάνει τίποτα.
+
+STATEMENT_MAX = 200
+
+_TRACE: ContextVar[Optional["Trace"]] = ContextVar("softskills_trace", default=None)
+_SPAN: ContextVar[Optional[str]] = ContextVar("softskills_span", default=None)
+
+_LOCK = threading.Lock()
+_RECENT: "deque[Dict[str, Any]]" = deque(maxlen=max(1, int(settings.TRACE_BUFFER)))
+_WRITER: Optional[logging.Logger] = None
+_OTEL: Any = None
+
+
+def _new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+class Trace:
+    __slots__ = ("trace_id", "name", "start_ns", "t0", "spans", "attrs", "done")
+
+    def __init__(self, name: str) -> None:
+        self.trace_id = uuid.uuid4().hex  # 32 hex, όπως το OTel trace id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.t0 = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.attrs: Dict[str, Any] = {}
+        self.done = False
+
+    def add(self, name: str, start: float, end: float, attrs: Optional[Dict[str, Any]] = None,
+            span_id: Optional[str] = None, parent_id: Optional[str] = None) -> None:
+        if self.done:
+            # π.χ. LLM thread που συνέχισε μετά το budget του coach plan
+            return
+        self.spans.append({
+            "span_id": span_id or _new_span_id(),
+            "parent_id": parent_id if parent_id is not None else _SPAN.get(),
+            "name": name,
+            "start_ms": round((start - self.t0) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+            "attrs": attrs or {},
+        })
+
+
+def current() -> Optional[Trace]:
+    return _TRACE.get()
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    with span("glmp.evaluate", kind="text"): ...
+    Το dict που επιστρέφεται δέχεται επιπλέον attrs μέσα στο block.
+    """
+    tr = _TRACE.get()
+    if tr is None:
+        yield attrs
+        return
+    span_id = _new_span_id()
+    parent = _SPAN.get()
+    token = _SPAN.set(span_id)
+    start = time.perf_counter()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _SPAN.reset(token)
+        tr.add(name, start, time.perf_counter(), attrs, span_id=span_id, parent_id=parent)
+
+
+def breakdown(trace: Dict[str, Any]) -> Dict[str, float]:
+    """Συνολικά ms ανά όνομα span (ό,τι θέλουμε να δούμε για ένα αργό request)."""
+    out: Dict[str, float] = {}
+    for s in trace.get("spans", ()):
+        out[s["name"]] = round(out.get(s["name"], 0.0) + s["duration_ms"], 3)
+    return dict(sorted(out.items(), key=lambda kv: -kv[1]))
+
+
+# ---------------------------------------------------------------------
+# Αποθήκευση: rotating JSONL + ring buffer (+ προαιρετικά OpenTelemetry)
+# ---------------------------------------------------------------------
+def _writer() -> Optional[logging.Logger]:
+    global _WRITER
+    if _WRITER is None and settings.TRACE_FILE:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(settings.TRACE_FILE)), exist_ok=True)
+            handler = RotatingFileHandler(settings.TRACE_FILE, encoding="utf-8",
+                                          maxBytes=int(settings.TRACE_FILE_MAX_BYTES),
+                                          backupCount=int(settings.TRACE_FILE_BACKUPS))
+        except OSError as e:
+            print(f"[tracing] cannot open {settings.TRACE_FILE}: {e}")
+            settings.TRACE_FILE = ""
+            return None
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log = logging.getLogger("softskills.traces")
+        log.propagate = False
+        log.setLevel(logging.INFO)
+        log.addHandler(handler)
+        _WRITER = log
+    return _WRITER
+
+
+def _otel_tracer():
+    global _OTEL
+    if _OTEL is None:
+        _OTEL = False
+        if settings.TRACE_EXPORTER == "otel":
+            try:
+                from opentelemetry import trace as ot  # type: ignore
+
+                _OTEL = ot.get_tracer("softskills")
+            except ImportError:
+                print("[tracing] TRACE_EXPORTER=otel αλλά το opentelemetry δεν είναι εγκατεστημένο")
+    return _OTEL or None
+
+
+def _otel_export(rec: Dict[str, Any]) -> None:
+    tracer = _otel_tracer()
+    if tracer is None:
+        return
+    from opentelemetry import trace as ot  # type: ignore
+
+    def ns(ms: float) -> int:
+        return rec["start_unix_nano"] + int(ms * 1e6)
+
+    def attrs(d: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in d.items()}
+
+    root = tracer.start_span(rec["name"], start_time=rec["start_unix_nano"],
+                             attributes={**attrs(rec["attrs"]), "softskills.trace_id": rec["trace_id"]})
+    ctx = {None: ot.set_span_in_context(root)}
+    for s in sorted(rec["spans"], key=lambda s: s["start_ms"]):
+        sp = tracer.start_span(s["name"], context=ctx.get(s["parent_id"], ctx[None]),
+                               start_time=ns(s["start_ms"]), attributes=attrs(s["attrs"]))
+        sp.end(end_time=ns(s["start_ms"] + s["duration_ms"]))
+        ctx[s["span_id"]] = ot.set_span_in_context(sp)
+    root.end(end_time=ns(rec["duration_ms"]))
+
+
+def _keep(duration_ms: float) -> bool:
+    return duration_ms >= settings.TRACE_SLOW_MS or random.random() < settings.TRACE_SAMPLE_RATE
+
+
+def finish(tr: Trace, **attrs: Any) -> Optional[Dict[str, Any]]:
+    """Κλείνει το trace· αν κρατηθεί, γράφεται και επιστρέφεται το record."""
+    duration_ms = round((time.perf_counter() - tr.t0) * 1000, 3)
+    tr.done = True
+    tr.attrs.update(attrs)
+    if not _keep(duration_ms):
+        return None
+    rec = {
+        "trace_id": tr.trace_id,
+        "name": tr.name,
+        "start_unix_nano": tr.start_ns,
+        "duration_ms": duration_ms,
+        "attrs": tr.attrs,
+        "spans": tr.spans,
+    }
+    with _LOCK:
+        _RECENT.append(rec)
+    log = _writer()
+    if log is not None:
+        log.info(json.dumps(rec, ensure_ascii=False, default=str))
+    try:
+        _otel_export(rec)
+    except Exception as e:
+        print(f"[tracing] otel export failed: {e!r}")
+    return rec
+
+
+def slowest(limit: int = 20, name: Optional[str] = None) -> List[Dict[str, Any]]:
+    with _LOCK:
+        recs = list(_RECENT)
+    if name:
+        recs = [r for r in recs if name in r["name"]]
+    recs.sort(key=lambda r: -r["duration_ms"])
+    return [{**r, "breakdown": breakdown(r)} for r in recs[:max(0, limit)]]
+
+
+def config() -> Dict[str, Any]:
+    return {
+        "enabled": settings.TRACING_ENABLED,
+        "sample_rate": settings.TRACE_SAMPLE_RATE,
+        "slow_ms": settings.TRACE_SLOW_MS,
+        "file": settings.TRACE_FILE or None,
+        "exporter": settings.TRACE_EXPORTER or None,
+    }
+
+
+def clear() -> None:
+    with _LOCK:
+        _RECENT.clear()
+
+
+# ---------------------------------------------------------------------
+# DB spans από τα cursor events (όπως το telemetry.instrument_engine)
+# ---------------------------------------------------------------------
+def instrument_engine(engine) -> None:
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _TRACE.get() is not None:
+            conn.info.setdefault("_tracing_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        tr = _TRACE.get()
+        starts = conn.info.get("_tracing_t0")
+        if tr is None or not starts:
+            return
+        start = starts.pop()
+        tr.add("db.statement", start, time.perf_counter(), {
+            "statement": " ".join(statement.split())[:STATEMENT_MAX],
+            "rows": getattr(cursor, "rowcount", -1),
+        })
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        starts = ctx.connection.info.get("_tracing_t0") if ctx.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class TracingMiddleware:
+    """ASGI middleware: ανοίγει trace ανά request, το κλείνει με route template & status."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            return await self.app(scope, receive, send)
+
+        tr = Trace(f'{scope.get("method", "")} {scope.get("path", "")}')
+        header = (b"x-trace-id", tr.trace_id.encode())
+        status = [500]
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                message = {**message, "headers": [*message.get("headers", ()), header]}
+            await send(message)
+
+        token = _TRACE.set(tr)
+        span_token = _SPAN.set(None)
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _SPAN.reset(span_token)
+            _TRACE.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                tr.name = f'{scope.get("method", "")} {route}'
+            finish(tr, path=scope.get("path", ""), status=status[0])
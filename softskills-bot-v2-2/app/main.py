@@ -5,13 +5,15 @@ from typing import List, Dict, Any
 
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 # --- Settings / DB ---
-from sqlalchemy import text
 from sqlmodel import Session
 from app.core.settings import settings
 from app.core.db import init_db, get_session
+from app.core import telemetry, tracing
+from app.core.http_cache import cached_json
+from app.core.question_catalog import catalog_snapshot, catalog_tables
 
 # --- Routers ---
 from app.routers.questions import router as questions_router
@@ -24,9 +26,15 @@ from app.routers import (
     coach,
     report,
     report_simple,
+    report_csv,
     rules,
     diagnostics,
     rater_calibrate,
+    rater_assign,
+    export_dataset,
+    export_jobs,
+    metrics,
+    study,
 )
 from app.routers.rater_simple import router as rater_simple_router
 
@@ -71,6 +79,11 @@ app.add_middleware(
     max_age=86400,
 )
 
+# Metrics (latency ανά route template, in-flight, DB ανά request) → GET /metrics
+app.add_middleware(telemetry.MetricsMiddleware)
+# Trace ανά request (x-trace-id) → /_diag/traces/slowest
+app.add_middleware(tracing.TracingMiddleware)
+
 # -----------------------------------------------------------------------------
 # JSON UTF-8 middleware
 # -----------------------------------------------------------------------------
@@ -101,8 +114,14 @@ app.include_router(coach.router,           prefix=API_PREFIX)
 app.include_router(rules.router,           prefix=API_PREFIX)
 app.include_router(rater_calibrate.router, prefix=API_PREFIX)
 app.include_router(report.router,          prefix=API_PREFIX)
+app.include_router(report_csv.router,      prefix=API_PREFIX)
 app.include_router(diagnostics.router)
 app.include_router(rater_final.router,     prefix=API_PREFIX)
+app.include_router(rater_assign.router,    prefix=API_PREFIX)
+app.include_router(export_dataset.router,  prefix=API_PREFIX)
+app.include_router(export_jobs.router,     prefix=API_PREFIX)
+app.include_router(metrics.router,         prefix=API_PREFIX)
+app.include_router(study.router,           prefix=API_PREFIX)
 app.include_router(questions_router,       prefix=API_PREFIX)
 app.include_router(score_router,           prefix=API_PREFIX)
 app.include_router(rater_simple_router,    prefix=API_PREFIX)
@@ -142,6 +161,12 @@ def root():
 def health():
     return {"ok": True}
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(telemetry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get(f"{API_PREFIX}/ping")
 def ping():
     return {"ok": True, "prefix": API_PREFIX}
@@ -165,55 +190,14 @@ def list_routes(request: Request):
 # Quiz Aliases (όπως τα είχες)
 # -----------------------------------------------------------------------------
 @app.get(f"{API_PREFIX}/quiz/bundle")
-def quiz_bundle_alias(session: Session = Depends(get_session)):
-    rows = session.execute(text("""
-        SELECT DISTINCT ON (question_id)
-               question_id AS id,
-               COALESCE(NULLIF(prompt, ''), '[no question text]') AS text,
-               COALESCE(category, '') AS category,
-               COALESCE(qtype, '')    AS qtype
-        FROM answers
-        WHERE question_id IS NOT NULL
-        ORDER BY question_id, created_at DESC
-    """)).mappings().all()
-
-    items = [{
-        "id": r["id"],
-        "text": r["text"],
-        "category": r["category"],
-        "qtype": r["qtype"],
-        "options": [],
-    } for r in rows]
-
-    return {"items": items}
+def quiz_bundle_alias(request: Request, session: Session = Depends(get_session)):
+    return cached_json(request, session, catalog_tables(session),
+                       lambda: catalog_snapshot(session).bundle_payload())
 
 @app.get(f"{API_PREFIX}/quiz/questions")
-def quiz_questions_alias(session: Session = Depends(get_session)):
-    rows = session.execute(text("""
-        SELECT DISTINCT ON (question_id)
-               question_id AS id,
-               COALESCE(NULLIF(prompt, ''), '[no question text]') AS text,
-               COALESCE(category, '') AS category,
-               COALESCE(qtype, '')    AS qtype
-        FROM answers
-        WHERE question_id IS NOT NULL
-        ORDER BY question_id, created_at DESC
-    """)).mappings().all()
-
-    items = []
-    qmap = {}
-    for r in rows:
-        obj = {
-            "id": r["id"],
-            "text": r["text"],
-            "category": r["category"],
-            "qtype": r["qtype"],
-            "options": [],
-        }
-        items.append(obj)
-        qmap[r["id"]] = {k: v for k, v in obj.items() if k != "id"}
-
-    return {"items": items, "map": qmap}
+def quiz_questions_alias(request: Request, session: Session = Depends(get_session)):
+    return cached_json(request, session, catalog_tables(session),
+                       lambda: catalog_snapshot(session).index_payload())
 
 # -----------------------------------------------------------------------------
 # Global exception handler
@@ -230,6 +214,9 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 # -----------------------------------------------------------------------------
 @app.on_event("startup")
 def on_startup():
+    if settings.DB_INIT_MODE == "skip":
+        print("[BOOT] DB_INIT_MODE=skip → χωρίς create_all (migrations)")
+        return
     init_db()
 
 
@@ -12,5 +12,7 @@ class Evaluation(SQLModel, table=True):
 
     measures: Dict[str, Any] = Field(sa_column=Column(JSON))
     result: Dict[str, Any] = Field(sa_column=Column(JSON))
+    # Στην PostgreSQL το result αντιγράφεται και σε typed στήλες (score, label,
+    # dim_*) από trigger, και τροφοδοτεί το evaluation_daily (migration 90e2d0b7f0d8).
 
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
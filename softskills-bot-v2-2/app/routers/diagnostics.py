@@ -1,14 +1,18 @@
 # app/routers/diagnostics.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from sqlmodel import Session, select
 from sqlalchemy import text, inspect
 from uuid import uuid4
 from datetime import datetime
-import platform, sys, traceback
+import asyncio, platform, sys, traceback
+from typing import Optional
 from app.core.llm import llm_coach_open
 from app.core.settings import settings
 from app.core.db import get_session, init_db
 from app.core.config import settings
+from app.core import profiling, tracing
+from app.core.security import verify_api_key
 from app.models.db_models import Interaction, AutoRating
 
 router = APIRouter(prefix="/_diag", tags=["_diag"])
@@ -215,4 +219,57 @@ def llm_health():
         out = llm_coach_open("Communication", "diag", "Θα δώσω ένα μικρό παράδειγμα για να ελέγξω το LLM.")
         return {"ok": True, "model": out.get("model_name"), "feedback": out.get("feedback"), "coaching": out.get("coaching")}
     except Exception as e:
-        return {"ok": False, "error": str(e)}
\ No newline at end of file
+        return {"ok": False, "error": str(e)}
+
+
+@router.get("/traces/slowest", dependencies=[Depends(verify_api_key)])
+def traces_slowest(
+    limit: int = Query(20, ge=1, le=200),
+    name: Optional[str] = Query(None, description="φίλτρο στο όνομα, π.χ. evaluate-and-save"),
+    spans: bool = Query(True, description="false → μόνο το breakdown ανά span"),
+):
+    """
+    Τα πιο αργά από τα κρατημένα traces αυτού του process (sampled + όσα > TRACE_SLOW_MS),
+    με breakdown ms ανά span (llm.chat, db.statement, glmp.*, rules.load, ...).
+    """
+    items = tracing.slowest(limit, name)
+    if not spans:
+        items = [{k: v for k, v in t.items() if k != "spans"} for t in items]
+    return {"ok": True, **tracing.config(), "items": items}
+
+
+@router.get("/profile", dependencies=[Depends(verify_api_key)])
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=profiling.MAX_SECONDS),
+    interval_ms: float = Query(profiling.DEFAULT_INTERVAL * 1000, ge=1, le=1000),
+    idle: bool = Query(False, description="true → και threads που απλώς περιμένουν"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+):
+    """
+    Statistical sampler σε όλα τα threads για `seconds`. Το sampling τρέχει σε
+    δικό του thread, οπότε το instance συνεχίζει να εξυπηρετεί requests.
+    format=collapsed → `flamegraph.pl` / speedscope, format=json → stacks με counts.
+    """
+    try:
+        result = await asyncio.to_thread(profiling.sample_stacks, seconds, interval_ms / 1000, idle)
+    except profiling.ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "json":
+        return {"ok": True, **result,
+                "stacks": [{"stack": s, "count": n} for s, n in result["stacks"]]}
+    return PlainTextResponse(profiling.collapsed_text(result))
+
+
+@router.get("/memory", dependencies=[Depends(verify_api_key)])
+def memory(
+    top: int = Query(25, ge=1, le=200),
+    frames: int = Query(1, ge=1, le=25, description="βάθος traceback (ισχύει στο start)"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    reset: bool = Query(True, description="false → σύγκριση πάντα με το αρχικό baseline"),
+    stop: bool = Query(False),
+):
+    """
+    tracemalloc: η 1η κλήση ξεκινά την καταγραφή, οι επόμενες επιστρέφουν
+    τα top allocation sites σε σχέση με το προηγούμενο snapshot.
+    """
+    return {"ok": True, **profiling.memory_report(top, frames, group_by, reset, stop)}
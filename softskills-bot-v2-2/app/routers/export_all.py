@@ -1,79 +1,125 @@
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
-from sqlmodel import Session, select
-from typing import Optional, Dict, List
-from io import StringIO
-import csv
+from sqlmodel import Session
+from sqlalchemy import select
+from typing import Iterator, Optional, Tuple
+from itertools import groupby
 from datetime import datetime
 
 from app.core.db import get_session
+from app.core.export_stream import PLAIN, csv_chunks, csv_response, stream_query
 from app.models.db_models import Interaction, AutoRating, HumanRating
 
 router = APIRouter(prefix="/export", tags=["export"])
 
-def _filter_stmt(category: Optional[str], qtype: Optional[str]):
-    stmt = select(Interaction)
+LONG_HEADER = ["answer_id","created_at","category","qtype","question_id","user_id","text_raw","auto_score","rater_id","human_score","human_notes"]
+WIDE_BASE = ["answer_id","created_at","category","qtype","question_id","user_id","text_raw","auto_score"]
+
+
+def _filter(stmt, category: Optional[str], qtype: Optional[str]):
     if category:
         stmt = stmt.where(Interaction.category == category)
     if qtype:
         stmt = stmt.where(Interaction.qtype == qtype)
-    stmt = stmt.order_by(Interaction.created_at.asc())
     return stmt
 
-@router.get("/all-csv")
-def export_all_csv(
-    category: Optional[str] = Query(None),
-    qtype: Optional[str] = Query(None, pattern="^(open|mc)$"),
-    fmt: str = Query("long", pattern="^(long|wide)$"),
-    session: Session = Depends(get_session)
-):
-    interactions: List[Interaction] = session.exec(_filter_stmt(category, qtype)).all()
-    ans_ids = [i.answer_id for i in interactions]
 
-    autos = session.exec(select(AutoRating).where(AutoRating.answer_id.in_(ans_ids))).all() if ans_ids else []
-    auto_by_ans: Dict[str, float] = {a.answer_id: a.score for a in autos}
+def _rows_stmt(category: Optional[str], qtype: Optional[str]):
+    """Ένα query: interaction + τελευταίο auto score + human ratings (μία γραμμή ανά rating)."""
+    auto_latest = (
+        select(AutoRating.score)
+        .where(AutoRating.answer_id == Interaction.answer_id)
+        .order_by(AutoRating.id.desc())
+        .limit(1)
+        .correlate(Interaction)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Interaction.answer_id,
+            Interaction.created_at,
+            Interaction.category,
+            Interaction.qtype,
+            Interaction.question_id,
+            Interaction.user_id,
+            Interaction.text_raw,
+            auto_latest.label("auto_score"),
+            HumanRating.rater_id,
+            HumanRating.score.label("human_score"),
+            HumanRating.notes,
+        )
+        .select_from(Interaction)
+        .outerjoin(HumanRating, HumanRating.answer_id == Interaction.answer_id)
+    )
+    stmt = _filter(stmt, category, qtype)
+    # answer_id στο ORDER BY ώστε οι γραμμές κάθε answer να είναι συνεχόμενες (wide)
+    return stmt.order_by(Interaction.created_at.asc(), Interaction.answer_id, HumanRating.id)
+
+
+def _clean(s: Optional[str]) -> str:
+    return (s or "").replace("\n", " ").strip()
+
+
+def _long_rows(category: Optional[str], qtype: Optional[str]):
+    for r in stream_query(_rows_stmt(category, qtype)):
+        yield [
+            r["answer_id"], r["created_at"], r["category"], r["qtype"], r["question_id"],
+            r["user_id"] or "", _clean(r["text_raw"]),
+            r["auto_score"] if r["auto_score"] is not None else "",
+            r["rater_id"] or "",
+            r["human_score"] if r["human_score"] is not None else "",
+            _clean(r["notes"]) if r["rater_id"] else "",
+        ]
 
-    humans = session.exec(select(HumanRating).where(HumanRating.answer_id.in_(ans_ids))).all() if ans_ids else []
-    by_ans_humans: Dict[str, List[HumanRating]] = {}
-    for h in humans:
-        by_ans_humans.setdefault(h.answer_id, []).append(h)
 
+def _wide_rows(category: Optional[str], qtype: Optional[str], raters):
+    rows = stream_query(_rows_stmt(category, qtype))
+    for _aid, group in groupby(rows, key=lambda r: r["answer_id"]):
+        group = list(group)  # οι ratings ενός answer (λίγες γραμμές)
+        first = group[0]
+        ratings_map = {g["rater_id"]: g["human_score"] for g in group if g["rater_id"]}
+        yield [
+            first["answer_id"], first["created_at"], first["category"], first["qtype"], first["question_id"],
+            first["user_id"] or "", _clean(first["text_raw"]),
+            first["auto_score"] if first["auto_score"] is not None else "",
+        ] + [ratings_map.get(rid, "") for rid in raters]
+
+
+def all_csv_export(
+    session: Session,
+    category: Optional[str] = None,
+    qtype: Optional[str] = None,
+    fmt: str = "long",
+) -> Tuple[str, Iterator[bytes]]:
+    """(filename, chunks) — κοινό για το endpoint και τα export jobs."""
     now = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
 
     if fmt == "long":
-        buf = StringIO(newline="")
-        writer = csv.writer(buf)
-        writer.writerow(["answer_id","created_at","category","qtype","question_id","user_id","text_raw","auto_score","rater_id","human_score","human_notes"])
-        if not interactions:
-            writer.writerow(["","","","","","","","","","",""])
-        else:
-            for it in interactions:
-                auto_score = auto_by_ans.get(it.answer_id, "")
-                humans_list = by_ans_humans.get(it.answer_id, [])
-                if not humans_list:
-                    writer.writerow([it.answer_id, it.created_at, it.category, it.qtype, it.question_id, it.user_id or "", (it.text_raw or "").replace("\n"," ").strip(), auto_score, "", "", ""])
-                else:
-                    for hr in humans_list:
-                        writer.writerow([it.answer_id, it.created_at, it.category, it.qtype, it.question_id, it.user_id or "", (it.text_raw or "").replace("\n"," ").strip(), auto_score, hr.rater_id, hr.score, (hr.notes or "" ).replace("\n"," ").strip()])
-        buf.seek(0)
-        filename = f"export_long_{now}.csv"
-        return StreamingResponse(iter([buf.getvalue()]), media_type="text/csv",
-                                 headers={"Content-Disposition": f"attachment; filename={filename}"})
-    else:
-        raters = sorted({h.rater_id for h in humans})
-        headers = ["answer_id","created_at","category","qtype","question_id","user_id","text_raw","auto_score"] + [f"r_{rid}" for rid in raters]
-        buf = StringIO(newline="")
-        writer = csv.writer(buf)
-        writer.writerow(headers)
-        for it in interactions:
-            row = [it.answer_id, it.created_at, it.category, it.qtype, it.question_id, it.user_id or "", (it.text_raw or "").replace("\n"," ").strip(), auto_by_ans.get(it.answer_id, "")]
-            ratings_map = {h.rater_id: h.score for h in by_ans_humans.get(it.answer_id, [])}
-            for rid in raters:
-                row.append(ratings_map.get(rid, ""))
-            writer.writerow(row)
-        if not interactions:
-            writer.writerow(["","","","","","","",""] + [""]*len(raters))
-        buf.seek(0)
-        filename = f"export_wide_{now}.csv"
-        return StreamingResponse(iter([buf.getvalue()]), media_type="text/csv",
-                                 headers={"Content-Disposition": f"attachment; filename={filename}"})
+        chunks = csv_chunks(LONG_HEADER, _long_rows(category, qtype),
+                            dialect=PLAIN, empty_row=[""] * len(LONG_HEADER))
+        return f"export_long_{now}.csv", chunks
+
+    # wide: οι στήλες r_<rater> χρειάζονται πριν το πρώτο row (μικρό DISTINCT query)
+    rater_stmt = _filter(
+        select(HumanRating.rater_id)
+        .select_from(Interaction)
+        .join(HumanRating, HumanRating.answer_id == Interaction.answer_id)
+        .distinct(),
+        category, qtype,
+    )
+    raters = sorted(r for (r,) in session.exec(rater_stmt).all())
+    header = WIDE_BASE + [f"r_{rid}" for rid in raters]
+    chunks = csv_chunks(header, _wide_rows(category, qtype, raters),
+                        dialect=PLAIN, empty_row=[""] * len(header))
+    return f"export_wide_{now}.csv", chunks
+
+
+@router.get("/all-csv")
+def export_all_csv(
+    category: Optional[str] = Query(None),
+    qtype: Optional[str] = Query(None, pattern="^(open|mc)$"),
+    fmt: str = Query("long", pattern="^(long|wide)$"),
+    session: Session = Depends(get_session)
+) -> StreamingResponse:
+    filename, chunks = all_csv_export(session, category, qtype, fmt)
+    return csv_response(chunks, filename, media_type="text/csv")
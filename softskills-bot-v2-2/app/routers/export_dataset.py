@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.dataset_export import DATASET_MEDIA_TYPES, DATASET_TABLES, build_query, dataset_chunks
+from app.core.export_stream import content_disposition
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+TABLE_PATTERN = "^(" + "|".join(DATASET_TABLES) + ")$"
+
+
+def _dataset_response(
+    fmt: str,
+    table: str,
+    category: Optional[str],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    attempt: Optional[int],
+    batch_rows: int,
+) -> StreamingResponse:
+    try:
+        sql, params, schema = build_query(
+            DATASET_TABLES[table],
+            category=category, date_from=date_from, date_to=date_to, attempt=attempt,
+        )
+    except RuntimeError as e:  # λείπει το pyarrow
+        raise HTTPException(status_code=501, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    now = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    ext = "parquet" if fmt == "parquet" else "arrows"
+    return StreamingResponse(
+        dataset_chunks(sql, params, schema, fmt=fmt, batch_rows=batch_rows),
+        media_type=DATASET_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": content_disposition(f"{table}_{now}.{ext}")},
+    )
+
+
+# Ένας πίνακας ανά αρχείο (table=...). Οι στήλες είναι typed (uuid/json → string,
+# numeric → float64, timestamps → timestamp[us]). Στο evaluation τα score, label
+# και dim_* είναι ήδη typed στήλες (γεμίζουν από trigger), οπότε βγαίνουν όπως είναι.
+# Το attempt φιλτράρει μέσω interaction.attempt_no· στο evaluation αγνοείται.
+@router.get("/dataset.parquet")
+def export_dataset_parquet(
+    table: str = Query("answers", pattern=TABLE_PATTERN),
+    category: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    attempt: Optional[int] = Query(None, ge=1, le=2),
+    row_group_rows: int = Query(50_000, ge=1_000, le=500_000),
+) -> StreamingResponse:
+    return _dataset_response("parquet", table, category, date_from, date_to, attempt, row_group_rows)
+
+
+@router.get("/dataset.arrow")
+def export_dataset_arrow(
+    table: str = Query("answers", pattern=TABLE_PATTERN),
+    category: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    attempt: Optional[int] = Query(None, ge=1, le=2),
+    batch_rows: int = Query(50_000, ge=1_000, le=500_000),
+) -> StreamingResponse:
+    return _dataset_response("arrow", table, category, date_from, date_to, attempt, batch_rows)
@@ -0,0 +1,135 @@
+# app/routers/export_jobs.py
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, RedirectResponse
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+
+from app.core.db import get_session
+from app.core.export_jobs import (
+    EXPORT_KINDS,
+    create_job,
+    get_job,
+    get_store,
+    list_jobs,
+    purge_expired,
+    run_pending,
+    validate_params,
+)
+from app.core.settings import settings
+
+router = APIRouter(prefix="/export/jobs", tags=["export"])
+
+if settings.EXPORT_WORKER == "inline" and os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    # BackgroundTasks μετά το response δεν τρέχουν αξιόπιστα στη Lambda
+    raise RuntimeError("EXPORT_WORKER=inline is not supported on Lambda; use 'external' with the scheduled worker")
+
+KIND_PATTERN = "^(" + "|".join(EXPORT_KINDS) + ")$"
+
+
+class JobPayload(BaseModel):
+    kind: str = Field(..., pattern=KIND_PATTERN)
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+def _job_out(job: Dict[str, Any], request: Request) -> Dict[str, Any]:
+    job_id = str(job["job_id"])
+    started, finished = job.get("started_at"), job.get("finished_at")
+    elapsed = None
+    if started:
+        end = finished or datetime.now(timezone.utc)
+        elapsed = round((end - started).total_seconds(), 1)
+    out = {
+        "jobId": job_id,
+        "kind": job["kind"],
+        "params": job["params"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "bytesWritten": int(job["bytes_written"] or 0),
+        "elapsedSeconds": elapsed,
+        "filename": job.get("filename"),
+        "error": job.get("error"),
+        "createdAt": job["created_at"],
+        "finishedAt": finished,
+        "expiresAt": job.get("expires_at"),
+        "statusUrl": str(request.url_for("export_job_status", job_id=job_id)),
+    }
+    if job["status"] == "done":
+        out["downloadUrl"] = str(request.url_for("export_job_download", job_id=job_id))
+    return out
+
+
+@router.post("", status_code=202)
+def create_export_job(
+    p: JobPayload,
+    request: Request,
+    background: BackgroundTasks,
+    session: Session = Depends(get_session),
+):
+    """
+    Βάζει ένα export στην ουρά και απαντά αμέσως (202). Το αρχείο το φτιάχνει ο worker:
+    - EXPORT_WORKER=inline: στο ίδιο process, μετά το response
+    - EXPORT_WORKER=external: python -m app.core.export_jobs ή scheduled Lambda (lambda_handler)
+    """
+    try:
+        params = validate_params(p.kind, p.params)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    job = create_job(session, p.kind, params)
+    session.commit()
+
+    if settings.EXPORT_WORKER == "inline":
+        background.add_task(run_pending, job_id=str(job["job_id"]))
+    return _job_out(job, request)
+
+
+@router.get("")
+def list_export_jobs(
+    request: Request,
+    status: Optional[str] = Query(None, pattern="^(queued|running|done|failed|expired)$"),
+    limit: int = Query(50, ge=1, le=500),
+    session: Session = Depends(get_session),
+):
+    return {"items": [_job_out(j, request) for j in list_jobs(session, status=status, limit=limit)]}
+
+
+@router.post("/purge")
+def purge_export_jobs(session: Session = Depends(get_session)):
+    return {"ok": True, "expired": purge_expired(session)}
+
+
+@router.get("/{job_id}", name="export_job_status")
+def export_job_status(job_id: UUID, request: Request, session: Session = Depends(get_session)):
+    job = get_job(session, str(job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="job not found")
+    return _job_out(job, request)
+
+
+@router.get("/{job_id}/download", name="export_job_download")
+def export_job_download(job_id: UUID, session: Session = Depends(get_session)):
+    """Local store: FileResponse (υποστηρίζει Range → resumable downloads). S3: redirect σε presigned URL."""
+    job = get_job(session, str(job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="job not found")
+    if job["status"] == "expired":
+        raise HTTPException(status_code=410, detail="export expired")
+    if job["status"] != "done" or not job["artifact_key"]:
+        raise HTTPException(status_code=409, detail=f"job is {job['status']}")
+
+    store = get_store()
+    if store.name == "s3":
+        url = store.presign(job["artifact_key"], job["filename"], job["media_type"])
+        return RedirectResponse(url, status_code=307)
+
+    path = store.path(job["artifact_key"])
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail="artifact missing")
+    return FileResponse(path, media_type=job["media_type"], filename=job["filename"])
@@ -1,7 +1,7 @@
 ﻿# app/routers/glmp.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, List, Tuple
+from typing import Any, Dict, Mapping, Optional, List, Tuple
 from pathlib import Path
 import json
 import re
@@ -14,7 +14,8 @@ from app.core.fuzzy import evaluate_glmp_payload
 from app.core.db import get_session
 from app.models.evaluation import Evaluation
 from app.core.llm import llm_coach_open, llm_coach_mc
-from app.core.questions import QUESTIONS as QUESTION_BANK
+from app.core.question_bank import get_bank
+from app.core.tracing import span
 
 router = APIRouter(prefix="/glmp", tags=["glmp"])
 
@@ -27,11 +28,12 @@ RULES_PATH = Path(__file__).resolve().parent.parent / "rules" / "rules_v2.json"
 def get_rules() -> Dict[str, Any]:
     global _RULES
     if _RULES is None:
-        try:
-            with open(RULES_PATH, "r", encoding="utf-8") as f:
-                _RULES = json.load(f)
-        except Exception:
-            _RULES = {"weights": {}}
+        with span("rules.load", source=RULES_PATH.name):
+            try:
+                with open(RULES_PATH, "r", encoding="utf-8") as f:
+                    _RULES = json.load(f)
+            except Exception:
+                _RULES = {"weights": {}}
     return _RULES
 
 # ---------------------------------------------------------------------
@@ -156,37 +158,14 @@ def normalize_mcq_accuracy(payload: Dict[str, Any]) -> None:
             pass
 
 def _lookup_correct_id(category_label: str, qid: str) -> Optional[str]:
-    bank_cat = to_bank_label(category_label)
-    bucket = (QUESTION_BANK.get(bank_cat) or {}).get("mc") or []
-    for q in bucket:
-        if str(q.get("id")) == str(qid):
-            if q.get("correct_id") is not None:
-                return str(q["correct_id"])
-            if q.get("correct") is not None:
-                try:
-                    return str(int(q["correct"]))
-                except Exception:
-                    return None
-    return None
-
-def _lookup_question_and_options(category_label: str, qid: str) -> Tuple[Optional[str], Dict[str, str]]:
-    bank_cat = to_bank_label(category_label)
-    bucket = (QUESTION_BANK.get(bank_cat) or {}).get("mc") or []
-    for q in bucket:
-        if str(q.get("id")) != str(qid):
-            continue
-        qtext = str(q.get("text") or "")
-        opts: Dict[str, str] = {}
-        if isinstance(q.get("options"), list):
-            for o in q["options"]:
-                oid = str(o.get("id"))
-                txt = str(o.get("text") or "")
-                opts[oid] = txt
-        elif isinstance(q.get("choices"), list):
-            for i, t in enumerate(q["choices"]):
-                opts[str(i)] = str(t)
-        return qtext, opts
-    return None, {}
+    rec = get_bank().lookup(to_bank_label(category_label), "mc", qid)
+    return rec.correct_id if rec is not None else None
+
+def _lookup_question_and_options(category_label: str, qid: str) -> Tuple[Optional[str], Mapping[str, str]]:
+    rec = get_bank().lookup(to_bank_label(category_label), "mc", qid)
+    if rec is None:
+        return None, {}
+    return rec.text, rec.options
 
 def _ensure_mcq_accuracy(payload: Dict[str, Any]) -> Dict[str, Any]:
     meta = payload.get("meta") or {}
@@ -435,7 +414,8 @@ async def glmp_evaluate_and_save(request: Request, session: Session = Depends(ge
     rules = get_rules()
 
     out = evaluate_glmp_payload(payload, rules)
-    debug_extra = _compute_debug(payload, rules)
+    with span("glmp.debug"):
+        debug_extra = _compute_debug(payload, rules)
 
     meta = payload.get("meta") or {}
     category = meta.get("category") or payload.get("category") or "Communication"
@@ -450,32 +430,35 @@ async def glmp_evaluate_and_save(request: Request, session: Session = Depends(ge
         mapped = _apply_llm_to_glmp(payload, llm)
         out = evaluate_glmp_payload(payload, rules)
 
-        text_score = float(out.get("score", 0.0))
-        if text_score == 0.0 and user_text.strip():
-            text_score = 6.0
-            out["score"] = text_score
-            out["label"] = _lbl10(text_score)
-            debug_extra["baseline_applied"] = True
-
-        mcq10 = float(debug_extra.get("mcq_accuracy_0_10") or 0.0) or 0.0
-        fused, w = _fuse_text_and_mcq(text_score, mcq10, bool(debug_extra.get("has_mcq")))
-        out["score"] = round(_clip010(fused), 2)
-        out["label"] = _lbl10(out["score"])
-        _sync_all_categories(out)
+        with span("glmp.fusion"):
+            text_score = float(out.get("score", 0.0))
+            if text_score == 0.0 and user_text.strip():
+                text_score = 6.0
+                out["score"] = text_score
+                out["label"] = _lbl10(text_score)
+                debug_extra["baseline_applied"] = True
+
+            mcq10 = float(debug_extra.get("mcq_accuracy_0_10") or 0.0) or 0.0
+            fused, w = _fuse_text_and_mcq(text_score, mcq10, bool(debug_extra.get("has_mcq")))
+            out["score"] = round(_clip010(fused), 2)
+            out["label"] = _lbl10(out["score"])
+            _sync_all_categories(out)
 
         # === Repetition penalty: αν ο χρήστης επαναλαμβάνει την ίδια απάντηση σε πολλές open ===
         user_id = (meta.get("userId") or meta.get("user_id") or payload.get("user_id"))
         category_norm = normalize_category(category)
 
-        penalized_score, rep_debug = _apply_repetition_penalty_single(
-            session=session,
-            user_id=str(user_id) if user_id is not None else None,
-            category_norm=category_norm,
-            user_text=user_text,
-            current_score=float(out["score"]),
-            threshold=0.90,   # πόσο «ίδιες» πρέπει να είναι
-            penalty=1.0       # πόσο κόβουμε
-        )
+        with span("glmp.repetition_penalty") as sp:
+            penalized_score, rep_debug = _apply_repetition_penalty_single(
+                session=session,
+                user_id=str(user_id) if user_id is not None else None,
+                category_norm=category_norm,
+                user_text=user_text,
+                current_score=float(out["score"]),
+                threshold=0.90,   # πόσο «ίδιες» πρέπει να είναι
+                penalty=1.0       # πόσο κόβουμε
+            )
+            sp["max_similarity"] = rep_debug.get("repetition_max_similarity")
 
         if penalized_score != out["score"]:
             out["score"] = round(_clip010(penalized_score), 2)
@@ -539,9 +522,10 @@ async def glmp_evaluate_and_save(request: Request, session: Session = Depends(ge
             measures=payload,
             result=result_to_store,
         )
-        session.add(ev)
-        session.commit()
-        session.refresh(ev)
+        with span("db.commit"):
+            session.add(ev)
+            session.commit()
+            session.refresh(ev)
 
         resp = build_response(payload, result_to_store, debug_extra, coaching)
         resp["id"] = ev.id
@@ -1,11 +1,13 @@
 # app/routers/questions.py
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
-from sqlalchemy import text
 from sqlmodel import Session
 import random
 
 from app.core.db import get_session
+from app.core.bundles import CACHE_CONTROL, CACHE_CONTROL_PRIVATE, render_bundle
+from app.core.http_cache import cached_json, not_modified
+from app.core.question_catalog import catalog_snapshot, catalog_tables
 from app.core.questions import build_bundle, get_categories
 
 MARKER = "bundle-v2-jsonresp-POST-phase-attempt"
@@ -17,8 +19,45 @@ def marker():
     return {"marker": MARKER}
 
 
+def _bundle_params(category: str, phase: str, attempt: int):
+    phase_norm = "POST" if str(phase).strip().upper() == "POST" else "PRE"
+    attempt_norm = 2 if int(attempt or 1) == 2 else 1
+    return category, phase_norm, attempt_norm
+
+
+def _seeded_bundle(
+    request: Request,
+    category: str,
+    phase_norm: str,
+    attempt_norm: int,
+    seed: int,
+    n_open: int,
+    n_mc: int,
+    include_correct: bool,
+) -> Response:
+    # 🔒 ίδιο seed ⇒ ίδια bytes: rendered μία φορά, μετά cache hit / 304
+    body, etag, hit = render_bundle(
+        category, phase_norm, attempt_norm, seed,
+        n_open=n_open, n_mc=n_mc, include_correct=include_correct,
+    )
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL_PRIVATE if include_correct else CACHE_CONTROL,
+        "X-Cache": "hit" if hit else "miss",
+        "x-bundle-marker": MARKER,
+    }
+    if not_modified(request, etag, None):
+        return Response(status_code=304, headers=headers)
+    print(
+        f"[bundle] OK cat={category} phase={phase_norm} attempt={attempt_norm} seed={seed} "
+        f"include_correct={include_correct} cache={'hit' if hit else 'miss'}"
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/bundle")
 def bundle(
+    request: Request,
     category: str = Query("Communication"),
     n_open: int = Query(6, ge=0),
     n_mc: int = Query(6, ge=0),
@@ -31,63 +70,53 @@ def bundle(
     ),
 ):
     # Κανονικοποίηση phase/attempt
-    phase_norm = "POST" if str(phase).strip().upper() == "POST" else "PRE"
-    attempt_norm = 2 if int(attempt or 1) == 2 else 1
+    category, phase_norm, attempt_norm = _bundle_params(category, phase, attempt)
 
-    # 🔒 Προαιρετική σπορά τυχαιοποίησης ώστε ίδιο _ts ⇒ ίδιο δείγμα
     if _ts is not None:
-        try:
-            random.seed(f"{category}|{phase_norm}|{attempt_norm}|{_ts}")
-        except Exception:
-            pass
-
-    try:
-        resp = build_bundle(
-            category=category,
-            n_open=n_open,
-            n_mc=n_mc,
-            hide_correct=not include_correct,
-            phase=phase_norm,
-            attempt=attempt_norm,
-        )
-        # Σταθερά debug πεδία στο payload
-        resp["used_fallback"] = False
-        resp["phase"] = phase_norm
-        resp["attempt"] = attempt_norm
-
-        # 🔎 ΡΗΤΟ LOG: τι πραγματικά επιστρέφουμε
-        open_count = len(resp.get("open") or [])
-        mc_count = len(resp.get("mc") or [])
-        flat_count = len(resp.get("flat") or [])
-        print(
-            f"[bundle] OK cat={category} phase={phase_norm} attempt={attempt_norm} "
-            f"include_correct={include_correct} keys={list(resp.keys())} "
-            f"open={open_count} mc={mc_count} flat={flat_count}"
-        )
-        return JSONResponse(content=resp, headers={"x-bundle-marker": MARKER})
-
-    except TypeError:
-        # Fallback για images με παλιό build_bundle signature
-        resp = build_bundle(
-            category=category,
-            n_open=n_open,
-            n_mc=n_mc,
-            hide_correct=not include_correct,
-        )
-        resp["used_fallback"] = True
-        resp["phase"] = phase_norm
-        resp["attempt"] = attempt_norm
-
-        # 🔎 ΡΗΤΟ LOG: fallback κλάδος
-        open_count = len(resp.get("open") or [])
-        mc_count = len(resp.get("mc") or [])
-        flat_count = len(resp.get("flat") or [])
-        print(
-            f"[bundle] FALLBACK cat={category} phase={phase_norm} attempt={attempt_norm} "
-            f"include_correct={include_correct} keys={list(resp.keys())} "
-            f"open={open_count} mc={mc_count} flat={flat_count}"
-        )
-        return JSONResponse(content=resp, headers={"x-bundle-marker": MARKER})
+        return _seeded_bundle(request, category, phase_norm, attempt_norm, _ts, n_open, n_mc, include_correct)
+
+    # Χωρίς seed: νέο δείγμα σε κάθε κλήση (δικό του RNG, όχι το global)
+    resp = build_bundle(
+        category=category,
+        n_open=n_open,
+        n_mc=n_mc,
+        hide_correct=not include_correct,
+        phase=phase_norm,
+        attempt=attempt_norm,
+        rng=random.Random(),
+    )
+    # Σταθερά debug πεδία στο payload
+    resp["used_fallback"] = False
+    resp["phase"] = phase_norm
+    resp["attempt"] = attempt_norm
+
+    # 🔎 ΡΗΤΟ LOG: τι πραγματικά επιστρέφουμε
+    open_count = len(resp.get("open") or [])
+    mc_count = len(resp.get("mc") or [])
+    flat_count = len(resp.get("flat") or [])
+    print(
+        f"[bundle] OK cat={category} phase={phase_norm} attempt={attempt_norm} "
+        f"include_correct={include_correct} keys={list(resp.keys())} "
+        f"open={open_count} mc={mc_count} flat={flat_count}"
+    )
+    return JSONResponse(content=resp, headers={"x-bundle-marker": MARKER, "Cache-Control": "no-store"})
+
+
+@router.get("/bundle/{category}/{phase}/{attempt}/{seed}.json")
+def bundle_static(
+    request: Request,
+    category: str,
+    phase: str,
+    attempt: int,
+    seed: int,
+    n_open: int = Query(6, ge=0),
+    n_mc: int = Query(6, ge=0),
+):
+    """Ίδιο layout με το prerender (python -m app.core.bundles) → origin για CDN."""
+    if attempt not in (1, 2):
+        raise HTTPException(status_code=404, detail="unknown attempt")
+    category, phase_norm, attempt_norm = _bundle_params(category, phase, attempt)
+    return _seeded_bundle(request, category, phase_norm, attempt_norm, seed, n_open, n_mc, False)
 
 
 @router.get("/categories")
@@ -100,87 +129,23 @@ def categories(phase: str = Query("PRE", description="PRE ή POST")):
 # ---------------------------------------------------------------------
 # ΕΛΑΧΙΣΤΟ endpoint για το Rater UI (να μην 404-άρει):
 # GET /api/softskills/questions/quiz/bundle
-# Παίρνει τις πιο πρόσφατες ερωτήσεις από τον πίνακα answers και
-# επιστρέφει έναν απλό χάρτη id->text/category/qtype (options κενό).
+# Επιστρέφει έναν απλό χάρτη id->text/category/qtype (options κενό) από τον
+# question_catalog (snapshot στη μνήμη, ETag ανά data_versions).
 # ---------------------------------------------------------------------
 @router.get("/quiz/bundle")
-def quiz_bundle(session: Session = Depends(get_session)):
-    rows = session.execute(text("""
-        SELECT DISTINCT ON (question_id)
-               question_id AS id,
-               COALESCE(NULLIF(prompt, ''), '[no question text]') AS text,
-               COALESCE(category, '') AS category,
-               COALESCE(qtype, '')    AS qtype
-        FROM answers
-        WHERE question_id IS NOT NULL
-        ORDER BY question_id, created_at DESC
-    """)).mappings().all()
-
-    items = [{
-        "id": r["id"],
-        "text": r["text"],
-        "category": r["category"],
-        "qtype": r["qtype"],
-        "options": [],
-    } for r in rows]
-
-    return {"items": items}
+def quiz_bundle(request: Request, session: Session = Depends(get_session)):
+    return cached_json(request, session, catalog_tables(session),
+                       lambda: catalog_snapshot(session).bundle_payload())
 
 
 @router.get("")
-def questions_index(session: Session = Depends(get_session)):
-    rows = session.execute(text("""
-        SELECT DISTINCT ON (question_id)
-               question_id AS id,
-               COALESCE(NULLIF(prompt, ''), '[no question text]') AS text,
-               COALESCE(category, '') AS category,
-               COALESCE(qtype, '')    AS qtype
-        FROM answers
-        WHERE question_id IS NOT NULL
-        ORDER BY question_id, created_at DESC
-    """)).mappings().all()
-
-    items = []
-    qmap = {}
-    for r in rows:
-        obj = {
-            "id": r["id"],
-            "text": r["text"],
-            "category": r["category"],
-            "qtype": r["qtype"],
-            "options": [],
-        }
-        items.append(obj)
-        qmap[r["id"]] = {k: v for k, v in obj.items() if k != "id"}
-
-    return {"items": items, "map": qmap}
+def questions_index(request: Request, session: Session = Depends(get_session)):
+    return cached_json(request, session, catalog_tables(session),
+                       lambda: catalog_snapshot(session).index_payload())
 
 
 @router.get("/quiz/questions")
-def quiz_questions(session: Session = Depends(get_session)):
-    rows = session.execute(text("""
-        SELECT DISTINCT ON (question_id)
-               question_id AS id,
-               COALESCE(NULLIF(prompt, ''), '[no question text]') AS text,
-               COALESCE(category, '') AS category,
-               COALESCE(qtype, '')    AS qtype
-        FROM answers
-        WHERE question_id IS NOT NULL
-        ORDER BY question_id, created_at DESC
-    """)).mappings().all()
-
-    items = []
-    qmap = {}
-    for r in rows:
-        obj = {
-            "id": r["id"],
-            "text": r["text"],
-            "category": r["category"],
-            "qtype": r["qtype"],
-            "options": [],
-        }
-        items.append(obj)
-        qmap[r["id"]] = {k: v for k, v in obj.items() if k != "id"}
-
-    return {"items": items, "map": qmap}
+def quiz_questions(request: Request, session: Session = Depends(get_session)):
+    return cached_json(request, session, catalog_tables(session),
+                       lambda: catalog_snapshot(session).index_payload())
 # ---------------------------------------------------------------------
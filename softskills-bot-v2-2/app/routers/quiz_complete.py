@@ -1,21 +1,17 @@
 # app/routers/quiz_complete.py
 from __future__ import annotations
-import os
 from typing import Dict, Any, Optional
 
 from fastapi import APIRouter, HTTPException, Depends
 from sqlmodel import Session
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
 
 from app.core.db import get_session
+from app.core.materials import get_materials
 
 # Ταιριάζει με το BASE που χρησιμοποιείς: .../api/softskills
 # Άρα τα endpoints θα είναι /api/softskills/quiz/...
 router = APIRouter(prefix="/quiz", tags=["quiz"])
 
-MATERIALS_BUCKET = os.getenv("MATERIALS_BUCKET", "softskills-quiz-ihu")
-
 CATEGORIES = ["leadership", "communication", "teamwork", "problem_solving"]
 LEVELS     = ["low", "mid", "high"]
 
@@ -35,62 +31,19 @@ def level_from_score(s: float) -> str:
     return "high"
 
 
-def _head_exists(s3, bucket: str, key: str) -> bool:
-    if not s3 or not bucket or not key:
-        return False
-    try:
-        s3.head_object(Bucket=bucket, Key=key)
-        return True
-    except NoCredentialsError:
-        # 🚫 Δεν έχουμε AWS credentials → θεωρούμε ότι δεν υπάρχει
-        return False
-    except ClientError as e:
-        code = e.response.get("Error", {}).get("Code")
-        if code in ("404", "NoSuchKey", "NotFound"):
-            return False
-        # για οτιδήποτε άλλο απλά log και False
-        print(f"S3 head_object error: {e}")
-        return False
-    
-
-def _get_s3_client():
-    try:
-        # Δημιουργεί S3 client μόνο αν υπάρχουν credentials
-        session = boto3.session.Session()
-        creds = session.get_credentials()
-        if creds is None:
-            return None
-        return session.client("s3")
-    except Exception:
-        return None
+def _pick_material_key(cat: str, level: str, phase: str, attempt: int) -> Optional[str]:
+    # phase/attempt → phase → category, από το cached listing (χωρίς head_object)
+    return get_materials().resolve(cat, level, phase, attempt)
 
 
-def _pick_material_key(cat: str, level: str, phase: str, attempt: int) -> str:
-    s3 = _get_s3_client()
-    if not s3:
-        # 🚫 Δεν υπάρχει S3 client (άρα δεν υπάρχουν credentials)
+def presign_url(key: str) -> Optional[str]:
+    try:
+        return get_materials().url(key)
+    except Exception as e:
+        # 🚫 π.χ. χωρίς AWS credentials → δεν δίνουμε URL
+        print(f"[quiz_complete] presign failed for {key}: {e!r}")
         return None
 
-    phase_norm = "post" if str(phase).strip().upper() == "POST" else "pre"
-    candidates = [
-        f"materials/{cat}/{phase_norm}/attempt{attempt}/{level}.pdf",
-        f"materials/{cat}/{phase_norm}/{level}.pdf",
-        f"materials/{cat}/{level}.pdf",
-    ]
-    for key in candidates:
-        if _head_exists(s3, MATERIALS_BUCKET, key):
-            return key
-    return None
-
-
-def presign_url(bucket: str, key: str, expires_sec: int = 24 * 3600) -> str:
-    s3 = boto3.client("s3")  # region από το Lambda runtime
-    return s3.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": bucket, "Key": key},
-        ExpiresIn=expires_sec,
-    )
-
 
 def _extract_phase_attempt(payload: Dict[str, Any]) -> tuple[str, int]:
     """
@@ -165,15 +118,7 @@ def quiz_complete(payload: Dict[str, Any], session: Session = Depends(get_sessio
             ("problem_solving", lvl_prob),
         ]:
             key = _pick_material_key(cat, lvl, phase_norm, attempt_int)
-            url = None
-
-            if key:
-                try:
-                    url = presign_url(MATERIALS_BUCKET, key)
-                except NoCredentialsError:
-                    # 🚫 Δεν έχουμε AWS credentials → δεν δίνουμε URL
-                    url = None
-
+            url = presign_url(key) if key else None
             if url:
                 materials.append({"category": cat, "level": lvl, "url": url})
 
@@ -0,0 +1,88 @@
+# app/routers/rater_assign.py
+from __future__ import annotations
+
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.db import get_session
+from app.core.assignments import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_TARGET_RATINGS,
+    lease_batch,
+    release,
+    throughput_stats,
+)
+from app.core.ratings import RATER_ID_PATTERN
+
+router = APIRouter(prefix="/rater/assignments", tags=["rater"])
+
+
+class LeasePayload(BaseModel):
+    raterId: str = Field(..., pattern=RATER_ID_PATTERN)
+    limit: int = Field(20, ge=1, le=200)
+    target: int = Field(DEFAULT_TARGET_RATINGS, ge=1, le=20)
+    leaseSeconds: int = Field(DEFAULT_LEASE_SECONDS, ge=60, le=24 * 3600)
+    category: Optional[str] = None
+    qtype: Optional[str] = None
+
+
+@router.post("/lease")
+def lease(p: LeasePayload, session: Session = Depends(get_session)):
+    """
+    Ο rater παίρνει ένα batch answers μόνο για αυτόν (μέχρι να λήξει το lease).
+    Όταν αποθηκεύσει rating για ένα answer, το lease κλείνει αυτόματα (trigger).
+    """
+    # Πρώτα SELECT: το raters έχει statement trigger (data_versions)· ένα INSERT σε κάθε
+    # lease θα άλλαζε το watermark και θα σειριοποιούσε τα leases στη γραμμή του μετρητή.
+    params = {"rid": p.raterId}
+    active = session.execute(text("SELECT active FROM raters WHERE rater_id = :rid"), params).scalar()
+    if active is None:
+        active = session.execute(text("""
+            INSERT INTO raters (rater_id) VALUES (:rid)
+            ON CONFLICT (rater_id) DO NOTHING
+            RETURNING active
+        """), params).scalar()
+        if active is None:
+            # το έγραψε ταυτόχρονα άλλο request
+            active = session.execute(text("SELECT active FROM raters WHERE rater_id = :rid"), params).scalar()
+    if not active:
+        session.rollback()
+        raise HTTPException(status_code=403, detail="rater is not active")
+
+    items = lease_batch(
+        session,
+        p.raterId,
+        limit=p.limit,
+        target=p.target,
+        lease_seconds=p.leaseSeconds,
+        category=p.category,
+        qtype=p.qtype,
+    )
+    session.commit()
+    return {"ok": True, "raterId": p.raterId, "count": len(items), "items": items}
+
+
+class ReleasePayload(BaseModel):
+    raterId: str = Field(..., pattern=RATER_ID_PATTERN)
+    answerIds: Optional[List[UUID]] = None  # None = όλα τα ενεργά leases του rater
+
+
+@router.post("/release")
+def release_leases(p: ReleasePayload, session: Session = Depends(get_session)):
+    ids = [str(a) for a in p.answerIds] if p.answerIds is not None else None
+    n = release(session, p.raterId, ids)
+    session.commit()
+    return {"ok": True, "released": n}
+
+
+@router.get("/stats")
+def stats(
+    window_minutes: int = Query(60, ge=1, le=7 * 24 * 60),
+    session: Session = Depends(get_session),
+):
+    return {"ok": True, "window_minutes": window_minutes, "items": throughput_stats(session, window_minutes)}
@@ -1,58 +1,27 @@
 # app/routers/rater_final.py
 from __future__ import annotations
 
-from typing import List, Optional, Literal, Tuple, Dict, Any
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple, Dict, Any
 from uuid import UUID
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, Response, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field
 from sqlmodel import Session
 from sqlalchemy import text
 
 from app.core.db import get_session
+from app.core.final_scores import recompute_final_scores, get_human_weight, set_human_weight
+from app.core.ratings import bulk_upsert_ratings, RATER_ID_PATTERN
+from app.core.http_cache import cached_json
+from app.core.export_stream import EXCEL_GR, csv_chunks, csv_response, stream_query
 
 router = APIRouter(prefix="/rater", tags=["rater"])
 
-# ---------------------------------------------------------------------
-# Schema helper: προσθέτει human_weighted αν λείπει από final_scores
-# ---------------------------------------------------------------------
-def ensure_schema(session: Session) -> Dict[str, bool]:
-    flags = {"has_human_weighted": False}
-
-    row = session.execute(
-        text("""
-        SELECT 1
-        FROM information_schema.columns
-        WHERE table_schema='public'
-          AND table_name='final_scores'
-          AND column_name='human_weighted'
-        """)
-    ).first()
-
-    if row:
-        flags["has_human_weighted"] = True
-        return flags
-
-    try:
-        session.execute(text("ALTER TABLE final_scores ADD COLUMN human_weighted NUMERIC"))
-        session.commit()
-        flags["has_human_weighted"] = True
-    except Exception:
-        session.rollback()
-        row2 = session.execute(
-            text("""
-            SELECT 1
-            FROM information_schema.columns
-            WHERE table_schema='public'
-              AND table_name='final_scores'
-              AND column_name='human_weighted'
-            """)
-        ).first()
-        flags["has_human_weighted"] = bool(row2)
-
-    return flags
-
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
@@ -87,7 +56,7 @@ def ping():
 # ---------------------------------------------------------------------
 class RatePayload(BaseModel):
     answerId: UUID
-    raterId: Literal["teacher01", "teacher02"]
+    raterId: str = Field(..., pattern=RATER_ID_PATTERN)
     score: float  # 0..10 ή 0..1
 
 @router.post("/rate")
@@ -110,130 +79,49 @@ def rate_one(p: RatePayload, session: Session = Depends(get_session)):
     return {"ok": True, "answerId": str(p.answerId), "raterId": p.raterId, "stored_score_0_1": s}
 
 # ---------------------------------------------------------------------
-# Submit (batch) + recompute μόνο για αυτά που ήρθαν
+# Submit (batch)
 # ---------------------------------------------------------------------
 class Rating(BaseModel):
     answerId: UUID
     score: float  # 0..1
 
 class SubmitPayload(BaseModel):
-    raterId: Literal["teacher01", "teacher02"]
+    raterId: str = Field(..., pattern=RATER_ID_PATTERN)
     ratings: List[Rating]
 
-def _recompute_for(session: Session, answer_ids: List[str], human_weight: float = 0.6) -> int:
-    """
-    Υπολογίζει/ενημερώνει final_scores μόνο για τα συγκεκριμένα answers.
-    """
-    if not answer_ids:
-        return 0
-
-    rows = session.execute(text("""
-        SELECT a.answer_id,
-               (SELECT llm_score FROM llm_scores WHERE answer_id=a.answer_id) AS llm,
-               (SELECT score FROM human_ratings WHERE answer_id=a.answer_id AND rater_id='teacher01') AS t1,
-               (SELECT score FROM human_ratings WHERE answer_id=a.answer_id AND rater_id='teacher02') AS t2
-        FROM answers a
-        WHERE a.answer_id::text = ANY(:ids)
-    """), {"ids": answer_ids}).mappings().all()
-
-    flags = ensure_schema(session)
-    has_hw = flags.get("has_human_weighted", False)
-
-    updated = 0
-    for r in rows:
-        aid = str(r["answer_id"])
-        llm = clamp01(r.get("llm"))
-        t1  = clamp01(r.get("t1"))
-        t2  = clamp01(r.get("t2"))
-
-        cnt = (0 if t1 is None else 1) + (0 if t2 is None else 1)
-        human_avg = None if cnt == 0 else ((0.0 if t1 is None else t1) + (0.0 if t2 is None else t2)) / cnt
-        human_weighted = human_avg
-
-        auto = 0.0 if llm is None else llm
-        hw   = 0.0 if human_weighted is None else human_weighted
-        final = (1.0 - human_weight) * auto + human_weight * hw
-
-        if has_hw:
-            sql = text("""
-                INSERT INTO final_scores (
-                    answer_id, user_id, question_id, category, qtype,
-                    llm_score, teacher01, teacher02, human_avg, human_weighted, final_score, completed_at
-                )
-                SELECT a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
-                       :llm, :t1, :t2, :hav, :hw, :final, now()
-                FROM answers a
-                WHERE a.answer_id = :aid
-                ON CONFLICT (answer_id) DO UPDATE
-                  SET user_id        = EXCLUDED.user_id,
-                      question_id    = EXCLUDED.question_id,
-                      category       = EXCLUDED.category,
-                      qtype          = EXCLUDED.qtype,
-                      llm_score      = EXCLUDED.llm_score,
-                      teacher01      = EXCLUDED.teacher01,
-                      teacher02      = EXCLUDED.teacher02,
-                      human_avg      = EXCLUDED.human_avg,
-                      human_weighted = EXCLUDED.human_weighted,
-                      final_score    = EXCLUDED.final_score,
-                      completed_at   = now()
-            """)
-            params_up = {
-                "llm": llm, "t1": t1, "t2": t2,
-                "hav": human_avg, "hw": human_weighted,
-                "final": final, "aid": aid
-            }
-        else:
-            sql = text("""
-                INSERT INTO final_scores (
-                    answer_id, user_id, question_id, category, qtype,
-                    llm_score, teacher01, teacher02, human_avg, final_score, completed_at
-                )
-                SELECT a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
-                       :llm, :t1, :t2, :hav, :final, now()
-                FROM answers a
-                WHERE a.answer_id = :aid
-                ON CONFLICT (answer_id) DO UPDATE
-                  SET user_id       = EXCLUDED.user_id,
-                      question_id   = EXCLUDED.question_id,
-                      category      = EXCLUDED.category,
-                      qtype         = EXCLUDED.qtype,
-                      llm_score     = EXCLUDED.llm_score,
-                      teacher01     = EXCLUDED.teacher01,
-                      teacher02     = EXCLUDED.teacher02,
-                      human_avg     = EXCLUDED.human_avg,
-                      final_score   = EXCLUDED.final_score,
-                      completed_at  = now()
-            """)
-            params_up = {
-                "llm": llm, "t1": t1, "t2": t2,
-                "hav": human_avg, "final": final, "aid": aid
-            }
-
-        session.execute(sql, params_up)
-        updated += 1
-
-    return updated
-
 @router.post("/submit")
 def submit_ratings(p: SubmitPayload, session: Session = Depends(get_session)):
-    for r in p.ratings:
-        s = max(0.0, min(1.0, float(r.score)))
-        session.execute(
-            text("""
-              INSERT INTO human_ratings (answer_id, rater_id, score)
-              VALUES (:aid, :rid, :s)
-              ON CONFLICT (answer_id, rater_id)
-              DO UPDATE SET score=EXCLUDED.score, rated_at=now()
-            """),
-            {"aid": str(r.answerId), "rid": p.raterId, "s": s}
-        )
+    # ίδιο clamp 0..1 με πριν, αλλά ένα upsert για όλο το batch
+    items = [{"answerId": str(r.answerId), "score": max(0.0, min(1.0, float(r.score)))} for r in p.ratings]
+    res = bulk_upsert_ratings(session, p.raterId, items)
 
-    # recompute μόνο για τα συγκεκριμένα answers
-    ids = [str(r.answerId) for r in p.ratings]
-    _recompute_for(session, ids, human_weight=0.6)
+    # final_scores: τα statement-level triggers του human_ratings κάνουν το recompute
+    session.commit()
+    return {"ok": True, "count": len(p.ratings), **{k: v for k, v in res.items() if k != "results"}}
+
+# ---------------------------------------------------------------------
+# Bulk ratings (ένα statement, per-row outcomes)
+# ---------------------------------------------------------------------
+class BulkRating(BaseModel):
+    answerId: str
+    score: Any  # 0..1 ή 0..10 (ελέγχεται ανά γραμμή)
+
+class BulkRatingsPayload(BaseModel):
+    raterId: str = Field(..., pattern=RATER_ID_PATTERN)
+    ratings: List[BulkRating]
 
+@router.post("/ratings/bulk")
+def bulk_ratings(p: BulkRatingsPayload, session: Session = Depends(get_session)):
+    """
+    Αποθηκεύει μια ολόκληρη σελίδα βαθμολογιών σε ένα request.
+    Άκυρες γραμμές δεν ακυρώνουν το batch· επιστρέφονται με status invalid / not_found.
+    """
+    if len(p.ratings) > 5000:
+        raise HTTPException(status_code=413, detail="too many ratings in one batch (max 5000)")
+
+    res = bulk_upsert_ratings(session, p.raterId, [r.model_dump() for r in p.ratings])
     session.commit()
-    return {"ok": True, "count": len(p.ratings)}
+    return {"ok": True, "raterId": p.raterId, **res}
 
 # ---------------------------------------------------------------------
 # Items για Rater UI
@@ -252,10 +140,13 @@ def rater_items(
       SELECT a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
              a.prompt, a.text AS answer, a.created_at,
              l.llm_score AS "initialScore",
-             (SELECT score FROM human_ratings WHERE answer_id=a.answer_id AND rater_id='teacher01') AS teacher01,
-             (SELECT score FROM human_ratings WHERE answer_id=a.answer_id AND rater_id='teacher02') AS teacher02
+             g.scores[array_position(g.rater_ids, 'teacher01')] AS teacher01,
+             g.scores[array_position(g.rater_ids, 'teacher02')] AS teacher02,
+             COALESCE(g.n, 0) AS "nRatings",
+             g.mean AS "humanMean"
       FROM answers a
       LEFT JOIN llm_scores l USING(answer_id)
+      LEFT JOIN rating_aggregates g USING(answer_id)
       WHERE 1=1
     """
     params: Dict[str, Any] = {}
@@ -279,6 +170,97 @@ def rater_items(
     rows = session.execute(text(sql), params).mappings().all()
     return [dict(r) for r in rows]
 
+# ---------------------------------------------------------------------
+# Queue για Rater UI (keyset pagination σε (created_at, answer_id))
+# ---------------------------------------------------------------------
+def _encode_cursor(created_at: datetime, answer_id: Any) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(answer_id)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        d = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        return datetime.fromisoformat(d["t"]), str(UUID(d["id"]))
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+@router.get("/queue")
+def rater_queue(
+    rater_id: Optional[str] = None,
+    category: Optional[str] = None,
+    qtype: Optional[str] = None,
+    attempt: Optional[int] = Query(None, ge=1, le=2),
+    unrated_by_me: bool = Query(False, description="μόνο όσα δεν έχει βαθμολογήσει ο rater_id"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor της προηγούμενης σελίδας"),
+    session: Session = Depends(get_session),
+):
+    """
+    Σελίδα απαντήσεων για βαθμολόγηση, με σταθερό κόστος ανά σελίδα:
+    - teacher01/teacher02 από το rating_aggregates (μία γραμμή ανά answer)
+    - ORDER BY (created_at, answer_id) DESC + keyset cursor (όχι OFFSET)
+    Επιστρέφει {"items": [...], "next_cursor": str | None}.
+    """
+    if unrated_by_me and not (rater_id and re.match(RATER_ID_PATTERN, rater_id)):
+        raise HTTPException(status_code=400, detail="unrated_by_me requires a valid rater_id")
+
+    where: List[str] = []
+    params: Dict[str, Any] = {"lim": limit + 1}
+
+    if category:
+        where.append("a.category = :cat"); params["cat"] = category
+    if qtype:
+        where.append("a.qtype = :qt"); params["qt"] = qtype
+    if attempt in (1, 2):
+        where.append("EXISTS (SELECT 1 FROM interaction i WHERE i.answer_id = a.answer_id AND i.attempt_no = :att)")
+        params["att"] = attempt
+    if unrated_by_me:
+        where.append("NOT EXISTS (SELECT 1 FROM human_ratings m WHERE m.answer_id = a.answer_id AND m.rater_id = :rid)")
+        params["rid"] = rater_id
+    if cursor:
+        ct, cid = _decode_cursor(cursor)
+        where.append("(a.created_at, a.answer_id) < (:ct, CAST(:cid AS uuid))")
+        params["ct"] = ct; params["cid"] = cid
+
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    rows = session.execute(text(f"""
+        SELECT a.answer_id, a.question_id, a.user_id, a.qtype, a.category,
+               a.prompt, a.text AS answer, a.created_at,
+               l.llm_score AS initial_score,
+               g.scores[array_position(g.rater_ids, 'teacher01')] AS t1,
+               g.scores[array_position(g.rater_ids, 'teacher02')] AS t2
+        FROM answers a
+        LEFT JOIN llm_scores l USING (answer_id)
+        LEFT JOIN rating_aggregates g USING (answer_id)
+        {where_sql}
+        ORDER BY a.created_at DESC, a.answer_id DESC
+        LIMIT :lim
+    """), params).mappings().all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [
+        {
+            "answerId": str(r["answer_id"]),
+            "questionId": r["question_id"],
+            "userId": r["user_id"],
+            "qtype": r["qtype"],
+            "category": r["category"],
+            "prompt": r["prompt"],
+            "answer": r["answer"],
+            "initialScore": clamp01(r["initial_score"]),
+            "createdAt": r["created_at"].isoformat() if r["created_at"] else None,
+            "teacher01": clamp01(r["t1"]),
+            "teacher02": clamp01(r["t2"]),
+        }
+        for r in rows
+    ]
+    next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["answer_id"]) if has_more and rows else None
+    return {"items": items, "next_cursor": next_cursor}
+
 # ---------------------------------------------------------------------
 # Final-score για ένα answer
 # ---------------------------------------------------------------------
@@ -288,7 +270,7 @@ def final_score(answer_id: UUID, session: Session = Depends(get_session)):
       SELECT
         f.answer_id,
         f.llm_score,
-        (f.teacher01 + f.teacher02)/2.0 AS human_score,
+        f.human_avg AS human_score,
         f.final_score
       FROM final_scores f
       WHERE f.answer_id=:aid
@@ -298,178 +280,96 @@ def final_score(answer_id: UUID, session: Session = Depends(get_session)):
     return dict(row)
 
 # ---------------------------------------------------------------------
-# Metrics (QWK “light” demo)
+# Metrics (QWK από τα reliability_cells — δες app/core/reliability.py)
 # ---------------------------------------------------------------------
-def _bin_score(x: Optional[float], bins: int) -> Optional[int]:
-    if x is None:
-        return None
-    x = max(0.0, min(1.0, float(x)))
-    b = int(x * bins)
-    if b == bins:
-        b = bins - 1
-    return b
-
 @router.get("/metrics")
-def metrics(bins: int = Query(5, ge=2, le=10), session: Session = Depends(get_session)):
-    rows = session.execute(text("""
-        SELECT
-          h1.answer_id,
-          (SELECT score FROM human_ratings WHERE answer_id=h1.answer_id AND rater_id='teacher01') AS t1,
-          (SELECT score FROM human_ratings WHERE answer_id=h1.answer_id AND rater_id='teacher02') AS t2
-        FROM human_ratings h1
-        GROUP BY h1.answer_id
-    """)).mappings().all()
+def metrics(
+    bins: int = Query(5, ge=2, le=10),
+    rater_a: str = Query("teacher01", pattern=RATER_ID_PATTERN),
+    rater_b: str = Query("teacher02", pattern=RATER_ID_PATTERN),
+    session: Session = Depends(get_session),
+):
+    from app.core.reliability import pair_qwk  # numpy μόνο εδώ
 
-    gold: List[Tuple[int,int]] = []
-    for r in rows:
-        s1 = clamp01(r.get("t1"))
-        s2 = clamp01(r.get("t2"))
-        if s1 is None or s2 is None:
-            continue
-        b1 = _bin_score(s1, bins)
-        b2 = _bin_score(s2, bins)
-        if b1 is None or b2 is None:
-            continue
-        gold.append((b1, b2))
-
-    n_common = len(gold)
-    if n_common < 2:
-        return {"ok": True, "n_common": n_common, "bins": bins, "qwk": None}
-
-    K = bins
-    O = [[0]*K for _ in range(K)]
-    for a,b in gold:
-        O[a][b] += 1
-
-    W = [[((i-j)**2)/((K-1)**2) for j in range(K)] for i in range(K)]
-    N = float(n_common)
-    row_s = [sum(O[i][j] for j in range(K)) for i in range(K)]
-    col_s = [sum(O[i][j] for i in range(K)) for j in range(K)]
-
-    Po = 1.0 - sum(W[i][j]*O[i][j] for i in range(K) for j in range(K))/N
-    Pe = 1.0 - sum(W[i][j]*(row_s[i]*col_s[j]/(N*N)) for i in range(K) for j in range(K))
-
-    kappa = None
-    den = (1.0 - Pe)
-    if den != 0:
-        kappa = (Po - Pe)/den
-
-    return {"ok": True, "n_common": n_common, "bins": bins, "qwk": kappa}
+    # Οι βαθμοί είναι αποθηκευμένοι σε levels των 0.05· το binning γίνεται πάνω στο level
+    n_common, kappa = pair_qwk(session, rater_a, rater_b, bins)
+    return {"ok": True, "n_common": n_common, "bins": bins, "qwk": kappa, "raters": [rater_a, rater_b]}
 
 # ---------------------------------------------------------------------
-# Recompute-final (προαιρετικά μόνο για attempt)
+# Recompute-final (προαιρετικά μόνο για attempt / category)
 # ---------------------------------------------------------------------
 @router.post("/recompute-final")
 def recompute_final(
-    human_weight: float = Query(0.6, ge=0.0, le=1.0),
+    human_weight: Optional[float] = Query(
+        None, ge=0.0, le=1.0,
+        description="αν δοθεί, αποθηκεύεται στο final_score_config (ισχύει και για τα triggers)",
+    ),
     bins: int = Query(5, ge=2, le=10),
     attempt: Optional[int] = Query(None, ge=1, le=2),
+    category: Optional[str] = None,
+    chunk_size: Optional[int] = Query(None, ge=100, description="για πολύ μεγάλους πίνακες: commit ανά chunk"),
     session: Session = Depends(get_session),
 ):
-    flags = ensure_schema(session)
-    has_hw = flags.get("has_human_weighted", False)
-
-    base_sql = """
-        SELECT a.answer_id,
-               (SELECT llm_score FROM llm_scores WHERE answer_id=a.answer_id) AS llm,
-               (SELECT score FROM human_ratings WHERE answer_id=a.answer_id AND rater_id='teacher01') AS t1,
-               (SELECT score FROM human_ratings WHERE answer_id=a.answer_id AND rater_id='teacher02') AS t2
-        FROM answers a
-    """
-    params: Dict[str, Any] = {}
-    if attempt in (1, 2):
-        base_sql += " WHERE a.answer_id IN (SELECT answer_id FROM interaction WHERE attempt_no=:att)"
-        params["att"] = attempt
-
-    answers = session.execute(text(base_sql), params).mappings().all()
-
-    updated = 0
-    for r in answers:
-        aid_val = r.get("answer_id")
-        if not aid_val:
-            continue
-
-        aid = str(aid_val)
-        llm = clamp01(r.get("llm"))
-        t1  = clamp01(r.get("t1"))
-        t2  = clamp01(r.get("t2"))
-
-        cnt = (0 if t1 is None else 1) + (0 if t2 is None else 1)
-        human_avg = None if cnt == 0 else ((0.0 if t1 is None else t1) + (0.0 if t2 is None else t2)) / cnt
-        human_weighted = human_avg
-
-        auto = 0.0 if llm is None else llm
-        hw   = 0.0 if human_weighted is None else human_weighted
-        final = (1.0 - human_weight) * auto + human_weight * hw
-
-        if has_hw:
-            sql = text("""
-                INSERT INTO final_scores (
-                    answer_id, user_id, question_id, category, qtype,
-                    llm_score, teacher01, teacher02, human_avg, human_weighted, final_score, completed_at
-                )
-                SELECT
-                    a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
-                    :llm, :t1, :t2, :hav, :hw, :final, now()
-                FROM answers a
-                WHERE a.answer_id = :aid
-                ON CONFLICT (answer_id) DO UPDATE
-                  SET user_id        = EXCLUDED.user_id,
-                      question_id    = EXCLUDED.question_id,
-                      category       = EXCLUDED.category,
-                      qtype          = EXCLUDED.qtype,
-                      llm_score      = EXCLUDED.llm_score,
-                      teacher01      = EXCLUDED.teacher01,
-                      teacher02      = EXCLUDED.teacher02,
-                      human_avg      = EXCLUDED.human_avg,
-                      human_weighted = EXCLUDED.human_weighted,
-                      final_score    = EXCLUDED.final_score,
-                      completed_at   = now()
-            """)
-            params_up = {"llm": llm, "t1": t1, "t2": t2, "hav": human_avg, "hw": human_weighted, "final": final, "aid": aid}
-        else:
-            sql = text("""
-                INSERT INTO final_scores (
-                    answer_id, user_id, question_id, category, qtype,
-                    llm_score, teacher01, teacher02, human_avg, final_score, completed_at
-                )
-                SELECT
-                    a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
-                    :llm, :t1, :t2, :hav, :final, now()
-                FROM answers a
-                WHERE a.answer_id = :aid
-                ON CONFLICT (answer_id) DO UPDATE
-                  SET user_id       = EXCLUDED.user_id,
-                      question_id   = EXCLUDED.question_id,
-                      category      = EXCLUDED.category,
-                      qtype         = EXCLUDED.qtype,
-                      llm_score     = EXCLUDED.llm_score,
-                      teacher01     = EXCLUDED.teacher01,
-                      teacher02     = EXCLUDED.teacher02,
-                      human_avg     = EXCLUDED.human_avg,
-                      final_score   = EXCLUDED.final_score,
-                      completed_at  = now()
-            """)
-            params_up = {"llm": llm, "t1": t1, "t2": t2, "hav": human_avg, "final": final, "aid": aid}
-
-        session.execute(sql, params_up)
-        updated += 1
+    if human_weight is not None:
+        set_human_weight(session, human_weight)
+        session.commit()
 
+    res = recompute_final_scores(
+        session,
+        attempt=attempt,
+        category=category,
+        chunk_size=chunk_size,
+    )
     session.commit()
 
-    m = metrics(bins=bins, session=session)  # type: ignore
+    m = metrics(bins=bins, rater_a="teacher01", rater_b="teacher02", session=session)  # type: ignore
     return {
         "ok": True,
-        "updated": updated,
+        "updated": res["rows_changed"],
+        "rows_changed": res["rows_changed"],
+        "chunks": res["chunks"],
+        "elapsed_ms": res["elapsed_ms"],
         "qwk": m.get("qwk") if isinstance(m, dict) else None,
         "bins": bins,
-        "human_weight": human_weight,
+        "human_weight": get_human_weight(session),
     }
 
+# ---------------------------------------------------------------------
+# Raters registry
+# ---------------------------------------------------------------------
+class RaterPayload(BaseModel):
+    raterId: str = Field(..., pattern=RATER_ID_PATTERN)
+    displayName: Optional[str] = None
+    active: bool = True
+
+@router.get("/raters")
+def list_raters(session: Session = Depends(get_session)):
+    rows = session.execute(text("""
+        SELECT r.rater_id, r.display_name, r.active, r.created_at,
+               COUNT(h.answer_id) AS n_ratings
+        FROM raters r
+        LEFT JOIN human_ratings h USING (rater_id)
+        GROUP BY r.rater_id
+        ORDER BY r.rater_id
+    """)).mappings().all()
+    return {"items": [dict(r) for r in rows]}
+
+@router.post("/raters")
+def upsert_rater(p: RaterPayload, session: Session = Depends(get_session)):
+    session.execute(text("""
+        INSERT INTO raters (rater_id, display_name, active)
+        VALUES (:rid, :name, :active)
+        ON CONFLICT (rater_id) DO UPDATE
+          SET display_name = COALESCE(EXCLUDED.display_name, raters.display_name),
+              active       = EXCLUDED.active
+    """), {"rid": p.raterId, "name": p.displayName, "active": p.active})
+    session.commit()
+    return {"ok": True, "raterId": p.raterId, "active": p.active}
+
 # ---------------------------------------------------------------------
 # Summary
 # ---------------------------------------------------------------------
-def _summary_for_rater(session: Session, rid: Literal["teacher01","teacher02"]) -> Dict[str, Any]:
+def _summary_for_rater(session: Session, rid: str) -> Dict[str, Any]:
     row = session.execute(text("""
         WITH hh AS (
           SELECT answer_id, score, rated_at
@@ -496,27 +396,72 @@ def _summary_for_rater(session: Session, rid: Literal["teacher01","teacher02"])
         "last_at": row.get("last_at"),
     }
 
+SUMMARY_TABLES = ("answers", "llm_scores", "human_ratings", "raters")
+
+
 @router.get("/summary")
 def rater_summary(
-    rater_id: Optional[str] = Query(None, description="teacher01 | teacher02 (προαιρετικό)"),
+    request: Request,
+    rater_id: Optional[str] = Query(None, description="π.χ. teacher01 (προαιρετικό)"),
     session: Session = Depends(get_session),
 ):
+    if rater_id and not re.match(RATER_ID_PATTERN, rater_id):
+        raise HTTPException(status_code=400, detail="invalid rater_id")
+    return cached_json(request, session, SUMMARY_TABLES, lambda: _rater_summary(session, rater_id))
+
+
+def _rater_summary(session: Session, rater_id: Optional[str]) -> Dict[str, Any]:
     if rater_id:
-        if rater_id not in ("teacher01", "teacher02"):
-            raise HTTPException(status_code=400, detail="invalid rater_id")
         return _summary_for_rater(session, rater_id)
     else:
-        items = [
-            _summary_for_rater(session, "teacher01"),
-            _summary_for_rater(session, "teacher02"),
-        ]
+        rids = [r[0] for r in session.execute(text(
+            "SELECT rater_id FROM raters WHERE active ORDER BY rater_id"
+        )).all()]
+        items = [_summary_for_rater(session, rid) for rid in rids]
         return {"items": items}
 
 # ---------------------------------------------------------------------
 # Export CSV
 # ---------------------------------------------------------------------
-@router.get("/results.csv")
-def export_results_csv(session: Session = Depends(get_session)):
+# Το schema (interaction / human_ratings.rated_at) δεν αλλάζει όσο τρέχει το
+# process: probe μία φορά αντί για 2 information_schema queries ανά export.
+_RESULTS_SCHEMA: Optional[Dict[str, bool]] = None
+
+def _results_schema(session: Session) -> Dict[str, bool]:
+    global _RESULTS_SCHEMA
+    if _RESULTS_SCHEMA is None:
+        row = session.execute(text("""
+            SELECT
+              EXISTS (SELECT 1 FROM information_schema.tables
+                      WHERE table_schema='public' AND table_name='interaction') AS has_interaction,
+              EXISTS (SELECT 1 FROM information_schema.columns
+                      WHERE table_schema='public' AND table_name='human_ratings'
+                        AND column_name='rated_at') AS has_rated_at_hh
+        """)).mappings().first()
+        _RESULTS_SCHEMA = {
+            "has_interaction": bool(row["has_interaction"]),
+            "has_rated_at_hh": bool(row["has_rated_at_hh"]),
+        }
+    return _RESULTS_SCHEMA
+
+RESULTS_HEADER = [
+    "Α/Α",
+    "User",
+    "Answer ID",
+    "Attempt",
+    "Question",
+    "Category",
+    "Type",
+    "LLM Score (0–10)",
+    "Teacher 1 (0–10)",
+    "Teacher 2 (0–10)",
+    "Human Avg (0–10)",
+    "Human Weighted (0–10)",
+    "Final Score (0–10)",
+    "Διαφορά (Human–LLM, 0–10)",
+]
+
+def results_csv_export(session: Session) -> Iterator[bytes]:
     """
     Εξάγει CSV με ΟΛΕΣ τις απαντήσεις (open + MC), με:
     - LLM score
@@ -524,27 +469,11 @@ def export_results_csv(session: Session = Depends(get_session)):
     - Human Avg / Human Weighted
     - Final score (συνδυασμός LLM + Human όταν υπάρχουν, αλλιώς μόνο LLM)
     - Attempt, RatedAt ανά rater, Ημερομηνία
+    Streaming (server-side cursor): σταθερή μνήμη για οποιοδήποτε πλήθος γραμμών.
     """
-    import csv, io, datetime
-    from sqlalchemy import text
-
-    # ---- helpers: τι υπάρχει στο schema;
-    def table_exists(name: str) -> bool:
-        row = session.execute(text("""
-            SELECT 1 FROM information_schema.tables
-            WHERE table_schema='public' AND table_name=:t
-        """), {"t": name}).first()
-        return bool(row)
-
-    def column_exists(table: str, col: str) -> bool:
-        row = session.execute(text("""
-            SELECT 1 FROM information_schema.columns
-            WHERE table_schema='public' AND table_name=:t AND column_name=:c
-        """), {"t": table, "c": col}).first()
-        return bool(row)
-
-    has_interaction = table_exists("interaction")
-    has_rated_at_hh = column_exists("human_ratings", "rated_at")
+    flags = _results_schema(session)
+    has_interaction = flags["has_interaction"]
+    has_rated_at_hh = flags["has_rated_at_hh"]
 
     # ---- CTEs για attempt & rated_at (αν υπάρχουν)
     ctes = []
@@ -585,52 +514,36 @@ def export_results_csv(session: Session = Depends(get_session)):
           a.question_id,
           a.category,
           a.qtype,
-          COALESCE(f.llm_score, l.llm_score) AS llm_score,
-          (SELECT score FROM human_ratings
-             WHERE answer_id = a.answer_id AND rater_id = 'teacher01') AS teacher01,
-          (SELECT score FROM human_ratings
-             WHERE answer_id = a.answer_id AND rater_id = 'teacher02') AS teacher02,
-          f.human_avg,
-          f.human_weighted,
-          f.final_score,
+          s.llm AS llm_score,
+          g.scores[array_position(g.rater_ids, 'teacher01')] AS teacher01,
+          g.scores[array_position(g.rater_ids, 'teacher02')] AS teacher02,
+          s.havg AS human_avg,
+          _fuse_final(s.llm, s.havg, :w) AS final_score,
           a.created_at
           {", att.attempt" if has_interaction else ""}
           {", r1.rated_at AS rated_at_t1, r2.rated_at AS rated_at_t2" if has_rated_at_hh else ""}
         FROM answers a
         LEFT JOIN llm_scores   l USING(answer_id)
         LEFT JOIN final_scores f USING(answer_id)
+        LEFT JOIN rating_aggregates g USING(answer_id)
+        CROSS JOIN LATERAL (
+          -- ίδιο clamp (NULL μένει NULL) με το rollup (_clamp01, migration 7c1e4b9a2d30)
+          SELECT _clamp01(COALESCE(f.llm_score, l.llm_score)) AS llm,
+                 g.mean AS havg
+        ) s
         { "LEFT JOIN att   ON att.aid_text = a.answer_id::text" if has_interaction else "" }
         { "LEFT JOIN last_r1 r1 ON r1.aid_text = a.answer_id::text" if has_rated_at_hh else "" }
         { "LEFT JOIN last_r2 r2 ON r2.aid_text = a.answer_id::text" if has_rated_at_hh else "" }
         ORDER BY a.user_id, a.question_id
     """
 
-    rows = session.execute(text(sql)).mappings().all()
-
-    # ---- CSV
-    buf = io.StringIO()
-    writer = csv.writer(buf, delimiter=';', quoting=csv.QUOTE_MINIMAL)
-
-    headers = [
-        "Α/Α",
-        "User",
-        "Answer ID",
-        "Attempt",
-        "Question",
-        "Category",
-        "Type",
-        "LLM Score (0–10)",
-        "Teacher 1 (0–10)",
-        "Teacher 2 (0–10)",
-        "Human Avg (0–10)",
-        "Human Weighted (0–10)",
-        "Final Score (0–10)",
-        "Διαφορά (Human–LLM, 0–10)",
-    ]
+    headers = list(RESULTS_HEADER)
     if has_rated_at_hh:
         headers += ["RatedAt T1", "RatedAt T2"]
     headers.append("Ημερομηνία")
-    writer.writerow(headers)
+
+    # ίδιο βάρος/τύπος με τα triggers (final_score_config + _fuse_final)
+    params = {"w": get_human_weight(session)}
 
     def f10(x):
         if x is None:
@@ -641,71 +554,55 @@ def export_results_csv(session: Session = Depends(get_session)):
             return ""
 
     def fmt_dt(dt):
-        if isinstance(dt, datetime.datetime):
+        if isinstance(dt, datetime):
             return dt.strftime("%d/%m/%Y %H:%M")
         return ""
 
-    HUMAN_WEIGHT = 0.6  # ίδιο με _recompute_for / recompute-final
-
-    for i, r in enumerate(rows, start=1):
-        llm = r.get("llm_score")
-        t1  = r.get("teacher01")
-        t2  = r.get("teacher02")
-
-        # --- clamp & mean όπως στα helpers
-        llm_c = clamp01(llm)
-        t1_c  = clamp01(t1)
-        t2_c  = clamp01(t2)
-
-        # human_avg = μέσος T1/T2 αν υπάρχουν
-        human_vals = []
-        if t1_c is not None:
-            human_vals.append(t1_c)
-        if t2_c is not None:
-            human_vals.append(t2_c)
-        human_avg = sum(human_vals)/len(human_vals) if human_vals else None
-
-        # human_weighted = ίδιο με human_avg (προς το παρόν)
-        human_weighted = human_avg
-
-        # final_score: αν υπάρχουν ανθρώπινα → fusion, αλλιώς μόνο LLM
-        if human_avg is not None and llm_c is not None:
-            auto = llm_c
-            hw   = human_weighted
-            final = (1.0 - HUMAN_WEIGHT) * auto + HUMAN_WEIGHT * hw
-        elif human_avg is not None:
-            final = human_avg
-        else:
-            final = llm_c
-
-        # diff (Human–LLM) σε 0–10
-        diff = ""
-        if human_avg is not None and llm_c is not None:
-            try:
-                diff = f"{(float(human_avg)-float(llm_c))*10:.3f}".replace('.', ',')
-            except Exception:
-                diff = ""
-
-        row = [
-            i,
-            r.get("user_id"),
-            r.get("answer_id"),
-            r.get("attempt") if has_interaction else "",
-            r.get("question_id"),
-            r.get("category"),
-            r.get("qtype"),
-            f10(llm_c),
-            f10(t1_c),
-            f10(t2_c),
-            f10(human_avg),
-            f10(human_weighted),
-            f10(final),
-            diff,
-        ]
-        if has_rated_at_hh:
-            row += [fmt_dt(r.get("rated_at_t1")), fmt_dt(r.get("rated_at_t2"))]
-        row.append(fmt_dt(r.get("created_at")))
-        writer.writerow(row)
-
-    csv_bytes = ("\ufeff" + buf.getvalue()).encode("utf-8")  # BOM για Excel/Greek
-    return Response(content=csv_bytes, media_type="text/csv; charset=utf-8")
\ No newline at end of file
+    def rows():
+        for i, r in enumerate(stream_query(sql, params), start=1):
+            # clamp / human_avg / fusion γίνονται ήδη στη SQL
+            llm_c     = clamp01(r.get("llm_score"))
+            t1_c      = clamp01(r.get("teacher01"))
+            t2_c      = clamp01(r.get("teacher02"))
+            human_avg = clamp01(r.get("human_avg"))
+            final     = clamp01(r.get("final_score"))
+
+            # human_weighted = ίδιο με human_avg (προς το παρόν)
+            human_weighted = human_avg
+
+            # diff (Human–LLM) σε 0–10
+            diff = ""
+            if human_avg is not None and llm_c is not None:
+                try:
+                    diff = f"{(float(human_avg)-float(llm_c))*10:.3f}".replace('.', ',')
+                except Exception:
+                    diff = ""
+
+            row = [
+                i,
+                r.get("user_id"),
+                r.get("answer_id"),
+                r.get("attempt") if has_interaction else "",
+                r.get("question_id"),
+                r.get("category"),
+                r.get("qtype"),
+                f10(llm_c),
+                f10(t1_c),
+                f10(t2_c),
+                f10(human_avg),
+                f10(human_weighted),
+                f10(final),
+                diff,
+            ]
+            if has_rated_at_hh:
+                row += [fmt_dt(r.get("rated_at_t1")), fmt_dt(r.get("rated_at_t2"))]
+            row.append(fmt_dt(r.get("created_at")))
+            yield row
+
+    # BOM + ';' + δεκαδικό κόμμα για Excel/Greek
+    return csv_chunks(headers, rows(), dialect=EXCEL_GR)
+
+
+@router.get("/results.csv")
+def export_results_csv(session: Session = Depends(get_session)):
+    return csv_response(results_csv_export(session))
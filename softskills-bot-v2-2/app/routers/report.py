@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlmodel import Session, select
-from sqlalchemy import text
+from sqlalchemy import func, select as sa_select, text
 from typing import Dict, List, Optional, Tuple, Any
 from statistics import mean
 from datetime import datetime, timedelta
 
 from app.core.db import get_session
+from app.core.evaluation_rollup import has_rollup
+from app.core.http_cache import cached_json
+from app.core.overview import SORT_PATTERN, overview_row, overview_stmt
 from app.models.db_models import Interaction, AutoRating, HumanRating
 
 router = APIRouter(prefix="/report", tags=["report"])
@@ -20,11 +23,21 @@ def _safe_mean(values: List[float]) -> Optional[float]:
 # 🔹 PART A — Existing Reports (Interactions / Ratings)
 # ==============================================================
 
+# πίνακες που διαβάζει κάθε report (watermark για ETag / cache)
+RATING_TABLES = ("interaction", "autorating", "humanrating")
+EVALUATION_TABLES = ("evaluation",)
+
+
 @router.get("/user")
 def report_user(
+    request: Request,
     user_id: str = Query(..., description="User (participant) id"),
     session: Session = Depends(get_session)
 ):
+    return cached_json(request, session, RATING_TABLES, lambda: _report_user(session, user_id))
+
+
+def _report_user(session: Session, user_id: str) -> Dict[str, Any]:
     # Interactions by user
     inters = session.exec(
         select(Interaction.answer_id, Interaction.category).where(Interaction.user_id == user_id)
@@ -103,15 +116,54 @@ def report_user(
 
 
 @router.get("/overview")
-def report_overview(session: Session = Depends(get_session)):
-    users = session.exec(select(Interaction.user_id).where(Interaction.user_id.is_not(None))).all()
-    user_ids = sorted({u for u in users if u})
-
-    overview = []
-    for uid in user_ids:
-        cnt = session.exec(select(Interaction).where(Interaction.user_id == uid)).all()
-        overview.append({"user_id": uid, "n_interactions": len(cnt)})
-    return {"users": overview}
+def report_overview(
+    request: Request,
+    category: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    sort: str = Query("user_id", pattern=SORT_PATTERN),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+):
+    return cached_json(request, session, RATING_TABLES, lambda: _report_overview(
+        session, category, date_from, date_to, sort, order, limit, offset,
+    ))
+
+
+def _report_overview(
+    session: Session,
+    category: Optional[str],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    sort: str,
+    order: str,
+    limit: int,
+    offset: int,
+) -> Dict[str, Any]:
+    # ένα grouped query για όλη τη σελίδα (total μέσω COUNT(*) OVER ())
+    stmt = overview_stmt(
+        category=category, date_from=date_from, date_to=date_to,
+        sort=sort, order=order, limit=limit, offset=offset, with_total=True,
+    )
+    rows = session.execute(stmt).mappings().all()
+    if rows:
+        total = int(rows[0]["total"])
+    else:
+        # σελίδα πέρα από το τέλος: χρειαζόμαστε ακόμα το total
+        total = session.execute(
+            sa_select(func.count()).select_from(overview_stmt(
+                category=category, date_from=date_from, date_to=date_to,
+            ).order_by(None).subquery())
+        ).scalar_one()
+    return {
+        "users": [overview_row(r) for r in rows],
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + len(rows) if offset + len(rows) < total else None,
+    }
 
 
 # ==============================================================
@@ -122,41 +174,66 @@ def _days_ago(days: int) -> datetime:
     return datetime.utcnow() - timedelta(days=max(0, days))
 
 
+def _today() -> str:
+    # τα "τελευταίες N ημέρες" αλλάζουν με την ημέρα, όχι μόνο με τα δεδομένα
+    return datetime.utcnow().date().isoformat()
+
+
+def _iso(v: Any) -> Optional[str]:
+    # PostgreSQL → datetime, SQLite (raw text()) → string
+    if v is None:
+        return None
+    return v.isoformat() + "Z" if isinstance(v, datetime) else str(v)
+
+
+# Τα aggregates διαβάζονται από το evaluation_daily (rollup ανά user/category/ημέρα,
+# συντηρείται από triggers). Το παράθυρο "days" πιάνει ολόκληρες ημέρες (UTC).
+# Χωρίς rollup (SQLite / create_all) → τα *_direct queries πάνω στο result JSON.
+_DIMS = (
+    ("Knowledge_Decision", "kd"),
+    ("Content_Structure", "cs"),
+    ("Delivery_Presence", "dp"),
+)
+
+
 @router.get("/evaluation-overview")
 def evaluation_overview(
+    request: Request,
     days: int = Query(7, ge=1, le=365),
     session: Session = Depends(get_session),
 ):
-    since = _days_ago(days)
+    return cached_json(request, session, EVALUATION_TABLES, lambda: _evaluation_overview(session, days),
+                       extra_key=_today())
 
-    total = session.exec("""
-        SELECT COUNT(*)::int
-        FROM evaluation
-        WHERE created_at >= :since
-    """, params={"since": since}).one()[0]
 
-    per_category = session.exec("""
-        SELECT category, COUNT(*)::int
-        FROM evaluation
-        WHERE created_at >= :since
+def _evaluation_overview(session: Session, days: int) -> Dict[str, Any]:
+    if not has_rollup(session):
+        return _evaluation_overview_direct(session, days)
+    since = _days_ago(days)
+
+    per_category = session.execute(text("""
+        SELECT category, SUM(n)::int AS n
+        FROM evaluation_daily
+        WHERE day >= CAST(:since AS date)
         GROUP BY category
-        ORDER BY COUNT(*) DESC
-    """, params={"since": since}).all()
+        ORDER BY n DESC
+    """), {"since": since}).all()
     per_category = [{"category": r[0], "count": r[1]} for r in per_category]
 
-    per_label = session.exec("""
-        SELECT COALESCE(result->>'label','') AS label, COUNT(*)::int
-        FROM evaluation
-        WHERE created_at >= :since
-        GROUP BY label
-        ORDER BY COUNT(*) DESC
-    """, params={"since": since}).all()
+    per_label = session.execute(text("""
+        SELECT l.key AS label, SUM(l.value::int)::int AS n
+        FROM evaluation_daily d
+        CROSS JOIN LATERAL jsonb_each_text(d.label_counts) l
+        WHERE d.day >= CAST(:since AS date)
+        GROUP BY l.key
+        ORDER BY n DESC
+    """), {"since": since}).all()
     per_label = [{"label": r[0], "count": r[1]} for r in per_label]
 
     return {
         "since": since.isoformat() + "Z",
         "days": days,
-        "total": total,
+        "total": sum(c["count"] for c in per_category),
         "by_category": per_category,
         "by_label": per_label,
     }
@@ -164,17 +241,30 @@ def evaluation_overview(
 
 @router.get("/evaluation-user/{user_id}/summary")
 def evaluation_user_summary(
+    request: Request,
     user_id: str,
     days: int = Query(90, ge=1, le=365),
     session: Session = Depends(get_session),
 ):
+    return cached_json(request, session, EVALUATION_TABLES,
+                       lambda: _evaluation_user_summary(session, user_id, days), extra_key=_today())
+
+
+def _evaluation_user_summary(session: Session, user_id: str, days: int) -> Dict[str, Any]:
+    if not has_rollup(session):
+        return _evaluation_user_summary_direct(session, user_id, days)
     since = _days_ago(days)
 
-    total = session.exec("""
-        SELECT COUNT(*)::int
-        FROM evaluation
-        WHERE user_id = :uid AND created_at >= :since
-    """, params={"uid": user_id, "since": since}).one()[0]
+    agg = session.execute(text("""
+        SELECT COALESCE(SUM(n), 0)::int                       AS total,
+               SUM(score_sum) / NULLIF(SUM(score_n), 0)       AS avg_score,
+               SUM(kd_sum) / NULLIF(SUM(kd_n), 0)             AS kd,
+               SUM(cs_sum) / NULLIF(SUM(cs_n), 0)             AS cs,
+               SUM(dp_sum) / NULLIF(SUM(dp_n), 0)             AS dp
+        FROM evaluation_daily
+        WHERE user_id = :uid AND day >= CAST(:since AS date)
+    """), {"uid": user_id, "since": since}).mappings().one()
+    total = agg["total"]
 
     if total == 0:
         return {
@@ -187,34 +277,18 @@ def evaluation_user_summary(
             "last": None,
         }
 
-    avg_score = session.exec("""
-        SELECT AVG( (result->>'score')::float )
-        FROM evaluation
-        WHERE user_id = :uid AND created_at >= :since
-    """, params={"uid": user_id, "since": since}).one()[0]
-
-    dims = session.exec("""
-        SELECT
-          AVG( (result->'dimensions'->'Knowledge_Decision'->>'score')::float ),
-          AVG( (result->'dimensions'->'Content_Structure'->>'score')::float ),
-          AVG( (result->'dimensions'->'Delivery_Presence'->>'score')::float )
-        FROM evaluation
-        WHERE user_id = :uid AND created_at >= :since
-    """, params={"uid": user_id, "since": since}).one()
-
     avg_dims = {
-        "Knowledge_Decision": round(dims[0], 2) if dims[0] is not None else None,
-        "Content_Structure":  round(dims[1], 2) if dims[1] is not None else None,
-        "Delivery_Presence":  round(dims[2], 2) if dims[2] is not None else None,
+        name: round(agg[col], 2) if agg[col] is not None else None
+        for name, col in _DIMS
     }
 
-    last_row = session.exec("""
-        SELECT id, result->>'label', category, created_at
-        FROM evaluation
-        WHERE user_id = :uid AND created_at >= :since
-        ORDER BY created_at DESC
+    last_row = session.execute(text("""
+        SELECT last_id, last_label, category, last_at
+        FROM evaluation_daily
+        WHERE user_id = :uid AND day >= CAST(:since AS date)
+        ORDER BY day DESC, last_at DESC
         LIMIT 1
-    """, params={"uid": user_id, "since": since}).one()
+    """), {"uid": user_id, "since": since}).one()
 
     last = {
         "id": last_row[0],
@@ -223,6 +297,7 @@ def evaluation_user_summary(
         "created_at": last_row[3].isoformat() + "Z",
     }
 
+    avg_score = agg["avg_score"]
     return {
         "user_id": user_id,
         "since": since.isoformat() + "Z",
@@ -236,28 +311,118 @@ def evaluation_user_summary(
 
 @router.get("/evaluation-user/{user_id}/timeline")
 def evaluation_user_timeline(
+    request: Request,
     user_id: str,
     limit: int = Query(50, ge=1, le=500),
     session: Session = Depends(get_session),
 ):
-    rows = session.exec("""
-        SELECT id,
-               created_at,
-               (result->>'score')::float AS score,
-               result->>'label' AS label,
-               category
+    return cached_json(request, session, EVALUATION_TABLES,
+                       lambda: _evaluation_user_timeline(session, user_id, limit))
+
+
+def _evaluation_user_timeline(session: Session, user_id: str, limit: int) -> Dict[str, Any]:
+    # typed στήλες → index-only scan στο idx_evaluation_user_created_typed
+    columns = "score, label" if has_rollup(session) else \
+        "CAST(result->>'score' AS FLOAT) AS score, result->>'label' AS label"
+    rows = session.execute(text(f"""
+        SELECT id, created_at, {columns}, category
         FROM evaluation
         WHERE user_id = :uid
         ORDER BY created_at DESC
         LIMIT :lim
-    """, params={"uid": user_id, "lim": limit}).all()
+    """), {"uid": user_id, "lim": limit}).all()
 
     data = [{
         "id": r[0],
-        "created_at": r[1].isoformat() + "Z",
+        "created_at": _iso(r[1]),
         "score": r[2],
         "label": r[3],
         "category": r[4],
     } for r in rows]
 
     return {"user_id": user_id, "limit": limit, "items": data}
+
+
+# ---------- Χωρίς evaluation_daily: απευθείας από το evaluation ----------
+def _evaluation_overview_direct(session: Session, days: int) -> Dict[str, Any]:
+    since = _days_ago(days)
+
+    per_category = session.execute(text("""
+        SELECT category, COUNT(*) AS n
+        FROM evaluation
+        WHERE created_at >= :since
+        GROUP BY category
+        ORDER BY n DESC
+    """), {"since": since}).all()
+    per_category = [{"category": r[0], "count": int(r[1])} for r in per_category]
+
+    per_label = session.execute(text("""
+        SELECT COALESCE(result->>'label', '') AS label, COUNT(*) AS n
+        FROM evaluation
+        WHERE created_at >= :since
+        GROUP BY COALESCE(result->>'label', '')
+        ORDER BY n DESC
+    """), {"since": since}).all()
+    per_label = [{"label": r[0], "count": int(r[1])} for r in per_label]
+
+    return {
+        "since": since.isoformat() + "Z",
+        "days": days,
+        "total": sum(c["count"] for c in per_category),
+        "by_category": per_category,
+        "by_label": per_label,
+    }
+
+
+def _evaluation_user_summary_direct(session: Session, user_id: str, days: int) -> Dict[str, Any]:
+    since = _days_ago(days)
+    params = {"uid": user_id, "since": since}
+
+    agg = session.execute(text("""
+        SELECT COUNT(*) AS total,
+               AVG(CAST(result->>'score' AS FLOAT)) AS avg_score,
+               AVG(CAST(result->'dimensions'->'Knowledge_Decision'->>'score' AS FLOAT)) AS kd,
+               AVG(CAST(result->'dimensions'->'Content_Structure'->>'score' AS FLOAT))  AS cs,
+               AVG(CAST(result->'dimensions'->'Delivery_Presence'->>'score' AS FLOAT))  AS dp
+        FROM evaluation
+        WHERE user_id = :uid AND created_at >= :since
+    """), params).mappings().one()
+    total = int(agg["total"] or 0)
+
+    if total == 0:
+        return {
+            "user_id": user_id,
+            "since": since.isoformat() + "Z",
+            "days": days,
+            "total": 0,
+            "avg_score": None,
+            "avg_dimensions": None,
+            "last": None,
+        }
+
+    last_row = session.execute(text("""
+        SELECT id, result->>'label', category, created_at
+        FROM evaluation
+        WHERE user_id = :uid AND created_at >= :since
+        ORDER BY created_at DESC
+        LIMIT 1
+    """), params).one()
+
+    avg_score = agg["avg_score"]
+    return {
+        "user_id": user_id,
+        "since": since.isoformat() + "Z",
+        "days": days,
+        "total": total,
+        "avg_score": round(avg_score, 2) if avg_score is not None else None,
+        "avg_dimensions": {
+            name: round(agg[col], 2) if agg[col] is not None else None
+            for name, col in _DIMS
+        },
+        "last": {
+            "id": last_row[0],
+            "label": last_row[1],
+            "category": last_row[2],
+            "created_at": _iso(last_row[3]),
+        },
+    }
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
-from sqlalchemy import text
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterator, List, Optional, Tuple, Set
 from statistics import mean
-import io, csv
+from datetime import datetime
 
 from app.core.db import get_session
+from app.core.overview import OVERVIEW_COLUMNS, SORT_PATTERN, overview_row, overview_stmt
+from app.core.export_stream import EXCEL_BOM, csv_chunks, csv_response, stream_query
 from app.models.db_models import Interaction, AutoRating, HumanRating
 
 router = APIRouter(prefix="/report", tags=["report-csv"])
@@ -92,74 +92,58 @@ def _aggregate_user(session: Session, user_id: str):
 
     return result, sorted(rater_ids), by_rater_means_by_cat
 
-@router.get("/user-csv")
-def report_user_csv(user_id: str = Query(...), session: Session = Depends(get_session)):
+USER_BASE_COLS = ["user_id", "category", "n_answers", "auto_mean", "human_mean", "delta_human_minus_auto", "agreement_within_0_5"]
+
+
+def user_csv_export(session: Session, user_id: str) -> Tuple[str, Iterator[bytes]]:
     data, rater_ids, by_rater_means_by_cat = _aggregate_user(session, user_id)
 
     # Dynamic columns for raters
-    base_cols = ["user_id", "category", "n_answers", "auto_mean", "human_mean", "delta_human_minus_auto", "agreement_within_0_5"]
     rater_cols = [f"rater_{rid}_mean" for rid in rater_ids]
-    cols = base_cols + rater_cols
-
-    # Prepare CSV in-memory with UTF-8 BOM for Excel
-    output = io.StringIO()
-    output.write("\ufeff")  # BOM
-    writer = csv.DictWriter(output, fieldnames=cols)
-    writer.writeheader()
-
-    for cat, vals in data.items():
-        row = {
-            "user_id": user_id,
-            "category": cat,
-            "n_answers": vals.get("n_answers"),
-            "auto_mean": vals.get("auto_mean"),
-            "human_mean": vals.get("human_mean"),
-            "delta_human_minus_auto": vals.get("delta_human_minus_auto"),
-            "agreement_within_0_5": vals.get("agreement_within_0_5"),
-        }
-        by_rater = by_rater_means_by_cat.get(cat, {})
-        for rid in rater_ids:
-            row[f"rater_{rid}_mean"] = by_rater.get(rid)
-        writer.writerow(row)
-
-    csv_bytes = output.getvalue().encode("utf-8")
-    filename = f"user_report_{user_id}.csv"
-    return StreamingResponse(
-        io.BytesIO(csv_bytes),
-        media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    cols = USER_BASE_COLS + rater_cols
+
+    def rows():
+        for cat, vals in data.items():
+            by_rater = by_rater_means_by_cat.get(cat, {})
+            yield [
+                user_id,
+                cat,
+                vals.get("n_answers"),
+                vals.get("auto_mean"),
+                vals.get("human_mean"),
+                vals.get("delta_human_minus_auto"),
+                vals.get("agreement_within_0_5"),
+            ] + [by_rater.get(rid) for rid in rater_ids]
+
+    # UTF-8 BOM για Excel
+    return f"user_report_{user_id}.csv", csv_chunks(cols, rows(), dialect=EXCEL_BOM)
+
+
+def overview_csv_export(
+    category: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    sort: str = "user_id",
+    order: str = "asc",
+) -> Tuple[str, Iterator[bytes]]:
+    # ίδιο grouped query με το /report/overview, streaming από server-side cursor
+    stmt = overview_stmt(category=category, date_from=date_from, date_to=date_to, sort=sort, order=order)
+    rows = (list(overview_row(r).values()) for r in stream_query(stmt))
+    return "overview_users.csv", csv_chunks(OVERVIEW_COLUMNS, rows, dialect=EXCEL_BOM)
 
-@router.get("/overview-csv")
-def report_overview_csv(session: Session = Depends(get_session)):
-    # users observed
-    users = session.exec(select(Interaction.user_id).where(Interaction.user_id.is_not(None))).all()
-    user_ids = sorted({u for u in users if u})
-
-    # counts
-    output = io.StringIO()
-    output.write("\ufeff")
-    writer = csv.DictWriter(output, fieldnames=["user_id", "n_interactions", "n_human_ratings", "n_auto_ratings"])
-    writer.writeheader()
-
-    for uid in user_ids:
-        inters = session.exec(select(Interaction.answer_id).where(Interaction.user_id == uid)).all()
-        ans_ids = {aid for aid in inters}
-        n_inter = len(ans_ids)
-
-        n_human = session.exec(select(HumanRating).where(HumanRating.answer_id.in_(ans_ids))).all()
-        n_auto = session.exec(select(AutoRating).where(AutoRating.answer_id.in_(ans_ids))).all()
-
-        writer.writerow({
-            "user_id": uid,
-            "n_interactions": n_inter,
-            "n_human_ratings": len(n_human),
-            "n_auto_ratings": len(n_auto),
-        })
 
-    csv_bytes = output.getvalue().encode("utf-8")
-    return StreamingResponse(
-        io.BytesIO(csv_bytes),
-        media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": "attachment; filename=overview_users.csv"}
-    )
+@router.get("/user-csv")
+def report_user_csv(user_id: str = Query(...), session: Session = Depends(get_session)):
+    filename, chunks = user_csv_export(session, user_id)
+    return csv_response(chunks, filename)
+
+@router.get("/overview-csv")
+def report_overview_csv(
+    category: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    sort: str = Query("user_id", pattern=SORT_PATTERN),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+):
+    filename, chunks = overview_csv_export(category, date_from, date_to, sort, order)
+    return csv_response(chunks, filename)
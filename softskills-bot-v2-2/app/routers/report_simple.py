@@ -1,9 +1,11 @@
 # app/routers/report_simple.py
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlmodel import Session, select
 from typing import List, Dict, Any
 
 from app.core.db import get_session
+from app.core.evaluation_rollup import has_rollup
 from app.models.evaluation import Evaluation
 
 
@@ -12,14 +14,36 @@ router = APIRouter(prefix="/report", tags=["report"])
 
 @router.get("/evaluation-user/{user_id}/summary")
 def user_summary(user_id: str, session: Session = Depends(get_session)):
-    # ORM/SQLModel query (ασφαλές για SQLAlchemy 2.x)
+    if not has_rollup(session):
+        return {"ok": True, "user_id": user_id, "items": _latest_per_category(session, user_id)}
+
+    # πιο πρόσφατο ανά category απευθείας από το rollup (PK: user_id, category, day)
+    rows = session.execute(text("""
+        SELECT DISTINCT ON (category)
+               last_id, last_question_id, category, last_score, last_label, last_at
+        FROM evaluation_daily
+        WHERE user_id = :uid
+        ORDER BY category, day DESC, last_at DESC
+    """), {"uid": user_id}).all()
+
+    items = [{
+        "id": r[0],
+        "question_id": r[1],
+        "category": r[2] or "unknown",
+        "score": r[3],
+        "label": r[4],
+        "created_at": r[5],
+    } for r in rows]
+
+    return {"ok": True, "user_id": user_id, "items": items}
+
+
+def _latest_per_category(session: Session, user_id: str) -> List[Dict[str, Any]]:
+    # χωρίς evaluation_daily (SQLite / create_all): ORM query σε όλο το evaluation
     evs: List[Evaluation] = session.exec(
         select(Evaluation).where(Evaluation.user_id == user_id)
     ).all()
 
-    if not evs:
-        return {"ok": True, "user_id": user_id, "items": []}
-
     # map -> flat summary items
     items: List[Dict[str, Any]] = []
     for e in evs:
@@ -45,4 +69,4 @@ def user_summary(user_id: str, session: Session = Depends(get_session)):
             if cb and (not ca or cb > ca):
                 latest[cat] = it
 
-    return {"ok": True, "user_id": user_id, "items": list(latest.values())}
+    return list(latest.values())
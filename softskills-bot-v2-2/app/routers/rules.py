@@ -8,6 +8,8 @@ from typing import Tuple
 
 from fastapi import APIRouter, HTTPException
 
+from app.core.tracing import span
+
 router = APIRouter(prefix="/rules", tags=["rules"])
 
 RULES_PATH = Path("app/rules/rules_v2.json")
@@ -36,12 +38,15 @@ def _load_from_file() -> Tuple[dict, str]:
 
 
 def load_rules() -> Tuple[dict, str]:
-    data, src = _load_from_env()
-    if data is not None:
+    with span("rules.load") as sp:
+        data, src = _load_from_env()
+        if data is None:
+            data, src = _load_from_file()
+        sp["source"] = src
+    if src == "env":
         print("[rules] loaded from ENV RULES_OVERRIDE_JSON")
-        return data, src
-    data, src = _load_from_file()
-    print(f"[rules] loaded from {src}")
+    else:
+        print(f"[rules] loaded from {src}")
     return data, src
 
 
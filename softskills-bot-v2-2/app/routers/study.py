@@ -1,8 +1,15 @@
 # app/routers/study.py
 from __future__ import annotations
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlmodel import Session
 import uuid
+from app.core.cohorts import MAX_COHORT, cohort_links, csv_chunks, default_ids, provision
+from app.core.db import get_session
+from app.core.export_stream import content_disposition
+from app.core.security import verify_api_key
 from app.core.study_token import make_token, parse_token
 from app.core.settings import settings
 
@@ -13,7 +20,7 @@ class MintResponse(BaseModel):
     token: str
     round2_link: str
 
-@router.get("/study/mint", response_model=MintResponse)
+@router.get("/study/mint", response_model=MintResponse, dependencies=[Depends(verify_api_key)])
 def study_mint(user_id: str = Query(..., alias="userId")):
     """
     Παίρνει το user_id του Γύρου-1 (αυτό που ήδη χρησιμοποιεί το UI)
@@ -39,3 +46,56 @@ class ResolveResponse(BaseModel):
 def study_resolve(token: str = Query(...)):
     pid = parse_token(token)
     return ResolveResponse(ok=bool(pid), participant_id=(str(pid) if pid else None))
+
+
+# ---------------------------------------------------------------------
+# Cohorts: χιλιάδες tokens + PRE/POST links σε ένα request (CSV ή JSON)
+# ---------------------------------------------------------------------
+class CohortRequest(BaseModel):
+    cohort_id: str = Field(..., min_length=1, max_length=64)
+    label: Optional[str] = None
+    count: Optional[int] = Field(None, ge=1, le=MAX_COHORT)
+    student_ids: Optional[List[str]] = None
+    base_url: Optional[str] = None
+
+def _links_response(cohort_id: str, rows: list, fmt: str):
+    if fmt == "json":
+        return {"cohort_id": cohort_id, "count": len(rows), "participants": rows}
+    return StreamingResponse(
+        csv_chunks(rows),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": content_disposition(f"cohort_{cohort_id}_links.csv")},
+    )
+
+@router.post("/study/cohorts", dependencies=[Depends(verify_api_key)])
+def study_cohort_create(
+    req: CohortRequest,
+    format: str = Query("csv", pattern="^(csv|json)$"),
+    session: Session = Depends(get_session),
+):
+    """
+    {"cohort_id": "2026A", "count": 300} ή {"cohort_id": "2026A", "student_ids": ["S01", ...]}.
+    Ξανατρέξιμο: υπάρχοντες συμμετέχοντες κρατούν το token τους.
+    """
+    if req.student_ids:
+        ids = [str(x).strip() for x in req.student_ids if str(x).strip()]
+    elif req.count:
+        ids = default_ids(req.count)
+    else:
+        raise HTTPException(status_code=400, detail="count or student_ids required")
+    if len(ids) > MAX_COHORT:
+        raise HTTPException(status_code=413, detail=f"max {MAX_COHORT} participants per call")
+
+    rows = provision(session, req.cohort_id, ids, base_url=req.base_url, label=req.label)
+    return _links_response(req.cohort_id, rows, format)
+
+@router.get("/study/cohorts/{cohort_id}/links", dependencies=[Depends(verify_api_key)])
+def study_cohort_links(
+    cohort_id: str,
+    format: str = Query("csv", pattern="^(csv|json)$"),
+    session: Session = Depends(get_session),
+):
+    rows = cohort_links(session, cohort_id)
+    if rows is None:
+        raise HTTPException(status_code=404, detail="unknown cohort")
+    return _links_response(cohort_id, rows, format)
@@ -0,0 +1,46 @@
+"""rater queue: keyset indexes
+
+Revision ID: 45025dc2ec5d
+Revises: 7c1e4b9a2d30
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '45025dc2ec5d'
+down_revision: Union[str, Sequence[str], None] = '7c1e4b9a2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # /rater/queue: ORDER BY (created_at, answer_id) DESC με keyset cursor
+    op.execute("""
+CREATE INDEX IF NOT EXISTS idx_answers_created_id
+  ON answers (created_at DESC, answer_id DESC);
+CREATE INDEX IF NOT EXISTS idx_answers_cat_created_id
+  ON answers (category, created_at DESC, answer_id DESC);
+CREATE INDEX IF NOT EXISTS idx_human_ratings_rater_answer
+  ON human_ratings (rater_id, answer_id);
+
+DO $$
+BEGIN
+  IF to_regclass('public.interaction') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_interaction_answer_attempt
+      ON interaction (answer_id, attempt_no);
+  END IF;
+END $$;
+    """)
+
+
+def downgrade():
+    op.execute("""
+DROP INDEX IF EXISTS idx_interaction_answer_attempt;
+DROP INDEX IF EXISTS idx_human_ratings_rater_answer;
+DROP INDEX IF EXISTS idx_answers_cat_created_id;
+DROP INDEX IF EXISTS idx_answers_created_id;
+    """)
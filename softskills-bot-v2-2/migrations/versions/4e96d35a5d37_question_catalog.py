@@ -0,0 +1,180 @@
+"""question_catalog: υλοποιημένος κατάλογος ερωτήσεων (id → text/category/qtype)
+
+Revision ID: 4e96d35a5d37
+Revises: 90baf8b452d3
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+import json
+from pathlib import Path
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e96d35a5d37'
+down_revision: Union[str, Sequence[str], None] = '90baf8b452d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Ίδιος φάκελος με το app.core.question_bank (DEFAULT_DIR)
+BANK_DIR = Path(__file__).resolve().parents[2] / "app" / "data" / "questions"
+
+
+def _bank_rows():
+    files = sorted(BANK_DIR.glob("questions_*.json"))
+    if not files:
+        return []
+    doc = json.loads(files[-1].read_text(encoding="utf-8"))
+    rows = {}
+    for phase in ("PRE", "POST"):
+        for category, by_type in (doc.get("phases", {}).get(phase) or {}).items():
+            for qtype, items in by_type.items():
+                for q in items:
+                    rows.setdefault(str(q["id"]), {
+                        "id": str(q["id"]), "text": q.get("text") or None,
+                        "category": category, "qtype": qtype,
+                    })
+    return list(rows.values())
+
+
+def upgrade():
+    op.execute("""
+CREATE TABLE IF NOT EXISTS question_catalog (
+  question_id    TEXT PRIMARY KEY,
+  text           TEXT,
+  category       TEXT NOT NULL DEFAULT '',
+  qtype          TEXT NOT NULL DEFAULT '',
+  source         TEXT NOT NULL DEFAULT 'answers',   -- 'bank' | 'answers'
+  first_seen_at  TIMESTAMPTZ,                       -- πρώτη απάντηση· NULL = μόνο στην τράπεζα
+  updated_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Νέες ερωτήσεις από τα answers: ένα πέρασμα ανά statement (όχι ανά γραμμή).
+-- Γράφει μόνο όταν εμφανίζεται νέο id ή αλλάζει το κείμενο/κατηγορία, ώστε
+-- τα συνηθισμένα INSERT απαντήσεων να μην ακυρώνουν το snapshot. Χωρίς
+-- ON CONFLICT DO UPDATE ... WHERE: εκείνο κλειδώνει τη γραμμή ακόμη κι όταν το
+-- WHERE βγει false, και θα σειριοποιούσε όλα τα answers της ίδιας ερώτησης.
+CREATE OR REPLACE FUNCTION _trg_question_catalog_from_answers()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+BEGIN
+  -- ένα statement: τα CTEs βλέπουν το ίδιο snapshot, οπότε το UPDATE πιάνει μόνο
+  -- υπάρχουσες γραμμές και το INSERT μόνο όσες λείπουν
+  WITH n AS (
+    SELECT DISTINCT ON (r.question_id)
+           r.question_id, NULLIF(r.prompt, '') AS text,
+           COALESCE(r.category, '') AS category, COALESCE(r.qtype, '') AS qtype,
+           COALESCE(r.created_at, now()) AS created_at
+    FROM new_rows r
+    WHERE r.question_id IS NOT NULL
+    ORDER BY r.question_id, r.created_at DESC
+  ), upd AS (
+    -- υπάρχουσες: UPDATE κλειδώνει μόνο τις γραμμές που όντως αλλάζουν
+    UPDATE question_catalog q
+       SET text          = COALESCE(n.text, q.text),
+           category      = n.category,
+           qtype         = n.qtype,
+           first_seen_at = COALESCE(q.first_seen_at, n.created_at),
+           updated_at    = now()
+      FROM n
+     WHERE q.question_id = n.question_id
+       AND (q.first_seen_at IS NULL
+            OR (n.text IS NOT NULL AND q.text IS DISTINCT FROM n.text)
+            OR q.category IS DISTINCT FROM n.category
+            OR q.qtype    IS DISTINCT FROM n.qtype)
+  )
+  -- νέες: μόνο όσες λείπουν (DO NOTHING για ταυτόχρονο insert του ίδιου id)
+  INSERT INTO question_catalog (question_id, text, category, qtype, source, first_seen_at, updated_at)
+  SELECT n.question_id, n.text, n.category, n.qtype, 'answers', n.created_at, now()
+  FROM n
+  WHERE NOT EXISTS (SELECT 1 FROM question_catalog q WHERE q.question_id = n.question_id)
+  ON CONFLICT (question_id) DO NOTHING;
+  RETURN NULL;
+END;
+$trg$;
+
+-- Σαν το _trg_bump_data_version, αλλά μόνο αν το statement άγγιξε γραμμές
+-- (το INSERT ... ON CONFLICT πυροδοτεί statement triggers και με 0 γραμμές).
+CREATE OR REPLACE FUNCTION _trg_bump_data_version_rows()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+BEGIN
+  IF EXISTS (SELECT 1 FROM changed_rows) THEN
+    INSERT INTO data_versions AS v (table_name, version, changed_at)
+    VALUES (TG_TABLE_NAME, 1, now())
+    ON CONFLICT (table_name) DO UPDATE
+      SET version = v.version + 1, changed_at = now();
+  END IF;
+  RETURN NULL;
+END;
+$trg$;
+
+DROP TRIGGER IF EXISTS trg_question_catalog_dv_ins ON question_catalog;
+DROP TRIGGER IF EXISTS trg_question_catalog_dv_upd ON question_catalog;
+DROP TRIGGER IF EXISTS trg_question_catalog_dv_del ON question_catalog;
+CREATE TRIGGER trg_question_catalog_dv_ins AFTER INSERT ON question_catalog
+  REFERENCING NEW TABLE AS changed_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION _trg_bump_data_version_rows();
+CREATE TRIGGER trg_question_catalog_dv_upd AFTER UPDATE ON question_catalog
+  REFERENCING NEW TABLE AS changed_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION _trg_bump_data_version_rows();
+CREATE TRIGGER trg_question_catalog_dv_del AFTER DELETE ON question_catalog
+  REFERENCING OLD TABLE AS changed_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION _trg_bump_data_version_rows();
+
+INSERT INTO data_versions (table_name) VALUES ('question_catalog') ON CONFLICT DO NOTHING;
+    """)
+
+    # Backfill: ένα και τελευταίο DISTINCT ON πάνω σε όλο το answers
+    op.execute("""
+DO $$
+BEGIN
+  IF to_regclass('public.answers') IS NOT NULL THEN
+    INSERT INTO question_catalog (question_id, text, category, qtype, source, first_seen_at)
+    SELECT DISTINCT ON (question_id)
+           question_id, NULLIF(prompt, ''), COALESCE(category, ''), COALESCE(qtype, ''),
+           'answers', created_at
+    FROM answers
+    WHERE question_id IS NOT NULL
+    ORDER BY question_id, created_at DESC
+    ON CONFLICT (question_id) DO NOTHING;
+
+    DROP TRIGGER IF EXISTS trg_answers_question_catalog ON answers;
+    CREATE TRIGGER trg_answers_question_catalog
+      AFTER INSERT ON answers
+      REFERENCING NEW TABLE AS new_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION _trg_question_catalog_from_answers();
+  END IF;
+END $$;
+    """)
+
+    # Seed από την τράπεζα: νέα ids + κείμενο όπου το answers.prompt ήταν κενό
+    rows = _bank_rows()
+    if rows:
+        op.get_bind().execute(sa.text("""
+            INSERT INTO question_catalog AS q (question_id, text, category, qtype, source)
+            VALUES (:id, :text, :category, :qtype, 'bank')
+            ON CONFLICT (question_id) DO UPDATE
+              SET text = EXCLUDED.text, updated_at = now()
+              WHERE q.text IS NULL AND EXCLUDED.text IS NOT NULL
+        """), rows)
+
+
+def downgrade():
+    op.execute("""
+DO $$
+BEGIN
+  IF to_regclass('public.answers') IS NOT NULL THEN
+    DROP TRIGGER IF EXISTS trg_answers_question_catalog ON answers;
+  END IF;
+END $$;
+DROP FUNCTION IF EXISTS _trg_question_catalog_from_answers();
+DROP TABLE IF EXISTS question_catalog;
+DROP FUNCTION IF EXISTS _trg_bump_data_version_rows();
+DELETE FROM data_versions WHERE table_name = 'question_catalog';
+    """)
@@ -0,0 +1,53 @@
+"""report overview: indexes για το grouped query ανά user
+
+Revision ID: 601091ad072d
+Revises: 9ba4fc8e0ae3
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '601091ad072d'
+down_revision: Union[str, Sequence[str], None] = '9ba4fc8e0ae3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # /report/overview(-csv): GROUP BY user_id με φίλτρα category / created_at,
+    # και per-answer προ-αθροίσματα σε autorating / humanrating
+    op.execute("""
+DO $$
+BEGIN
+  IF to_regclass('public.interaction') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_interaction_user_created
+      ON interaction (user_id, created_at);
+    CREATE INDEX IF NOT EXISTS idx_interaction_category_created
+      ON interaction (category, created_at);
+  END IF;
+  IF to_regclass('public.humanrating') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS idx_humanrating_answer
+      ON humanrating (answer_id);
+  END IF;
+  IF to_regclass('public.autorating') IS NOT NULL
+     AND EXISTS (SELECT 1 FROM information_schema.columns
+                 WHERE table_schema = 'public' AND table_name = 'autorating'
+                   AND column_name = 'answer_id') THEN
+    CREATE INDEX IF NOT EXISTS idx_autorating_answer
+      ON autorating (answer_id);
+  END IF;
+END $$;
+    """)
+
+
+def downgrade():
+    op.execute("""
+DROP INDEX IF EXISTS idx_autorating_answer;
+DROP INDEX IF EXISTS idx_humanrating_answer;
+DROP INDEX IF EXISTS idx_interaction_category_created;
+DROP INDEX IF EXISTS idx_interaction_user_created;
+    """)
@@ -0,0 +1,48 @@
+"""study_cohorts / study_participants: μαζική έκδοση study tokens ανά cohort
+
+Revision ID: 79f08069040d
+Revises: 4e96d35a5d37
+Create Date: 2026-10-19 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '79f08069040d'
+down_revision: Union[str, Sequence[str], None] = '4e96d35a5d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute("""
+CREATE TABLE IF NOT EXISTS study_cohorts (
+  cohort_id   TEXT PRIMARY KEY,
+  label       TEXT,
+  base_url    TEXT NOT NULL,
+  created_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- participant_id = uuid5(cohort, external_id) → ξανατρέξιμο χωρίς διπλότυπα
+CREATE TABLE IF NOT EXISTS study_participants (
+  participant_id  UUID PRIMARY KEY,
+  cohort_id       TEXT NOT NULL REFERENCES study_cohorts(cohort_id) ON DELETE CASCADE,
+  seq             INTEGER NOT NULL,
+  external_id     TEXT NOT NULL,
+  token           TEXT NOT NULL UNIQUE,
+  created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+  UNIQUE (cohort_id, external_id)
+);
+CREATE INDEX IF NOT EXISTS ix_study_participants_cohort_seq
+  ON study_participants (cohort_id, seq);
+    """)
+
+
+def downgrade():
+    op.execute("""
+DROP TABLE IF EXISTS study_participants;
+DROP TABLE IF EXISTS study_cohorts;
+    """)
@@ -0,0 +1,231 @@
+"""final scores: statement-level triggers, single fusion config
+
+Revision ID: 7c1e4b9a2d30
+Revises: 98db05c92c32
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b9a2d30'
+down_revision: Union[str, Sequence[str], None] = '98db05c92c32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Τα row-level triggers έκαναν ένα _recompute_final(aid) ανά γραμμή.
+    # Εδώ: statement-level triggers με transition tables → ένα set-based
+    # recompute για τα DISTINCT answer_ids κάθε statement.
+    # Το βάρος ανθρώπου / ο τύπος fusion ζουν μόνο στο final_score_config / _fuse_final.
+    op.execute("""
+ALTER TABLE final_scores ADD COLUMN IF NOT EXISTS human_weighted NUMERIC;
+
+CREATE TABLE IF NOT EXISTS final_score_config (
+  id           SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  human_weight NUMERIC(4,3) NOT NULL DEFAULT 0.6 CHECK (human_weight BETWEEN 0 AND 1),
+  updated_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO final_score_config (id, human_weight) VALUES (1, 0.6)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION _final_human_weight()
+RETURNS NUMERIC
+LANGUAGE sql STABLE
+AS $func$
+  SELECT COALESCE((SELECT human_weight FROM final_score_config WHERE id = 1), 0.6)
+$func$;
+
+-- clamp στο [0,1] που κρατά το NULL (το GREATEST αγνοεί τα NULL → θα έδινε 0)
+CREATE OR REPLACE FUNCTION _clamp01(x NUMERIC)
+RETURNS NUMERIC
+LANGUAGE sql IMMUTABLE
+AS $func$
+  SELECT CASE WHEN x IS NULL THEN NULL ELSE LEAST(GREATEST(x, 0), 1) END
+$func$;
+
+-- both → (1-w)*llm + w*human, μόνο human → human, μόνο llm → llm
+CREATE OR REPLACE FUNCTION _fuse_final(llm NUMERIC, human NUMERIC, w NUMERIC)
+RETURNS NUMERIC
+LANGUAGE sql IMMUTABLE
+AS $func$
+  SELECT CASE
+    WHEN llm IS NOT NULL AND human IS NOT NULL THEN (1 - w) * llm + w * human
+    WHEN human IS NOT NULL THEN human
+    ELSE llm
+  END
+$func$;
+
+-- set-based recompute για ένα σύνολο answer_ids, επιστρέφει rows changed
+CREATE OR REPLACE FUNCTION _recompute_final_set(ids UUID[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $func$
+DECLARE
+  w NUMERIC := _final_human_weight();
+  n INTEGER;
+BEGIN
+  WITH h AS (
+    SELECT answer_id,
+           _clamp01(MAX(score) FILTER (WHERE rater_id = 'teacher01')) AS t1,
+           _clamp01(MAX(score) FILTER (WHERE rater_id = 'teacher02')) AS t2
+    FROM human_ratings
+    WHERE answer_id = ANY(ids)
+    GROUP BY answer_id
+  ),
+  c AS (
+    SELECT a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
+           _clamp01(l.llm_score) AS llm,
+           h.t1, h.t2,
+           CASE WHEN h.t1 IS NULL AND h.t2 IS NULL THEN NULL
+                ELSE (COALESCE(h.t1, 0) + COALESCE(h.t2, 0))
+                     / ((h.t1 IS NOT NULL)::int + (h.t2 IS NOT NULL)::int)
+           END AS havg
+    FROM answers a
+    LEFT JOIN llm_scores l USING (answer_id)
+    LEFT JOIN h USING (answer_id)
+    WHERE a.answer_id = ANY(ids)
+  )
+  INSERT INTO final_scores AS f (
+    answer_id, user_id, question_id, category, qtype,
+    llm_score, teacher01, teacher02, human_avg, human_weighted, final_score, completed_at
+  )
+  SELECT answer_id, user_id, question_id, category, qtype,
+         llm, t1, t2, havg, havg, _fuse_final(llm, havg, w), now()
+  FROM c
+  ON CONFLICT (answer_id) DO UPDATE SET
+    user_id        = EXCLUDED.user_id,
+    question_id    = EXCLUDED.question_id,
+    category       = EXCLUDED.category,
+    qtype          = EXCLUDED.qtype,
+    llm_score      = EXCLUDED.llm_score,
+    teacher01      = EXCLUDED.teacher01,
+    teacher02      = EXCLUDED.teacher02,
+    human_avg      = EXCLUDED.human_avg,
+    human_weighted = EXCLUDED.human_weighted,
+    final_score    = EXCLUDED.final_score,
+    completed_at   = EXCLUDED.completed_at
+  WHERE (f.user_id, f.question_id, f.category, f.qtype, f.llm_score,
+         f.teacher01, f.teacher02, f.human_avg, f.human_weighted, f.final_score)
+        IS DISTINCT FROM
+        (EXCLUDED.user_id, EXCLUDED.question_id, EXCLUDED.category, EXCLUDED.qtype, EXCLUDED.llm_score,
+         EXCLUDED.teacher01, EXCLUDED.teacher02, EXCLUDED.human_avg, EXCLUDED.human_weighted, EXCLUDED.final_score);
+
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END;
+$func$;
+
+-- συμβατότητα: παλιό API ανά answer
+CREATE OR REPLACE FUNCTION _recompute_final(aid UUID)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $func$
+BEGIN
+  PERFORM _recompute_final_set(ARRAY[aid]);
+END;
+$func$;
+
+-- statement-level: ένα recompute για τα DISTINCT answer_ids του statement
+CREATE OR REPLACE FUNCTION _trg_final_from_transition()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM _recompute_final_set(ARRAY(SELECT DISTINCT answer_id FROM new_rows));
+  ELSIF TG_OP = 'UPDATE' THEN
+    PERFORM _recompute_final_set(ARRAY(
+      SELECT answer_id FROM new_rows UNION SELECT answer_id FROM old_rows
+    ));
+  ELSE
+    PERFORM _recompute_final_set(ARRAY(SELECT DISTINCT answer_id FROM old_rows));
+  END IF;
+  RETURN NULL;
+END;
+$trg$;
+
+-- παλιά row-level triggers
+DROP TRIGGER IF EXISTS trg_after_human_rating ON human_ratings;
+DROP TRIGGER IF EXISTS trg_after_llm_score ON llm_scores;
+DROP FUNCTION IF EXISTS _trg_after_human_rating();
+DROP FUNCTION IF EXISTS _trg_after_llm_score();
+
+-- transition tables → ένα trigger ανά event
+DROP TRIGGER IF EXISTS trg_human_ratings_ins ON human_ratings;
+CREATE TRIGGER trg_human_ratings_ins
+AFTER INSERT ON human_ratings
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_final_from_transition();
+
+DROP TRIGGER IF EXISTS trg_human_ratings_upd ON human_ratings;
+CREATE TRIGGER trg_human_ratings_upd
+AFTER UPDATE ON human_ratings
+REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_final_from_transition();
+
+DROP TRIGGER IF EXISTS trg_human_ratings_del ON human_ratings;
+CREATE TRIGGER trg_human_ratings_del
+AFTER DELETE ON human_ratings
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_final_from_transition();
+
+DROP TRIGGER IF EXISTS trg_llm_scores_ins ON llm_scores;
+CREATE TRIGGER trg_llm_scores_ins
+AFTER INSERT ON llm_scores
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_final_from_transition();
+
+DROP TRIGGER IF EXISTS trg_llm_scores_upd ON llm_scores;
+CREATE TRIGGER trg_llm_scores_upd
+AFTER UPDATE ON llm_scores
+REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_final_from_transition();
+
+DROP TRIGGER IF EXISTS trg_llm_scores_del ON llm_scores;
+CREATE TRIGGER trg_llm_scores_del
+AFTER DELETE ON llm_scores
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_final_from_transition();
+
+-- backfill: human_weighted + τιμές με το ίδιο clamp/fusion
+SELECT _recompute_final_set(ARRAY(SELECT answer_id FROM final_scores));
+    """)
+
+
+def downgrade():
+    op.execute("""
+DROP TRIGGER IF EXISTS trg_human_ratings_ins ON human_ratings;
+DROP TRIGGER IF EXISTS trg_human_ratings_upd ON human_ratings;
+DROP TRIGGER IF EXISTS trg_human_ratings_del ON human_ratings;
+DROP TRIGGER IF EXISTS trg_llm_scores_ins ON llm_scores;
+DROP TRIGGER IF EXISTS trg_llm_scores_upd ON llm_scores;
+DROP TRIGGER IF EXISTS trg_llm_scores_del ON llm_scores;
+DROP FUNCTION IF EXISTS _trg_final_from_transition();
+
+CREATE OR REPLACE FUNCTION _trg_after_human_rating() RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM _recompute_final(NEW.answer_id);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION _trg_after_llm_score() RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM _recompute_final(NEW.answer_id);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_after_human_rating
+AFTER INSERT OR UPDATE ON human_ratings
+FOR EACH ROW EXECUTE FUNCTION _trg_after_human_rating();
+
+CREATE TRIGGER trg_after_llm_score
+AFTER INSERT OR UPDATE ON llm_scores
+FOR EACH ROW EXECUTE FUNCTION _trg_after_llm_score();
+    """)
@@ -0,0 +1,427 @@
+"""reliability stats: confusion cells + ροπές ανά ζεύγος raters, auto-vs-human (incremental)
+
+Revision ID: 90baf8b452d3
+Revises: 95d8fccad91b
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90baf8b452d3'
+down_revision: Union[str, Sequence[str], None] = '95d8fccad91b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# source:
+#   human_ratings: rater flow (answers / human_ratings / llm_scores, κλίμακα 0..1)
+#   humanrating:   study flow (interaction / humanrating / autorating, κλίμακα 0..10)
+TRIGGER_TABLES = ("human_ratings", "llm_scores", "humanrating", "autorating")
+
+
+def upgrade():
+    op.execute("""
+-- ανά (source, category, qtype, rater_a < rater_b): ροπές των κοινών βαθμολογιών
+CREATE TABLE IF NOT EXISTS reliability_pairs (
+  source    TEXT NOT NULL,
+  category  TEXT NOT NULL,
+  qtype     TEXT NOT NULL,
+  rater_a   TEXT NOT NULL,
+  rater_b   TEXT NOT NULL,
+  n         INTEGER NOT NULL DEFAULT 0,
+  sum_a     NUMERIC NOT NULL DEFAULT 0,
+  sum_b     NUMERIC NOT NULL DEFAULT 0,
+  sum_aa    NUMERIC NOT NULL DEFAULT 0,
+  sum_bb    NUMERIC NOT NULL DEFAULT 0,
+  sum_ab    NUMERIC NOT NULL DEFAULT 0,
+  PRIMARY KEY (source, category, qtype, rater_a, rater_b),
+  CHECK (rater_a < rater_b)
+);
+
+-- sparse confusion matrix: level ∈ 0..20 (βήμα 0.05 στο 0..1, 0.5 στο 0..10)
+CREATE TABLE IF NOT EXISTS reliability_cells (
+  source    TEXT NOT NULL,
+  category  TEXT NOT NULL,
+  qtype     TEXT NOT NULL,
+  rater_a   TEXT NOT NULL,
+  rater_b   TEXT NOT NULL,
+  la        SMALLINT NOT NULL CHECK (la BETWEEN 0 AND 20),
+  lb        SMALLINT NOT NULL CHECK (lb BETWEEN 0 AND 20),
+  n         INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (source, category, qtype, rater_a, rater_b, la, lb)
+);
+
+-- πλήθος βαθμολογιών ανά rater (n_unique_raters, μέσο k για το ICC)
+CREATE TABLE IF NOT EXISTS reliability_raters (
+  source    TEXT NOT NULL,
+  category  TEXT NOT NULL,
+  qtype     TEXT NOT NULL,
+  rater_id  TEXT NOT NULL,
+  n         INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (source, category, qtype, rater_id)
+);
+
+-- κατάσταση ανά answer: πόσοι raters, d = auto − μέσος όρος ανθρώπων (NULL χωρίς auto)
+CREATE TABLE IF NOT EXISTS reliability_answers (
+  source     TEXT NOT NULL,
+  answer_id  TEXT NOT NULL,
+  category   TEXT NOT NULL,
+  qtype      TEXT NOT NULL,
+  n_raters   INTEGER NOT NULL,
+  d          NUMERIC,
+  PRIMARY KEY (source, answer_id)
+);
+CREATE INDEX IF NOT EXISTS idx_reliability_answers_cat
+  ON reliability_answers (source, category, qtype);
+
+CREATE TABLE IF NOT EXISTS reliability_totals (
+  source     TEXT NOT NULL,
+  category   TEXT NOT NULL,
+  qtype      TEXT NOT NULL,
+  n_answers  INTEGER NOT NULL DEFAULT 0,
+  n_auto     INTEGER NOT NULL DEFAULT 0,
+  sum_d      NUMERIC NOT NULL DEFAULT 0,
+  sum_dd     NUMERIC NOT NULL DEFAULT 0,
+  PRIMARY KEY (source, category, qtype)
+);
+
+-- Οι βαθμολογίες του statement περνούν ως arrays (χωρίς temp tables / DDL ανά statement):
+--   _reliability_score: βαθμολογία πριν (sign −1) / μετά (sign +1) για τα answers του statement
+--   _reliability_auto:  τρέχον auto score ανά answer
+DO $types$
+BEGIN
+  CREATE TYPE _reliability_score AS (
+    answer_id TEXT, category TEXT, qtype TEXT, rater_id TEXT, score NUMERIC, ord BIGINT, sign INTEGER
+  );
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $types$;
+DO $types$
+BEGIN
+  CREATE TYPE _reliability_auto AS (answer_id TEXT, llm NUMERIC);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $types$;
+
+-- Εφαρμόζει το Δ (μετά − πριν) στα reliability_* σε ΕΝΑ statement — αγγίζει μόνο τα ids.
+-- p_levels: level = round(score * p_levels); p_ratings = false όταν άλλαξε μόνο το auto.
+-- Γραμμές με n = 0 μένουν (τις φιλτράρει το app/core/reliability.py).
+-- Όλα τα CTEs βλέπουν το ίδιο snapshot: το totals αφαιρεί την παλιά κατάσταση του
+-- reliability_answers πριν την αντικαταστήσουν τα del_answers / τελικό upsert.
+CREATE OR REPLACE FUNCTION _reliability_apply(
+  p_source TEXT, p_levels NUMERIC, p_ratings BOOLEAN, ids TEXT[],
+  p_raw _reliability_score[], p_auto _reliability_auto[]
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $func$
+BEGIN
+  WITH scored AS (
+    -- μία βαθμολογία ανά (answer, rater): η τελευταία
+    SELECT DISTINCT ON (sign, answer_id, rater_id)
+           answer_id, COALESCE(category, '') AS category, COALESCE(qtype, '') AS qtype,
+           rater_id, score, sign
+    FROM unnest(p_raw)
+    WHERE score IS NOT NULL
+    ORDER BY sign, answer_id, rater_id, ord DESC
+  ), pairs AS (
+    SELECT x.category, x.qtype, x.rater_id AS rater_a, y.rater_id AS rater_b,
+           x.sign, x.score AS sa, y.score AS sb
+    FROM scored x
+    JOIN scored y ON y.answer_id = x.answer_id AND y.sign = x.sign AND x.rater_id < y.rater_id
+    WHERE p_ratings
+  ), ins_pairs AS (
+    INSERT INTO reliability_pairs AS p (source, category, qtype, rater_a, rater_b, n, sum_a, sum_b, sum_aa, sum_bb, sum_ab)
+    SELECT p_source, category, qtype, rater_a, rater_b,
+           SUM(sign), SUM(sign * sa), SUM(sign * sb),
+           SUM(sign * sa * sa), SUM(sign * sb * sb), SUM(sign * sa * sb)
+    FROM pairs
+    GROUP BY category, qtype, rater_a, rater_b
+    HAVING (SUM(sign), SUM(sign * sa), SUM(sign * sb),
+            SUM(sign * sa * sa), SUM(sign * sb * sb), SUM(sign * sa * sb)) <> (0, 0, 0, 0, 0, 0)
+    ON CONFLICT (source, category, qtype, rater_a, rater_b) DO UPDATE SET
+      n      = p.n + EXCLUDED.n,
+      sum_a  = p.sum_a + EXCLUDED.sum_a,
+      sum_b  = p.sum_b + EXCLUDED.sum_b,
+      sum_aa = p.sum_aa + EXCLUDED.sum_aa,
+      sum_bb = p.sum_bb + EXCLUDED.sum_bb,
+      sum_ab = p.sum_ab + EXCLUDED.sum_ab
+  ), ins_cells AS (
+    INSERT INTO reliability_cells AS c (source, category, qtype, rater_a, rater_b, la, lb, n)
+    SELECT p_source, category, qtype, rater_a, rater_b,
+           LEAST(GREATEST(round(sa * p_levels), 0), 20)::smallint,
+           LEAST(GREATEST(round(sb * p_levels), 0), 20)::smallint,
+           SUM(sign)
+    FROM pairs
+    GROUP BY 2, 3, 4, 5, 6, 7
+    HAVING SUM(sign) <> 0
+    ON CONFLICT (source, category, qtype, rater_a, rater_b, la, lb) DO UPDATE SET
+      n = c.n + EXCLUDED.n
+  ), ins_raters AS (
+    INSERT INTO reliability_raters AS r (source, category, qtype, rater_id, n)
+    SELECT p_source, category, qtype, rater_id, SUM(sign)
+    FROM scored
+    WHERE p_ratings
+    GROUP BY category, qtype, rater_id
+    HAVING SUM(sign) <> 0
+    ON CONFLICT (source, category, qtype, rater_id) DO UPDATE SET
+      n = r.n + EXCLUDED.n
+  ), state AS (
+    SELECT r.answer_id, r.category, r.qtype, COUNT(*)::int AS n_raters, l.llm - AVG(r.score) AS d
+    FROM scored r
+    LEFT JOIN unnest(p_auto) l USING (answer_id)
+    WHERE r.sign = 1
+    GROUP BY r.answer_id, r.category, r.qtype, l.llm
+  ), ins_totals AS (
+    INSERT INTO reliability_totals AS t (source, category, qtype, n_answers, n_auto, sum_d, sum_dd)
+    SELECT p_source, category, qtype,
+           SUM(sign), SUM(sign * (d IS NOT NULL)::int),
+           SUM(sign * COALESCE(d, 0)), SUM(sign * COALESCE(d * d, 0))
+    FROM (
+      SELECT category, qtype, d, 1 AS sign FROM state
+      UNION ALL
+      SELECT category, qtype, d, -1 FROM reliability_answers
+      WHERE source = p_source AND answer_id = ANY(ids)
+    ) x
+    GROUP BY category, qtype
+    HAVING (SUM(sign), SUM(sign * (d IS NOT NULL)::int),
+            SUM(sign * COALESCE(d, 0)), SUM(sign * COALESCE(d * d, 0))) <> (0, 0, 0, 0)
+    ON CONFLICT (source, category, qtype) DO UPDATE SET
+      n_answers = t.n_answers + EXCLUDED.n_answers,
+      n_auto    = t.n_auto + EXCLUDED.n_auto,
+      sum_d     = t.sum_d + EXCLUDED.sum_d,
+      sum_dd    = t.sum_dd + EXCLUDED.sum_dd
+  ), del_answers AS (
+    DELETE FROM reliability_answers
+    WHERE source = p_source AND answer_id = ANY(ids)
+      AND answer_id NOT IN (SELECT answer_id FROM state)
+  )
+  INSERT INTO reliability_answers AS a (source, answer_id, category, qtype, n_raters, d)
+  SELECT p_source, answer_id, category, qtype, n_raters, d FROM state
+  ON CONFLICT (source, answer_id) DO UPDATE SET
+    category = EXCLUDED.category,
+    qtype    = EXCLUDED.qtype,
+    n_raters = EXCLUDED.n_raters,
+    d        = EXCLUDED.d;
+END;
+$func$;
+
+-- rater flow (human_ratings: PK (answer_id, rater_id), llm_scores: ένα score ανά answer)
+CREATE OR REPLACE FUNCTION _trg_reliability_rater()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+DECLARE
+  ids UUID[];
+  raw_rows _reliability_score[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    ids := ARRAY(SELECT DISTINCT answer_id FROM new_rows);
+  ELSIF TG_OP = 'UPDATE' THEN
+    ids := ARRAY(SELECT answer_id FROM new_rows UNION SELECT answer_id FROM old_rows);
+  ELSE
+    ids := ARRAY(SELECT DISTINCT answer_id FROM old_rows);
+  END IF;
+
+  -- Το Δ (μετά − πριν) θέλει σειριακή πρόσβαση ανά answer: ίδιο lock με το
+  -- _refresh_rating_aggregates, ώστε τα επόμενα statements να βλέπουν ό,τι
+  -- έκανε commit ο προηγούμενος writer του ίδιου answer.
+  PERFORM 1 FROM answers WHERE answer_id = ANY(ids) ORDER BY answer_id FOR NO KEY UPDATE;
+
+  -- μετά
+  raw_rows := ARRAY(
+    SELECT ROW(h.answer_id::text, a.category, a.qtype, h.rater_id, LEAST(GREATEST(h.score, 0), 1), 0, 1)::_reliability_score
+    FROM human_ratings h JOIN answers a USING (answer_id)
+    WHERE h.answer_id = ANY(ids)
+  );
+
+  -- πριν = (τρέχουσες − new_rows) ∪ old_rows
+  IF TG_TABLE_NAME = 'human_ratings' THEN
+    IF TG_OP = 'DELETE' THEN
+      raw_rows := raw_rows || ARRAY(
+        SELECT ROW(r.answer_id, r.category, r.qtype, r.rater_id, r.score, 0, -1)::_reliability_score
+        FROM unnest(raw_rows) r
+      );
+    ELSE
+      raw_rows := raw_rows || ARRAY(
+        SELECT ROW(r.answer_id, r.category, r.qtype, r.rater_id, r.score, 0, -1)::_reliability_score
+        FROM unnest(raw_rows) r
+        WHERE NOT EXISTS (SELECT 1 FROM new_rows n
+                          WHERE n.answer_id::text = r.answer_id AND n.rater_id = r.rater_id)
+      );
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+      raw_rows := raw_rows || ARRAY(
+        SELECT ROW(o.answer_id::text, a.category, a.qtype, o.rater_id, LEAST(GREATEST(o.score, 0), 1), 0, -1)::_reliability_score
+        FROM old_rows o JOIN answers a USING (answer_id)
+      );
+    END IF;
+  END IF;
+
+  PERFORM _reliability_apply('human_ratings', 20, TG_TABLE_NAME = 'human_ratings', ids::text[], raw_rows, ARRAY(
+    SELECT ROW(answer_id::text, LEAST(GREATEST(llm_score, 0), 1))::_reliability_auto
+    FROM llm_scores
+    WHERE answer_id = ANY(ids) AND llm_score IS NOT NULL
+  ));
+  RETURN NULL;
+END;
+$trg$;
+
+-- study flow (humanrating / autorating: χωρίς unique, μετράει η τελευταία εγγραφή κατά id)
+CREATE OR REPLACE FUNCTION _trg_reliability_study()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+DECLARE
+  ids TEXT[];
+  lock_key INTEGER;
+  raw_rows _reliability_score[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    ids := ARRAY(SELECT DISTINCT answer_id FROM new_rows);
+  ELSIF TG_OP = 'UPDATE' THEN
+    ids := ARRAY(SELECT answer_id FROM new_rows UNION SELECT answer_id FROM old_rows);
+  ELSE
+    ids := ARRAY(SELECT DISTINCT answer_id FROM old_rows);
+  END IF;
+
+  -- σειριακή πρόσβαση ανά answer (το answer_id εδώ δεν έχει δική του γραμμή
+  -- για FOR UPDATE → advisory lock, πάντα με την ίδια σειρά για να μην έχουμε deadlock)
+  FOR lock_key IN SELECT DISTINCT hashtext('reliability:' || x) FROM unnest(ids) AS x ORDER BY 1 LOOP
+    PERFORM pg_advisory_xact_lock(lock_key);
+  END LOOP;
+
+  raw_rows := ARRAY(
+    SELECT ROW(h.answer_id, i.category, i.qtype, h.rater_id, h.score::numeric, h.id, 1)::_reliability_score
+    FROM humanrating h JOIN interaction i ON i.answer_id = h.answer_id
+    WHERE h.answer_id = ANY(ids)
+  );
+
+  IF TG_TABLE_NAME = 'humanrating' THEN
+    IF TG_OP = 'DELETE' THEN
+      raw_rows := raw_rows || ARRAY(
+        SELECT ROW(r.answer_id, r.category, r.qtype, r.rater_id, r.score, r.ord, -1)::_reliability_score
+        FROM unnest(raw_rows) r
+      );
+    ELSE
+      raw_rows := raw_rows || ARRAY(
+        SELECT ROW(r.answer_id, r.category, r.qtype, r.rater_id, r.score, r.ord, -1)::_reliability_score
+        FROM unnest(raw_rows) r
+        WHERE r.ord NOT IN (SELECT id FROM new_rows)
+      );
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+      raw_rows := raw_rows || ARRAY(
+        SELECT ROW(o.answer_id, i.category, i.qtype, o.rater_id, o.score::numeric, o.id, -1)::_reliability_score
+        FROM old_rows o JOIN interaction i ON i.answer_id = o.answer_id
+      );
+    END IF;
+  END IF;
+
+  PERFORM _reliability_apply('humanrating', 2, TG_TABLE_NAME = 'humanrating', ids, raw_rows, ARRAY(
+    SELECT ROW(answer_id, score::numeric)::_reliability_auto
+    FROM (
+      SELECT DISTINCT ON (answer_id) answer_id, score
+      FROM autorating
+      WHERE answer_id = ANY(ids) AND score IS NOT NULL
+      ORDER BY answer_id, id DESC
+    ) x
+  ));
+  RETURN NULL;
+END;
+$trg$;
+    """)
+
+    # triggers + backfill μόνο για όσους πίνακες υπάρχουν (humanrating / autorating: SQLModel)
+    tables = ", ".join(f"'{t}'" for t in TRIGGER_TABLES)
+    op.execute(f"""
+DO $$
+DECLARE
+  t TEXT;
+  fn TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY[{tables}] LOOP
+    IF to_regclass('public.' || t) IS NOT NULL THEN
+      fn := CASE WHEN t IN ('human_ratings', 'llm_scores')
+                 THEN '_trg_reliability_rater' ELSE '_trg_reliability_study' END;
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_reliability_ins ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_reliability_ins AFTER INSERT ON %1$I
+           REFERENCING NEW TABLE AS new_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION %2$s()', t, fn);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_reliability_upd ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_reliability_upd AFTER UPDATE ON %1$I
+           REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION %2$s()', t, fn);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_reliability_del ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_reliability_del AFTER DELETE ON %1$I
+           REFERENCING OLD TABLE AS old_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION %2$s()', t, fn);
+    END IF;
+  END LOOP;
+
+  -- backfill από την τρέχουσα κατάσταση (μόνο "μετά": τα reliability_* είναι άδεια)
+  DELETE FROM reliability_pairs;
+  DELETE FROM reliability_cells;
+  DELETE FROM reliability_raters;
+  DELETE FROM reliability_answers;
+  DELETE FROM reliability_totals;
+
+  IF to_regclass('public.human_ratings') IS NOT NULL THEN
+    PERFORM _reliability_apply('human_ratings', 20, true, ARRAY[]::text[], ARRAY(
+      SELECT ROW(h.answer_id::text, a.category, a.qtype, h.rater_id, LEAST(GREATEST(h.score, 0), 1), 0, 1)::_reliability_score
+      FROM human_ratings h JOIN answers a USING (answer_id)
+    ), ARRAY(
+      SELECT ROW(answer_id::text, LEAST(GREATEST(llm_score, 0), 1))::_reliability_auto
+      FROM llm_scores WHERE llm_score IS NOT NULL
+    ));
+  END IF;
+
+  IF to_regclass('public.humanrating') IS NOT NULL
+     AND to_regclass('public.autorating') IS NOT NULL
+     AND to_regclass('public.interaction') IS NOT NULL THEN
+    PERFORM _reliability_apply('humanrating', 2, true, ARRAY[]::text[], ARRAY(
+      SELECT ROW(h.answer_id, i.category, i.qtype, h.rater_id, h.score::numeric, h.id, 1)::_reliability_score
+      FROM humanrating h JOIN interaction i ON i.answer_id = h.answer_id
+    ), ARRAY(
+      SELECT ROW(answer_id, score::numeric)::_reliability_auto
+      FROM (
+        SELECT DISTINCT ON (answer_id) answer_id, score
+        FROM autorating WHERE score IS NOT NULL
+        ORDER BY answer_id, id DESC
+      ) x
+    ));
+  END IF;
+END $$;
+    """)
+
+
+def downgrade():
+    tables = ", ".join(f"'{t}'" for t in TRIGGER_TABLES)
+    op.execute(f"""
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY[{tables}] LOOP
+    IF to_regclass('public.' || t) IS NOT NULL THEN
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_reliability_ins ON %1$I', t);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_reliability_upd ON %1$I', t);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_reliability_del ON %1$I', t);
+    END IF;
+  END LOOP;
+END $$;
+DROP FUNCTION IF EXISTS _trg_reliability_study();
+DROP FUNCTION IF EXISTS _trg_reliability_rater();
+DROP FUNCTION IF EXISTS _reliability_apply(TEXT, NUMERIC, BOOLEAN, TEXT[], _reliability_score[], _reliability_auto[]);
+DROP TYPE IF EXISTS _reliability_auto;
+DROP TYPE IF EXISTS _reliability_score;
+DROP TABLE IF EXISTS reliability_totals;
+DROP TABLE IF EXISTS reliability_answers;
+DROP TABLE IF EXISTS reliability_raters;
+DROP TABLE IF EXISTS reliability_cells;
+DROP TABLE IF EXISTS reliability_pairs;
+    """)
@@ -0,0 +1,285 @@
+"""evaluation: typed score/label/dimension columns + evaluation_daily rollup
+
+Revision ID: 90e2d0b7f0d8
+Revises: 601091ad072d
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90e2d0b7f0d8'
+down_revision: Union[str, Sequence[str], None] = '601091ad072d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute("""
+-- αριθμός από JSON node (number ή αριθμητικό string), αλλιώς NULL
+CREATE OR REPLACE FUNCTION _jsonb_float(j JSONB)
+RETURNS DOUBLE PRECISION
+LANGUAGE sql
+IMMUTABLE
+AS $func$
+  SELECT CASE jsonb_typeof(j)
+           WHEN 'number' THEN (j #>> '{}')::float8
+           WHEN 'string' THEN CASE WHEN (j #>> '{}') ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$'
+                                   THEN (j #>> '{}')::float8 END
+         END
+$func$;
+
+-- typed στήλες: γεμίζουν από το result σε κάθε INSERT / UPDATE OF result
+CREATE OR REPLACE FUNCTION _trg_evaluation_typed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+DECLARE
+  r JSONB := NEW.result::jsonb;
+BEGIN
+  NEW.score                  := _jsonb_float(r -> 'score');
+  NEW.label                  := r ->> 'label';
+  NEW.dim_knowledge_decision := _jsonb_float(r #> '{dimensions,Knowledge_Decision,score}');
+  NEW.dim_content_structure  := _jsonb_float(r #> '{dimensions,Content_Structure,score}');
+  NEW.dim_delivery_presence  := _jsonb_float(r #> '{dimensions,Delivery_Presence,score}');
+  RETURN NEW;
+END;
+$trg$;
+
+-- rollup ανά (user, category, ημέρα). user_id = '' όταν evaluation.user_id IS NULL.
+-- Τα *_sum / *_n δίνουν AVG χωρίς NULLs (όπως το AVG στο evaluation).
+CREATE TABLE IF NOT EXISTS evaluation_daily (
+  user_id           TEXT NOT NULL,
+  category          TEXT NOT NULL,
+  day               DATE NOT NULL,
+  n                 INTEGER NOT NULL,
+  score_sum         DOUBLE PRECISION NOT NULL DEFAULT 0,
+  score_n           INTEGER NOT NULL DEFAULT 0,
+  kd_sum            DOUBLE PRECISION NOT NULL DEFAULT 0,
+  kd_n              INTEGER NOT NULL DEFAULT 0,
+  cs_sum            DOUBLE PRECISION NOT NULL DEFAULT 0,
+  cs_n              INTEGER NOT NULL DEFAULT 0,
+  dp_sum            DOUBLE PRECISION NOT NULL DEFAULT 0,
+  dp_n              INTEGER NOT NULL DEFAULT 0,
+  label_counts      JSONB NOT NULL DEFAULT '{}'::jsonb,
+  last_id           INTEGER,
+  last_at           TIMESTAMP,
+  last_label        TEXT,
+  last_score        DOUBLE PRECISION,
+  last_question_id  TEXT,
+  updated_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (user_id, category, day)
+);
+CREATE INDEX IF NOT EXISTS idx_evaluation_daily_day
+  ON evaluation_daily (day) INCLUDE (category, n, label_counts);
+
+CREATE OR REPLACE FUNCTION _refresh_evaluation_daily(p_users TEXT[], p_cats TEXT[], p_days DATE[],
+                                                     p_lock BOOLEAN DEFAULT true)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $func$
+DECLARE
+  changed INTEGER;
+  lock_key INTEGER;
+BEGIN
+  -- Σειριακή ανανέωση ανά (user, category, day): χωρίς lock δύο ταυτόχρονα inserts
+  -- του ίδιου key μετράνε το καθένα χωρίς τη γραμμή του άλλου. Μετά το lock κάθε
+  -- statement παίρνει νέο snapshot και βλέπει ό,τι έκανε commit ο προηγούμενος.
+  -- Πάντα με την ίδια σειρά για να μην έχουμε deadlock. (p_lock = false: backfill,
+  -- όπου ένα lock ανά key θα γέμιζε το lock table)
+  IF p_lock THEN
+    FOR lock_key IN
+      SELECT DISTINCT hashtext(concat_ws('|', 'evaluation_daily', k.user_id, k.category, k.day))
+      FROM unnest(p_users, p_cats, p_days) AS k(user_id, category, day)
+      ORDER BY 1
+    LOOP
+      PERFORM pg_advisory_xact_lock(lock_key);
+    END LOOP;
+  END IF;
+
+  DELETE FROM evaluation_daily g
+   USING unnest(p_users, p_cats, p_days) AS k(user_id, category, day)
+   WHERE g.user_id = k.user_id AND g.category = k.category AND g.day = k.day
+     AND NOT EXISTS (
+           SELECT 1 FROM evaluation e
+            WHERE COALESCE(e.user_id, '') = k.user_id
+              AND e.category = k.category
+              AND e.created_at >= k.day AND e.created_at < k.day + 1
+         );
+
+  WITH k AS (
+    SELECT DISTINCT * FROM unnest(p_users, p_cats, p_days) AS k(user_id, category, day)
+  ),
+  e AS (
+    SELECT k.user_id, k.category, k.day,
+           ev.id, ev.created_at, ev.question_id, ev.score, ev.label,
+           ev.dim_knowledge_decision AS kd,
+           ev.dim_content_structure  AS cs,
+           ev.dim_delivery_presence  AS dp
+    FROM k
+    JOIN evaluation ev
+      ON (ev.user_id = k.user_id OR (k.user_id = '' AND ev.user_id IS NULL))
+     AND ev.category = k.category
+     AND ev.created_at >= k.day AND ev.created_at < k.day + 1
+  ),
+  agg AS (
+    SELECT user_id, category, day,
+           COUNT(*) AS n,
+           COALESCE(SUM(score), 0) AS score_sum, COUNT(score) AS score_n,
+           COALESCE(SUM(kd), 0)    AS kd_sum,    COUNT(kd)    AS kd_n,
+           COALESCE(SUM(cs), 0)    AS cs_sum,    COUNT(cs)    AS cs_n,
+           COALESCE(SUM(dp), 0)    AS dp_sum,    COUNT(dp)    AS dp_n
+    FROM e
+    GROUP BY user_id, category, day
+  ),
+  lab AS (
+    SELECT user_id, category, day, jsonb_object_agg(label, cnt) AS label_counts
+    FROM (
+      SELECT user_id, category, day, COALESCE(label, '') AS label, COUNT(*) AS cnt
+      FROM e
+      GROUP BY user_id, category, day, COALESCE(label, '')
+    ) x
+    GROUP BY user_id, category, day
+  ),
+  lst AS (
+    SELECT DISTINCT ON (user_id, category, day)
+           user_id, category, day, id, created_at, label, score, question_id
+    FROM e
+    ORDER BY user_id, category, day, created_at DESC, id DESC
+  )
+  INSERT INTO evaluation_daily AS g (
+    user_id, category, day, n,
+    score_sum, score_n, kd_sum, kd_n, cs_sum, cs_n, dp_sum, dp_n,
+    label_counts, last_id, last_at, last_label, last_score, last_question_id, updated_at
+  )
+  SELECT a.user_id, a.category, a.day, a.n,
+         a.score_sum, a.score_n, a.kd_sum, a.kd_n, a.cs_sum, a.cs_n, a.dp_sum, a.dp_n,
+         l.label_counts, t.id, t.created_at, t.label, t.score, t.question_id, now()
+  FROM agg a
+  JOIN lab  l USING (user_id, category, day)
+  JOIN lst  t USING (user_id, category, day)
+  ON CONFLICT (user_id, category, day) DO UPDATE SET
+    n = EXCLUDED.n,
+    score_sum = EXCLUDED.score_sum, score_n = EXCLUDED.score_n,
+    kd_sum = EXCLUDED.kd_sum, kd_n = EXCLUDED.kd_n,
+    cs_sum = EXCLUDED.cs_sum, cs_n = EXCLUDED.cs_n,
+    dp_sum = EXCLUDED.dp_sum, dp_n = EXCLUDED.dp_n,
+    label_counts = EXCLUDED.label_counts,
+    last_id = EXCLUDED.last_id, last_at = EXCLUDED.last_at, last_label = EXCLUDED.last_label,
+    last_score = EXCLUDED.last_score, last_question_id = EXCLUDED.last_question_id,
+    updated_at = now();
+
+  GET DIAGNOSTICS changed = ROW_COUNT;
+  RETURN changed;
+END;
+$func$;
+
+-- statement-level: ένα refresh για όλα τα (user, category, day) που άγγιξε το statement
+CREATE OR REPLACE FUNCTION _trg_evaluation_daily()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+DECLARE
+  us TEXT[];
+  cs TEXT[];
+  ds DATE[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT array_agg(u), array_agg(c), array_agg(d) INTO us, cs, ds
+    FROM (SELECT DISTINCT COALESCE(user_id, '') AS u, category AS c, created_at::date AS d
+          FROM new_rows) k;
+  ELSIF TG_OP = 'UPDATE' THEN
+    SELECT array_agg(u), array_agg(c), array_agg(d) INTO us, cs, ds
+    FROM (SELECT COALESCE(user_id, '') AS u, category AS c, created_at::date AS d FROM new_rows
+          UNION
+          SELECT COALESCE(user_id, ''), category, created_at::date FROM old_rows) k;
+  ELSE
+    SELECT array_agg(u), array_agg(c), array_agg(d) INTO us, cs, ds
+    FROM (SELECT DISTINCT COALESCE(user_id, '') AS u, category AS c, created_at::date AS d
+          FROM old_rows) k;
+  END IF;
+
+  PERFORM _refresh_evaluation_daily(us, cs, ds);
+  RETURN NULL;
+END;
+$trg$;
+
+DO $$
+BEGIN
+  IF to_regclass('public.evaluation') IS NULL THEN
+    RAISE NOTICE 'evaluation table missing: typed columns / rollup triggers skipped';
+    RETURN;
+  END IF;
+
+  ALTER TABLE evaluation
+    ADD COLUMN IF NOT EXISTS score                  DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS label                  TEXT,
+    ADD COLUMN IF NOT EXISTS dim_knowledge_decision DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS dim_content_structure  DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS dim_delivery_presence  DOUBLE PRECISION;
+
+  -- backfill (πριν τα triggers)
+  UPDATE evaluation SET
+    score                  = _jsonb_float(result::jsonb -> 'score'),
+    label                  = result::jsonb ->> 'label',
+    dim_knowledge_decision = _jsonb_float(result::jsonb #> '{dimensions,Knowledge_Decision,score}'),
+    dim_content_structure  = _jsonb_float(result::jsonb #> '{dimensions,Content_Structure,score}'),
+    dim_delivery_presence  = _jsonb_float(result::jsonb #> '{dimensions,Delivery_Presence,score}');
+
+  -- timeline: index-only scan ανά user
+  CREATE INDEX IF NOT EXISTS idx_evaluation_user_created_typed
+    ON evaluation (user_id, created_at DESC) INCLUDE (id, score, label, category);
+
+  DROP TRIGGER IF EXISTS trg_evaluation_typed ON evaluation;
+  CREATE TRIGGER trg_evaluation_typed
+  BEFORE INSERT OR UPDATE OF result ON evaluation
+  FOR EACH ROW EXECUTE FUNCTION _trg_evaluation_typed();
+
+  DROP TRIGGER IF EXISTS trg_evaluation_daily_ins ON evaluation;
+  CREATE TRIGGER trg_evaluation_daily_ins
+  AFTER INSERT ON evaluation
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION _trg_evaluation_daily();
+
+  DROP TRIGGER IF EXISTS trg_evaluation_daily_upd ON evaluation;
+  CREATE TRIGGER trg_evaluation_daily_upd
+  AFTER UPDATE ON evaluation
+  REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION _trg_evaluation_daily();
+
+  DROP TRIGGER IF EXISTS trg_evaluation_daily_del ON evaluation;
+  CREATE TRIGGER trg_evaluation_daily_del
+  AFTER DELETE ON evaluation
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION _trg_evaluation_daily();
+
+  -- backfill rollup
+  PERFORM _refresh_evaluation_daily(array_agg(u), array_agg(c), array_agg(d), false)
+  FROM (SELECT DISTINCT COALESCE(user_id, '') AS u, category AS c, created_at::date AS d
+        FROM evaluation) k;
+END $$;
+    """)
+
+
+def downgrade():
+    op.execute("""
+DROP TRIGGER IF EXISTS trg_evaluation_daily_del ON evaluation;
+DROP TRIGGER IF EXISTS trg_evaluation_daily_upd ON evaluation;
+DROP TRIGGER IF EXISTS trg_evaluation_daily_ins ON evaluation;
+DROP TRIGGER IF EXISTS trg_evaluation_typed ON evaluation;
+DROP INDEX IF EXISTS idx_evaluation_user_created_typed;
+ALTER TABLE IF EXISTS evaluation
+  DROP COLUMN IF EXISTS dim_delivery_presence,
+  DROP COLUMN IF EXISTS dim_content_structure,
+  DROP COLUMN IF EXISTS dim_knowledge_decision,
+  DROP COLUMN IF EXISTS label,
+  DROP COLUMN IF EXISTS score;
+DROP FUNCTION IF EXISTS _trg_evaluation_daily();
+DROP FUNCTION IF EXISTS _refresh_evaluation_daily(TEXT[], TEXT[], DATE[], BOOLEAN);
+DROP TABLE IF EXISTS evaluation_daily;
+DROP FUNCTION IF EXISTS _trg_evaluation_typed();
+DROP FUNCTION IF EXISTS _jsonb_float(JSONB);
+    """)
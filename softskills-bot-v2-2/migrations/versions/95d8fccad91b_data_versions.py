@@ -0,0 +1,178 @@
+"""data_versions: μετρητής αλλαγών ανά πίνακα (watermark για ETag / cache)
+
+Revision ID: 95d8fccad91b
+Revises: 90e2d0b7f0d8
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '95d8fccad91b'
+down_revision: Union[str, Sequence[str], None] = '90e2d0b7f0d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Πίνακες που διαβάζουν τα report / metrics endpoints.
+# HOT: γράφονται σε κάθε quiz / βαθμολόγηση → append-only log (data_changes), χωρίς
+#      κοινή γραμμή-μετρητή που θα σειριοποιούσε όλους τους writers.
+# CATALOG: σπάνιες αλλαγές → απευθείας +1 στο data_versions.
+HOT = (
+    "interaction", "autorating", "humanrating", "evaluation",
+    "answers", "llm_scores", "human_ratings", "final_scores",
+)
+CATALOG = ("raters",)
+TRACKED = HOT + CATALOG
+
+
+def _each_table(tables, body: str) -> str:
+    names = ", ".join(f"'{t}'" for t in tables)
+    return f"""
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY[{names}] LOOP
+    IF to_regclass('public.' || t) IS NOT NULL THEN
+{body}
+    END IF;
+  END LOOP;
+END $$;
+"""
+
+
+def upgrade():
+    # watermark(t) = data_versions.version + #γραμμών του t στο data_changes.
+    # Κάθε commit προσθέτει γραμμές → ο αριθμός μεγαλώνει ανεξάρτητα από τη σειρά των commits.
+    # Η συμπίεση μεταφέρει γραμμές του log στο data_versions στην ίδια transaction,
+    # οπότε το άθροισμα που βλέπει ένα snapshot δεν αλλάζει.
+    op.execute("""
+CREATE TABLE IF NOT EXISTS data_versions (
+  table_name  TEXT PRIMARY KEY,
+  version     BIGINT NOT NULL DEFAULT 0,
+  changed_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS data_changes (
+  id          BIGSERIAL PRIMARY KEY,
+  table_name  TEXT NOT NULL,
+  changed_at  TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+CREATE INDEX IF NOT EXISTS idx_data_changes_table ON data_changes (table_name, changed_at);
+
+-- log → data_versions (ένας compactor τη φορά· όποιος δεν πάρει το lock προσπερνά)
+CREATE OR REPLACE FUNCTION _compact_data_changes()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $func$
+DECLARE
+  n INTEGER;
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('data_changes_compact')) THEN
+    RETURN 0;
+  END IF;
+  WITH d AS (
+    DELETE FROM data_changes RETURNING table_name, changed_at
+  ), g AS (
+    SELECT table_name, COUNT(*) AS n, MAX(changed_at) AS m FROM d GROUP BY table_name
+  )
+  INSERT INTO data_versions AS v (table_name, version, changed_at)
+  SELECT table_name, n, m FROM g
+  ON CONFLICT (table_name) DO UPDATE
+    SET version = v.version + EXCLUDED.version,
+        changed_at = GREATEST(v.changed_at, EXCLUDED.changed_at);
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END;
+$func$;
+
+-- HOT: μία γραμμή ανά statement (INSERT χωρίς row locks)· περιστασιακά συμπίεση
+CREATE OR REPLACE FUNCTION _trg_log_data_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+BEGIN
+  INSERT INTO data_changes (table_name) VALUES (TG_TABLE_NAME);
+  IF random() < 0.02 THEN
+    PERFORM _compact_data_changes();
+  END IF;
+  RETURN NULL;
+END;
+$trg$;
+
+-- CATALOG: +1 ανά statement που άλλαξε γραμμές (ένα ON CONFLICT DO NOTHING που δεν
+-- έγραψε τίποτα δεν κλειδώνει τον μετρητή ούτε αλλάζει το watermark).
+-- Transactional: ο νέος αριθμός φαίνεται μόνο μαζί με τα δεδομένα του commit.
+CREATE OR REPLACE FUNCTION _trg_bump_data_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+BEGIN
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    IF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+      RETURN NULL;
+    END IF;
+  ELSIF TG_OP = 'DELETE' THEN
+    IF NOT EXISTS (SELECT 1 FROM old_rows) THEN
+      RETURN NULL;
+    END IF;
+  END IF;
+  INSERT INTO data_versions AS v (table_name, version, changed_at)
+  VALUES (TG_TABLE_NAME, 1, now())
+  ON CONFLICT (table_name) DO UPDATE
+    SET version = v.version + 1, changed_at = now();
+  RETURN NULL;
+END;
+$trg$;
+    """)
+
+    op.execute(_each_table(HOT, """
+      INSERT INTO data_versions (table_name) VALUES (t) ON CONFLICT DO NOTHING;
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_data_version
+           AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %1$I
+           FOR EACH STATEMENT EXECUTE FUNCTION _trg_log_data_change()', t);"""))
+
+    # transition tables θέλουν ένα trigger ανά event
+    op.execute(_each_table(CATALOG, """
+      INSERT INTO data_versions (table_name) VALUES (t) ON CONFLICT DO NOTHING;
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_data_version
+           AFTER INSERT ON %1$I REFERENCING NEW TABLE AS new_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION _trg_bump_data_version()', t);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version_upd ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_data_version_upd
+           AFTER UPDATE ON %1$I REFERENCING NEW TABLE AS new_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION _trg_bump_data_version()', t);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version_del ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_data_version_del
+           AFTER DELETE ON %1$I REFERENCING OLD TABLE AS old_rows
+           FOR EACH STATEMENT EXECUTE FUNCTION _trg_bump_data_version()', t);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version_trunc ON %1$I', t);
+      EXECUTE format(
+        'CREATE TRIGGER trg_%1$s_data_version_trunc
+           AFTER TRUNCATE ON %1$I
+           FOR EACH STATEMENT EXECUTE FUNCTION _trg_bump_data_version()', t);"""))
+
+
+def downgrade():
+    op.execute(_each_table(TRACKED, """
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version ON %1$I', t);"""))
+    op.execute(_each_table(CATALOG, """
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version_upd ON %1$I', t);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version_del ON %1$I', t);
+      EXECUTE format('DROP TRIGGER IF EXISTS trg_%1$s_data_version_trunc ON %1$I', t);"""))
+    op.execute("""
+DROP FUNCTION IF EXISTS _trg_log_data_change();
+DROP FUNCTION IF EXISTS _trg_bump_data_version();
+DROP FUNCTION IF EXISTS _compact_data_changes();
+DROP TABLE IF EXISTS data_changes;
+DROP TABLE IF EXISTS data_versions;
+    """)
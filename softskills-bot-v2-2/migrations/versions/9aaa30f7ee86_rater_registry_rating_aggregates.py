@@ -0,0 +1,261 @@
+"""raters registry + per-answer rating_aggregates (N raters)
+
+Revision ID: 9aaa30f7ee86
+Revises: be9f18ee2aa5
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9aaa30f7ee86'
+down_revision: Union[str, Sequence[str], None] = 'be9f18ee2aa5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute("""
+-- registry
+CREATE TABLE IF NOT EXISTS raters (
+  rater_id      TEXT PRIMARY KEY CHECK (rater_id ~ '^[A-Za-z0-9_.-]{1,64}$'),
+  display_name  TEXT,
+  active        BOOLEAN NOT NULL DEFAULT TRUE,
+  created_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO raters (rater_id) VALUES ('teacher01'), ('teacher02')
+ON CONFLICT (rater_id) DO NOTHING;
+INSERT INTO raters (rater_id) SELECT DISTINCT rater_id FROM human_ratings
+ON CONFLICT (rater_id) DO NOTHING;
+
+-- μία γραμμή ανά answer: n / mean / variance + scores ταξινομημένα κατά rater_id
+CREATE TABLE IF NOT EXISTS rating_aggregates (
+  answer_id   UUID PRIMARY KEY REFERENCES answers(answer_id) ON DELETE CASCADE,
+  n           INTEGER NOT NULL,
+  mean        NUMERIC NOT NULL,
+  variance    NUMERIC,                 -- var_samp, NULL όταν n < 2
+  rater_ids   TEXT[] NOT NULL,
+  scores      NUMERIC(4,3)[] NOT NULL, -- scores[i] ↔ rater_ids[i]
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_rating_aggregates_n ON rating_aggregates (n);
+
+CREATE OR REPLACE FUNCTION _refresh_rating_aggregates(ids UUID[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $func$
+DECLARE
+  changed INTEGER;
+BEGIN
+  -- σειριοποίηση ανά answer: ταυτόχρονα statements για το ίδιο answer περιμένουν εδώ
+  -- και τα επόμενα statements (νέο snapshot) βλέπουν ό,τι έκανε commit ο προηγούμενος
+  PERFORM 1 FROM answers WHERE answer_id = ANY(ids) ORDER BY answer_id FOR NO KEY UPDATE;
+
+  DELETE FROM rating_aggregates g
+   WHERE g.answer_id = ANY(ids)
+     AND NOT EXISTS (SELECT 1 FROM human_ratings h WHERE h.answer_id = g.answer_id);
+
+  INSERT INTO rating_aggregates AS g (answer_id, n, mean, variance, rater_ids, scores, updated_at)
+  SELECT h.answer_id,
+         COUNT(*),
+         AVG(_clamp01(h.score)),
+         VAR_SAMP(_clamp01(h.score)),
+         array_agg(h.rater_id ORDER BY h.rater_id),
+         array_agg(_clamp01(h.score) ORDER BY h.rater_id),
+         now()
+  FROM human_ratings h
+  WHERE h.answer_id = ANY(ids)
+  GROUP BY h.answer_id
+  ON CONFLICT (answer_id) DO UPDATE SET
+    n = EXCLUDED.n, mean = EXCLUDED.mean, variance = EXCLUDED.variance,
+    rater_ids = EXCLUDED.rater_ids, scores = EXCLUDED.scores, updated_at = now()
+  WHERE (g.rater_ids, g.scores) IS DISTINCT FROM (EXCLUDED.rater_ids, EXCLUDED.scores);
+
+  GET DIAGNOSTICS changed = ROW_COUNT;
+  RETURN changed;
+END;
+$func$;
+
+-- backfill
+SELECT _refresh_rating_aggregates(ARRAY(SELECT DISTINCT answer_id FROM human_ratings));
+
+-- final: human = mean όλων των raters (teacher01/teacher02 κρατιούνται για συμβατότητα)
+CREATE OR REPLACE FUNCTION _recompute_final_set(ids UUID[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $func$
+DECLARE
+  w NUMERIC := _final_human_weight();
+  n INTEGER;
+BEGIN
+  -- ίδιο lock με το _refresh_rating_aggregates (π.χ. llm_scores ∥ human_ratings)
+  PERFORM 1 FROM answers WHERE answer_id = ANY(ids) ORDER BY answer_id FOR NO KEY UPDATE;
+
+  WITH c AS (
+    SELECT a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
+           _clamp01(l.llm_score) AS llm,
+           g.scores[array_position(g.rater_ids, 'teacher01')] AS t1,
+           g.scores[array_position(g.rater_ids, 'teacher02')] AS t2,
+           g.mean AS havg
+    FROM answers a
+    LEFT JOIN llm_scores l USING (answer_id)
+    LEFT JOIN rating_aggregates g USING (answer_id)
+    WHERE a.answer_id = ANY(ids)
+  )
+  INSERT INTO final_scores AS f (
+    answer_id, user_id, question_id, category, qtype,
+    llm_score, teacher01, teacher02, human_avg, human_weighted, final_score, completed_at
+  )
+  SELECT answer_id, user_id, question_id, category, qtype,
+         llm, t1, t2, havg, havg, _fuse_final(llm, havg, w), now()
+  FROM c
+  ON CONFLICT (answer_id) DO UPDATE SET
+    user_id        = EXCLUDED.user_id,
+    question_id    = EXCLUDED.question_id,
+    category       = EXCLUDED.category,
+    qtype          = EXCLUDED.qtype,
+    llm_score      = EXCLUDED.llm_score,
+    teacher01      = EXCLUDED.teacher01,
+    teacher02      = EXCLUDED.teacher02,
+    human_avg      = EXCLUDED.human_avg,
+    human_weighted = EXCLUDED.human_weighted,
+    final_score    = EXCLUDED.final_score,
+    completed_at   = EXCLUDED.completed_at
+  WHERE (f.user_id, f.question_id, f.category, f.qtype, f.llm_score,
+         f.teacher01, f.teacher02, f.human_avg, f.human_weighted, f.final_score)
+        IS DISTINCT FROM
+        (EXCLUDED.user_id, EXCLUDED.question_id, EXCLUDED.category, EXCLUDED.qtype, EXCLUDED.llm_score,
+         EXCLUDED.teacher01, EXCLUDED.teacher02, EXCLUDED.human_avg, EXCLUDED.human_weighted, EXCLUDED.final_score);
+
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END;
+$func$;
+
+-- triggers: πρώτα aggregates (+ registry), μετά final, στο ίδιο statement
+CREATE OR REPLACE FUNCTION _trg_final_from_transition()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+DECLARE
+  ids UUID[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    ids := ARRAY(SELECT DISTINCT answer_id FROM new_rows);
+  ELSIF TG_OP = 'UPDATE' THEN
+    ids := ARRAY(SELECT answer_id FROM new_rows UNION SELECT answer_id FROM old_rows);
+  ELSE
+    ids := ARRAY(SELECT DISTINCT answer_id FROM old_rows);
+  END IF;
+
+  IF TG_TABLE_NAME = 'human_ratings' THEN
+    IF TG_OP <> 'DELETE' THEN
+      INSERT INTO raters (rater_id)
+      SELECT DISTINCT rater_id FROM new_rows
+      ON CONFLICT (rater_id) DO NOTHING;
+    END IF;
+    PERFORM _refresh_rating_aggregates(ids);
+  END IF;
+
+  PERFORM _recompute_final_set(ids);
+  RETURN NULL;
+END;
+$trg$;
+
+-- backfill: όσα έχουν ratings + όσα final_scores γράφτηκαν ήδη (π.χ. llm_score NULL → 0)
+SELECT _recompute_final_set(ARRAY(
+  SELECT answer_id FROM rating_aggregates UNION SELECT answer_id FROM final_scores
+));
+    """)
+
+
+def downgrade():
+    # επαναφορά των functions του 7c1e4b9a2d30 (pivot σε human_ratings)·
+    # τα triggers μένουν ίδια, αλλάζει μόνο η function που καλούν
+    op.execute("""
+-- set-based recompute για ένα σύνολο answer_ids, επιστρέφει rows changed
+CREATE OR REPLACE FUNCTION _recompute_final_set(ids UUID[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $func$
+DECLARE
+  w NUMERIC := _final_human_weight();
+  n INTEGER;
+BEGIN
+  WITH h AS (
+    SELECT answer_id,
+           _clamp01(MAX(score) FILTER (WHERE rater_id = 'teacher01')) AS t1,
+           _clamp01(MAX(score) FILTER (WHERE rater_id = 'teacher02')) AS t2
+    FROM human_ratings
+    WHERE answer_id = ANY(ids)
+    GROUP BY answer_id
+  ),
+  c AS (
+    SELECT a.answer_id, a.user_id, a.question_id, a.category, a.qtype,
+           _clamp01(l.llm_score) AS llm,
+           h.t1, h.t2,
+           CASE WHEN h.t1 IS NULL AND h.t2 IS NULL THEN NULL
+                ELSE (COALESCE(h.t1, 0) + COALESCE(h.t2, 0))
+                     / ((h.t1 IS NOT NULL)::int + (h.t2 IS NOT NULL)::int)
+           END AS havg
+    FROM answers a
+    LEFT JOIN llm_scores l USING (answer_id)
+    LEFT JOIN h USING (answer_id)
+    WHERE a.answer_id = ANY(ids)
+  )
+  INSERT INTO final_scores AS f (
+    answer_id, user_id, question_id, category, qtype,
+    llm_score, teacher01, teacher02, human_avg, human_weighted, final_score, completed_at
+  )
+  SELECT answer_id, user_id, question_id, category, qtype,
+         llm, t1, t2, havg, havg, _fuse_final(llm, havg, w), now()
+  FROM c
+  ON CONFLICT (answer_id) DO UPDATE SET
+    user_id        = EXCLUDED.user_id,
+    question_id    = EXCLUDED.question_id,
+    category       = EXCLUDED.category,
+    qtype          = EXCLUDED.qtype,
+    llm_score      = EXCLUDED.llm_score,
+    teacher01      = EXCLUDED.teacher01,
+    teacher02      = EXCLUDED.teacher02,
+    human_avg      = EXCLUDED.human_avg,
+    human_weighted = EXCLUDED.human_weighted,
+    final_score    = EXCLUDED.final_score,
+    completed_at   = EXCLUDED.completed_at
+  WHERE (f.user_id, f.question_id, f.category, f.qtype, f.llm_score,
+         f.teacher01, f.teacher02, f.human_avg, f.human_weighted, f.final_score)
+        IS DISTINCT FROM
+        (EXCLUDED.user_id, EXCLUDED.question_id, EXCLUDED.category, EXCLUDED.qtype, EXCLUDED.llm_score,
+         EXCLUDED.teacher01, EXCLUDED.teacher02, EXCLUDED.human_avg, EXCLUDED.human_weighted, EXCLUDED.final_score);
+
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END;
+$func$;
+
+-- statement-level: ένα recompute για τα DISTINCT answer_ids του statement
+CREATE OR REPLACE FUNCTION _trg_final_from_transition()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM _recompute_final_set(ARRAY(SELECT DISTINCT answer_id FROM new_rows));
+  ELSIF TG_OP = 'UPDATE' THEN
+    PERFORM _recompute_final_set(ARRAY(
+      SELECT answer_id FROM new_rows UNION SELECT answer_id FROM old_rows
+    ));
+  ELSE
+    PERFORM _recompute_final_set(ARRAY(SELECT DISTINCT answer_id FROM old_rows));
+  END IF;
+  RETURN NULL;
+END;
+$trg$;
+
+DROP FUNCTION IF EXISTS _refresh_rating_aggregates(UUID[]);
+DROP TABLE IF EXISTS rating_aggregates;
+DROP TABLE IF EXISTS raters;
+    """)
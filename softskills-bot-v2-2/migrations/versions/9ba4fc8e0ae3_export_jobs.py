@@ -0,0 +1,54 @@
+"""export_jobs: background exports (queue + artifacts με λήξη)
+
+Revision ID: 9ba4fc8e0ae3
+Revises: 9aaa30f7ee86
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9ba4fc8e0ae3'
+down_revision: Union[str, Sequence[str], None] = '9aaa30f7ee86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute("""
+CREATE TABLE IF NOT EXISTS export_jobs (
+  job_id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  kind           TEXT NOT NULL,
+  params         JSONB NOT NULL DEFAULT '{}'::jsonb,
+  status         TEXT NOT NULL DEFAULT 'queued'
+                 CHECK (status IN ('queued', 'running', 'done', 'failed', 'expired')),
+  attempts       INT  NOT NULL DEFAULT 0,
+  worker_id      TEXT,
+  bytes_written  BIGINT NOT NULL DEFAULT 0,
+  filename       TEXT,
+  media_type     TEXT,
+  artifact_key   TEXT,
+  error          TEXT,
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+  started_at     TIMESTAMPTZ,
+  heartbeat_at   TIMESTAMPTZ,
+  finished_at    TIMESTAMPTZ,
+  expires_at     TIMESTAMPTZ
+);
+
+-- ο worker διαλέγει το παλαιότερο queued (ή running χωρίς heartbeat)
+CREATE INDEX IF NOT EXISTS idx_export_jobs_pending
+  ON export_jobs (created_at) WHERE status IN ('queued', 'running');
+-- καθάρισμα ληγμένων artifacts
+CREATE INDEX IF NOT EXISTS idx_export_jobs_expiry
+  ON export_jobs (expires_at) WHERE status = 'done';
+""")
+
+
+def downgrade():
+    op.execute("""
+DROP TABLE IF EXISTS export_jobs;
+""")
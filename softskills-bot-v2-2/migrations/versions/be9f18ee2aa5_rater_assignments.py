@@ -0,0 +1,83 @@
+"""rater assignments: N raters, leases with SKIP LOCKED
+
+Revision ID: be9f18ee2aa5
+Revises: 45025dc2ec5d
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'be9f18ee2aa5'
+down_revision: Union[str, Sequence[str], None] = '45025dc2ec5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.execute("""
+-- rater_id: όχι πια μόνο teacher01/teacher02
+ALTER TABLE human_ratings DROP CONSTRAINT IF EXISTS human_ratings_rater_id_check;
+ALTER TABLE human_ratings DROP CONSTRAINT IF EXISTS human_ratings_rater_id_format;
+ALTER TABLE human_ratings ADD CONSTRAINT human_ratings_rater_id_format
+  CHECK (rater_id ~ '^[A-Za-z0-9_.-]{1,64}$');
+
+-- leases: μία γραμμή ανά (answer, rater)
+CREATE TABLE IF NOT EXISTS rater_assignments (
+  answer_id     UUID NOT NULL REFERENCES answers(answer_id) ON DELETE CASCADE,
+  rater_id      TEXT NOT NULL,
+  status        TEXT NOT NULL DEFAULT 'leased'
+                CHECK (status IN ('leased', 'done', 'released', 'expired')),
+  leased_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+  expires_at    TIMESTAMPTZ NOT NULL,
+  completed_at  TIMESTAMPTZ,
+  PRIMARY KEY (answer_id, rater_id)
+);
+CREATE INDEX IF NOT EXISTS idx_rater_assignments_active
+  ON rater_assignments (answer_id) WHERE status = 'leased';
+CREATE INDEX IF NOT EXISTS idx_rater_assignments_expiry
+  ON rater_assignments (expires_at) WHERE status = 'leased';
+CREATE INDEX IF NOT EXISTS idx_rater_assignments_rater_done
+  ON rater_assignments (rater_id, completed_at) WHERE status = 'done';
+
+-- όταν γραφτεί rating → το lease του rater κλείνει (όποιο endpoint κι αν το γράψει)
+CREATE OR REPLACE FUNCTION _trg_assignments_done()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $trg$
+BEGIN
+  UPDATE rater_assignments x
+     SET status = 'done', completed_at = now()
+    FROM (SELECT DISTINCT answer_id, rater_id FROM new_rows) n
+   WHERE x.answer_id = n.answer_id
+     AND x.rater_id = n.rater_id
+     AND x.status <> 'done';
+  RETURN NULL;
+END;
+$trg$;
+
+DROP TRIGGER IF EXISTS trg_human_ratings_assign_ins ON human_ratings;
+CREATE TRIGGER trg_human_ratings_assign_ins
+AFTER INSERT ON human_ratings
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_assignments_done();
+
+DROP TRIGGER IF EXISTS trg_human_ratings_assign_upd ON human_ratings;
+CREATE TRIGGER trg_human_ratings_assign_upd
+AFTER UPDATE ON human_ratings
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION _trg_assignments_done();
+    """)
+
+
+def downgrade():
+    op.execute("""
+DROP TRIGGER IF EXISTS trg_human_ratings_assign_upd ON human_ratings;
+DROP TRIGGER IF EXISTS trg_human_ratings_assign_ins ON human_ratings;
+DROP FUNCTION IF EXISTS _trg_assignments_done();
+DROP TABLE IF EXISTS rater_assignments;
+ALTER TABLE human_ratings DROP CONSTRAINT IF EXISTS human_ratings_rater_id_format;
+    """)
@@ -0,0 +1,105 @@
+# scripts/bench_coldstart.py
+# Benchmark cold start: N φορές καθαρός interpreter → import app.main → startup → πρώτο request.
+# Ό,τι πληρώνει ένα νέο Lambda container πριν απαντήσει (χωρίς το init του runtime).
+#
+#   python scripts/bench_coldstart.py --runs 10 --json coldstart.json
+#   python scripts/bench_coldstart.py --baseline coldstart.json --max-regression 0.2   # CI gate
+#   DB_INIT_MODE=skip python scripts/bench_coldstart.py                                # όπως στο Lambda
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+t2 = time.perf_counter()
+with TestClient(app.main.app) as c:
+    t3 = time.perf_counter()
+    r = c.get(sys.argv[1])
+    t4 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t4 - t3) * 1000,
+    "total_ms": (t1 - t0 + t4 - t2) * 1000,
+    "status": r.status_code,
+    "modules": len(sys.modules),
+}))
+"""
+
+METRICS = ("import_ms", "startup_ms", "first_request_ms", "total_ms")
+
+
+def run_once(path: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:////tmp/softskills-coldstart.db")
+    proc = subprocess.run([sys.executable, "-c", CHILD, path], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+    out = {}
+    for m in METRICS:
+        xs = sorted(s[m] for s in samples)
+        out[m] = {
+            "median": round(statistics.median(xs), 2),
+            "p90": round(xs[min(len(xs) - 1, int(round(0.9 * (len(xs) - 1))))], 2),
+            "min": round(xs[0], 2),
+            "max": round(xs[-1], 2),
+        }
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--path", default="/healthz")
+    ap.add_argument("--json", help="αποθήκευση αποτελεσμάτων (π.χ. ως νέο baseline)")
+    ap.add_argument("--baseline", help="σύγκριση με προηγούμενο JSON")
+    ap.add_argument("--max-regression", type=float, default=0.2,
+                    help="επιτρεπτή αύξηση του median total_ms (0.2 = +20%%)")
+    args = ap.parse_args()
+
+    samples = []
+    for i in range(args.runs):
+        s = run_once(args.path)
+        samples.append(s)
+        print(f"run {i + 1}/{args.runs}: import {s['import_ms']:.0f} ms, startup {s['startup_ms']:.0f} ms, "
+              f"first request {s['first_request_ms']:.0f} ms (HTTP {s['status']})", file=sys.stderr)
+
+    result = {
+        "runs": args.runs,
+        "path": args.path,
+        "python": sys.version.split()[0],
+        "db_init_mode": os.getenv("DB_INIT_MODE", "create_all"),
+        "modules": samples[-1]["modules"],
+        "summary": summarize(samples),
+    }
+    print(json.dumps(result, indent=2))
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        base = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        was = base["summary"]["total_ms"]["median"]
+        now = result["summary"]["total_ms"]["median"]
+        change = (now - was) / was if was else 0.0
+        print(f"total_ms median: {was:.1f} → {now:.1f} ({change:+.1%})", file=sys.stderr)
+        if change > args.max_regression:
+            sys.exit(f"cold start regression {change:+.1%} > {args.max_regression:.0%}")
+
+
+if __name__ == "__main__":
+    main()
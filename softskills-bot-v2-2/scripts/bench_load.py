@@ -0,0 +1,488 @@
+# scripts/bench_load.py
+# End-to-end load test: σηκώνει το app (uvicorn) πάνω σε SQLite ή τοπική PostgreSQL με fake LLM
+# και τρέχει ρεαλιστικά quiz sessions με C ταυτόχρονους χρήστες. Ανά session:
+#   bundle → 16 απαντήσεις (score-mc / score-open / glmp evaluate-and-save) → coach plan
+#   → quiz complete → σελίδες rater → (κάθε --export-every sessions) exports
+# Βγάζει throughput και p50/p95/p99 ανά endpoint + DB queries/request από το /metrics.
+#
+#   python scripts/bench_load.py --sessions 40 --concurrency 8 --json load.json
+#   python scripts/bench_load.py --baseline load.json --max-regression 0.25          # CI gate
+#   python scripts/bench_load.py --database-url postgresql://localhost/softskills_bench --migrate
+#   python scripts/bench_load.py --url http://127.0.0.1:8000                           # ήδη τρέχει
+#
+# Στη SQLite τρέχουν μόνο bundle / glmp / coach / quiz complete: score-*, rater και exports
+# χρησιμοποιούν PostgreSQL SQL (information_schema, DISTINCT ON, FILTER) και βγαίνουν ως errors.
+# Για το πλήρες mix: τοπική PostgreSQL + --migrate (alembic upgrade head στη βάση του bench).
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+API = "/api/softskills"
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", "")
+
+ANSWERS = (
+    "Θα άκουγα πρώτα όλες τις πλευρές και μετά θα πρότεινα σαφή επόμενα βήματα με ημερομηνίες.",
+    "Ρωτάω ανοιχτές ερωτήσεις, συνοψίζω τι κατάλαβα και ελέγχω αν συμφωνούμε πριν προχωρήσουμε.",
+    "Για παράδειγμα, στην ομάδα μου μοιράσαμε τους ρόλους και κάναμε σύντομο check-in κάθε πρωί.",
+    "Εξηγώ το πρόβλημα χωρίς τεχνικό λεξιλόγιο: (1) τι έγινε, (2) τι κάνουμε, (3) πότε θα ξέρουμε.",
+    "Δεν ξέρω.",
+)
+
+
+# ---------------------------------------------------------------------
+# Fake LLM: OpenAI-compatible /v1/chat/completions με σταθερή καθυστέρηση
+# ---------------------------------------------------------------------
+FAKE_CONTENT = json.dumps({
+    "score": 7,
+    "criteria": [{"name": n, "score": s, "explanation": "fake"}
+                 for n, s in (("Clarity", 7), ("Relevance", 8), ("Structure", 6), ("Examples", 5))],
+    "keep": "Σαφής δομή.", "change": "Περισσότερα παραδείγματα.",
+    "action": "Γράψε 3 βήματα.", "drill": "2 λεπτά pitch.",
+    "feedback": "fake llm",
+    "overview": "Εστίαση στα παραδείγματα.",
+    "steps": ["βήμα 1", "βήμα 2", "βήμα 3"],
+    "practice": "micro-drill", "resources": [],
+}, ensure_ascii=False)
+
+
+def start_fake_llm(latency_ms: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("content-length") or 0))
+            time.sleep(latency_ms / 1000)
+            body = json.dumps({
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                "model": "fake-llm",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": FAKE_CONTENT}}],
+                "usage": {"prompt_tokens": 400, "completion_tokens": 120, "total_tokens": 520},
+            }).encode()
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+# ---------------------------------------------------------------------
+# App server (uvicorn subprocess)
+# ---------------------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def check_database_url(url: str, allow_remote: bool) -> None:
+    # το bench γράφει χιλιάδες answers/interactions → ποτέ κατά λάθος στη Neon
+    host = urlsplit(url).hostname or ""
+    if not url.startswith("sqlite") and host not in LOCAL_HOSTS and not allow_remote:
+        sys.exit(f"refusing to load-test non-local database host {host!r} (use --allow-remote-db)")
+
+
+def migrate(database_url: str) -> None:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    proc = subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=ROOT, env=env)
+    if proc.returncode != 0:
+        sys.exit("alembic upgrade head failed")
+
+
+def start_app(args, llm_port: int, workdir: Path):
+    port = _free_port()
+    env = dict(os.environ)
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    else:
+        db = workdir / "bench.db"
+        env["DATABASE_URL"] = f"sqlite:///{db}"
+        env["DB_INIT_MODE"] = "create_all"
+    if args.llm_latency_ms < 0:
+        env["HEURISTIC_ONLY"] = "true"
+        env.pop("OPENAI_API_KEY", None)
+    else:
+        env["OPENAI_API_KEY"] = "fake-key"
+        env["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm_port}/v1"
+        env["OPENAI_MODEL"] = "fake-llm"
+        env["HEURISTIC_ONLY"] = "false"
+    env.update({
+        "MATERIALS_STORE": "local",
+        "MATERIALS_DIR": str(workdir / "materials"),
+        "EXPORT_STORE": "local",
+        "EXPORT_DIR": str(workdir / "exports"),
+        "TRACE_SAMPLE_RATE": "0",
+        "TRACE_FILE": str(workdir / "traces.jsonl"),
+        "METRICS_ENABLED": "true",
+    })
+    log = open(workdir / "server.log", "w", encoding="utf-8")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f"app exited ({proc.returncode}), see {workdir / 'server.log'}")
+        try:
+            if httpx.get(url + "/healthz", timeout=1).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    sys.exit("app did not become ready within 60s")
+
+
+# ---------------------------------------------------------------------
+# Quiz sessions
+# ---------------------------------------------------------------------
+class Recorder:
+    def __init__(self) -> None:
+        self.samples = {}
+        self.errors = {}
+        self.error_samples = {}
+        self.enabled = True
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, path: str, **kw):
+        t0 = time.perf_counter()
+        try:
+            try:
+                r = await client.request(method, path, **kw)
+            except (httpx.ReadError, httpx.RemoteProtocolError):
+                # keep-alive σύνδεση που έκλεισε ο server (π.χ. μετά από σπασμένο streaming export)
+                if method != "GET":
+                    raise
+                r = await client.request(method, path, **kw)
+            ok = r.status_code < 400
+            err = None if ok else f"HTTP {r.status_code}: {r.text[:200]}"
+        except httpx.HTTPError as e:
+            r, ok, err = None, False, repr(e)
+        dt = (time.perf_counter() - t0) * 1000
+        if self.enabled:
+            # latency μόνο για επιτυχημένα· τα errors (συνήθως γρήγορα 4xx/5xx) μετράνε χωριστά
+            self.samples.setdefault(label, [])
+            if ok:
+                self.samples[label].append(dt)
+            else:
+                self.errors[label] = self.errors.get(label, 0) + 1
+                self.error_samples.setdefault(label, err)
+        if not ok or r is None:
+            return None
+        try:
+            return r.json()
+        except ValueError:
+            return r.content
+
+
+def _as_score10(resp) -> float:
+    if not isinstance(resp, dict):
+        return 0.0
+    for k in ("score", "auto_score"):
+        v = resp.get(k)
+        if isinstance(v, (int, float)):
+            return float(v)
+    return 0.0
+
+
+async def run_session(client, rec: Recorder, n: int, args, categories) -> None:
+    rnd = random.Random(args.seed * 100_003 + n)
+    user = f"load-{args.seed}-{n}"
+    category = categories[n % len(categories)]
+    phase = "PRE" if n % 2 == 0 else "POST"
+
+    bundle = await rec.call(client, "bundle", "GET",
+                            f"{API}/questions/bundle/{category}/{phase}/1/{rnd.randint(1, 50)}.json")
+    items = []
+    if isinstance(bundle, dict):
+        items = ([("open", q) for q in bundle.get("open") or []]
+                 + [("mc", q) for q in bundle.get("mc") or []])
+    rnd.shuffle(items)
+
+    results, open_i = [], 0
+    for i in range(args.answers if items else 0):
+        kind, q = items[i % len(items)]
+        if kind == "mc":
+            choices = q.get("choices") or []
+            options = [{"id": chr(65 + j), "text": t} for j, t in enumerate(choices)]
+            resp = await rec.call(client, "score-mc", "POST", f"{API}/score-mc", json={
+                "category": category, "question_id": q["id"], "user_id": user,
+                "question_text": q.get("text") or "", "options": options,
+                "selected_id": rnd.choice(options)["id"] if options else "A",
+            })
+            results.append({"category": category, "type": "mc", "score": _as_score10(resp)})
+            continue
+        text = rnd.choice(ANSWERS)
+        if open_i % 2 == 0:
+            resp = await rec.call(client, "score-open", "POST", f"{API}/score-open", json={
+                "category": category, "question_id": q["id"], "text": text, "user_id": user,
+            })
+        else:
+            resp = await rec.call(client, "glmp-evaluate-and-save", "POST", f"{API}/glmp/evaluate-and-save", json={
+                "meta": {"category": category, "answerId": q["id"], "questionId": q["id"], "userId": user},
+                "text": {"value": text},
+            })
+        open_i += 1
+        if isinstance(resp, dict):
+            results.append({"category": category, "type": "open", "score": _as_score10(resp),
+                            "dimensions": resp.get("dimensions") or {},
+                            "coaching": resp.get("coaching") or {"criteria": resp.get("criteria") or []}})
+
+    await rec.call(client, "coach-session-plan", "POST", f"{API}/coach/session-plan",
+                   json={"results": results, "category": category})
+
+    mean10 = statistics.mean([r["score"] for r in results]) if results else 0.0
+    scores = {c: round(rnd.uniform(20, 90), 1) for c in ("leadership", "communication", "teamwork", "problem_solving")}
+    scores[category.lower().replace(" ", "_")] = round(mean10 * 10, 1)
+    await rec.call(client, "quiz-complete", "POST", f"{API}/quiz/complete",
+                   json={"userId": user, "phase": phase, "attempt": 1, "results": scores})
+
+    rater = f"load-rater-{n % 3}"
+    await rec.call(client, "rater-queue", "GET", f"{API}/rater/queue",
+                   params={"rater_id": rater, "category": category, "limit": 50})
+    await rec.call(client, "rater-items", "GET", f"{API}/rater/items",
+                   params={"rater_id": rater, "category": category})
+
+    if args.export_every and n % args.export_every == 0:
+        await rec.call(client, "report-user-csv", "GET", f"{API}/report/user-csv", params={"user_id": user})
+        await rec.call(client, "rater-results-csv", "GET", f"{API}/rater/results.csv")
+        await rec.call(client, "export-dataset-parquet", "GET", f"{API}/export/dataset.parquet",
+                       params={"table": "answers", "category": category})
+
+
+async def drive(url: str, args) -> dict:
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        cats = await client.get(f"{API}/questions/categories")
+        categories = (cats.json().get("categories") if cats.status_code == 200 else None) or ["Communication"]
+
+        # warmup: caches, connection pool, lazy imports — εκτός μετρήσεων
+        rec.enabled = False
+        await asyncio.gather(*(run_session(client, rec, -1 - i, args, categories)
+                               for i in range(args.warmup)))
+        rec.enabled = True
+
+        queue = iter(range(args.sessions))
+        done = [0]
+
+        async def worker():
+            for n in queue:
+                await run_session(client, rec, n, args, categories)
+                done[0] += 1
+                if done[0] % max(1, args.sessions // 10) == 0:
+                    print(f"  {done[0]}/{args.sessions} sessions", file=sys.stderr)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall = time.perf_counter() - t0
+
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout) as client:
+        metrics = await client.get("/metrics")
+        server = parse_db_metrics(metrics.text) if metrics.status_code == 200 else {}
+
+    return {"wall_s": wall, "samples": rec.samples, "errors": rec.errors,
+            "error_samples": rec.error_samples, "server": server}
+
+
+# ---------------------------------------------------------------------
+# Αποτελέσματα
+# ---------------------------------------------------------------------
+_METRIC_RE = re.compile(r'^softskills_db_(queries_per_request|time_per_request_seconds)_(sum|count)\{route="([^"]*)"\} (\S+)$')
+
+
+def parse_db_metrics(text: str) -> dict:
+    acc = {}
+    for line in text.splitlines():
+        m = _METRIC_RE.match(line)
+        if m:
+            kind, part, route, v = m.groups()
+            acc.setdefault(route, {})[f"{kind}_{part}"] = float(v)
+    out = {}
+    for route, d in sorted(acc.items()):
+        n = d.get("queries_per_request_count") or 0
+        if not n or route.startswith("/_diag") or route in ("/metrics", "/healthz"):
+            continue
+        out[route] = {
+            "requests": int(n),
+            "db_queries_avg": round(d.get("queries_per_request_sum", 0) / n, 2),
+            "db_ms_avg": round(d.get("time_per_request_seconds_sum", 0) * 1000 / n, 2),
+        }
+    return out
+
+
+def pct(xs: list, p: float) -> float:
+    return xs[min(len(xs) - 1, int(round(p * (len(xs) - 1))))]
+
+
+def summarize(raw: dict, args) -> dict:
+    wall = raw["wall_s"]
+    endpoints = {}
+    for label, xs in sorted(raw["samples"].items()):
+        xs = sorted(xs)
+        e = {"count": len(xs), "errors": raw["errors"].get(label, 0), "rps": round(len(xs) / wall, 2)}
+        if xs:
+            e.update({
+                "mean_ms": round(statistics.mean(xs), 2),
+                "p50_ms": round(pct(xs, 0.50), 2),
+                "p95_ms": round(pct(xs, 0.95), 2),
+                "p99_ms": round(pct(xs, 0.99), 2),
+                "max_ms": round(xs[-1], 2),
+            })
+        if label in raw["error_samples"]:
+            e["first_error"] = raw["error_samples"][label]
+        endpoints[label] = e
+    total = sum(e["count"] for e in endpoints.values())
+    return {
+        "config": {
+            "sessions": args.sessions, "concurrency": args.concurrency, "answers": args.answers,
+            "warmup": args.warmup, "export_every": args.export_every, "workers": args.workers,
+            "llm_latency_ms": args.llm_latency_ms, "seed": args.seed,
+            "db": "external" if args.url else ("postgresql" if (args.database_url or "").startswith("postgres") else "sqlite"),
+        },
+        "python": sys.version.split()[0],
+        "commit": _git_head(),
+        "summary": {
+            "wall_s": round(wall, 2),
+            "sessions_per_s": round(args.sessions / wall, 2),
+            "requests": total,
+            "requests_per_s": round(total / wall, 2),
+            "errors": sum(e["errors"] for e in endpoints.values()),
+        },
+        "endpoints": endpoints,
+        "server": raw["server"],
+    }
+
+
+def _git_head() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def print_table(result: dict) -> None:
+    print(f"{'endpoint':<26}{'n':>6}{'err':>5}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}", file=sys.stderr)
+    for label, e in result["endpoints"].items():
+        lat = "".join(f"{e[k]:>9.1f}" if k in e else f"{'-':>9}" for k in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{label:<26}{e['count']:>6}{e['errors']:>5}{e['rps']:>8.1f}{lat}", file=sys.stderr)
+    s = result["summary"]
+    print(f"{s['sessions_per_s']:.2f} sessions/s, {s['requests_per_s']:.1f} req/s, "
+          f"{s['errors']} errors in {s['wall_s']:.1f}s", file=sys.stderr)
+
+
+def _error_rate(e: dict) -> float:
+    n = e["count"] + e["errors"]
+    return e["errors"] / n if n else 0.0
+
+
+def compare(base: dict, now: dict, max_regression: float, min_delta_ms: float) -> list:
+    """Λίστα με regressions: p95 ανά endpoint και DB queries/request ανά route."""
+    out = []
+    for label, e in now["endpoints"].items():
+        b = base.get("endpoints", {}).get(label)
+        if b and _error_rate(e) > _error_rate(b) + 0.01:
+            out.append(f"{label}: error rate {_error_rate(b):.0%} → {_error_rate(e):.0%}")
+        if not b or not b.get("p95_ms") or "p95_ms" not in e:
+            continue
+        change = (e["p95_ms"] - b["p95_ms"]) / b["p95_ms"]
+        flag = change > max_regression and e["p95_ms"] - b["p95_ms"] > min_delta_ms
+        print(f"{label:<26} p95 {b['p95_ms']:>8.1f} → {e['p95_ms']:>8.1f} ms ({change:+.0%})"
+              f"{'  ← REGRESSION' if flag else ''}", file=sys.stderr)
+        if flag:
+            out.append(f"{label}: p95 {change:+.0%}")
+    for route, s in now.get("server", {}).items():
+        b = base.get("server", {}).get(route)
+        # το πλήθος queries είναι ντετερμινιστικό → οποιαδήποτε αύξηση είναι ύποπτη
+        if b and s["db_queries_avg"] > b["db_queries_avg"] + 0.5:
+            out.append(f"{route}: db queries/request {b['db_queries_avg']} → {s['db_queries_avg']}")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=40)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--answers", type=int, default=16, help="απαντήσεις (score/evaluate) ανά session")
+    ap.add_argument("--warmup", type=int, default=2, help="sessions εκτός μετρήσεων")
+    ap.add_argument("--export-every", type=int, default=4, help="exports κάθε N sessions (0 = ποτέ)")
+    ap.add_argument("--llm-latency-ms", type=float, default=300.0,
+                    help="καθυστέρηση του fake LLM (αρνητικό → HEURISTIC_ONLY, χωρίς LLM)")
+    ap.add_argument("--database-url", help="π.χ. τοπική PostgreSQL με alembic upgrade head (default: νέα SQLite)")
+    ap.add_argument("--migrate", action="store_true", help="alembic upgrade head στο --database-url πριν το run")
+    ap.add_argument("--allow-remote-db", action="store_true", help="επιτρέπει --database-url εκτός localhost")
+    ap.add_argument("--url", help="μέτρηση ήδη ανοιχτού server (χωρίς uvicorn / fake LLM)")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", help="αποθήκευση αποτελεσμάτων (π.χ. ως νέο baseline)")
+    ap.add_argument("--baseline", help="σύγκριση με προηγούμενο JSON")
+    ap.add_argument("--max-regression", type=float, default=0.25,
+                    help="επιτρεπτή αύξηση p95 ανά endpoint (0.25 = +25%%)")
+    ap.add_argument("--min-delta-ms", type=float, default=5.0,
+                    help="αγνοούμε αυξήσεις p95 μικρότερες από αυτό (θόρυβος)")
+    args = ap.parse_args()
+
+    if args.database_url:
+        check_database_url(args.database_url, args.allow_remote_db)
+        if args.migrate:
+            migrate(args.database_url)
+
+    llm = proc = None
+    with tempfile.TemporaryDirectory(prefix="softskills-bench-") as tmp:
+        try:
+            if args.url:
+                url = args.url.rstrip("/")
+            else:
+                llm = start_fake_llm(max(args.llm_latency_ms, 0.0))
+                proc, url = start_app(args, llm.server_address[1], Path(tmp))
+            print(f"target {url}: {args.sessions} sessions × {args.answers} answers, "
+                  f"concurrency {args.concurrency}", file=sys.stderr)
+            raw = asyncio.run(drive(url, args))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(timeout=10)
+            if llm is not None:
+                llm.shutdown()
+
+    result = summarize(raw, args)
+    print_table(result)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.baseline:
+        base = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(base, result, args.max_regression, args.min_delta_ms)
+        if regressions:
+            sys.exit("performance regression:\n  " + "\n  ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
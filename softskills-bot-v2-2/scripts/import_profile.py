@@ -0,0 +1,85 @@
+# scripts/import_profile.py
+# Αναφορά import-time για το cold start: τρέχει `python -X importtime -c "import app.main"`
+# σε καθαρό interpreter και βγάζει τα πιο ακριβά modules και ανά top-level πακέτο.
+#
+#   python scripts/import_profile.py                 # top 25
+#   python scripts/import_profile.py --top 50 --json import_profile.json
+#   python scripts/import_profile.py --forbid openai,numpy,boto3   # exit 1 αν φορτώνονται
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Βαριές εξαρτήσεις που πρέπει να φορτώνονται μόνο στην πρώτη χρήση
+HEAVY = ("openai", "httpx", "numpy", "boto3", "botocore", "openpyxl", "langdetect", "pyarrow")
+
+
+def profile(target: str = "app.main"):
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:////tmp/softskills-import-profile.db")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cum_us, mod = line.split("|", 2)
+        self_us = int(head.split(":", 1)[1])
+        cum_us = int(cum_us)
+        mod = mod[1:]  # ένα κενό μετά το "|", μετά 2 ανά επίπεδο
+        rows.append({"module": mod.strip(), "depth": (len(mod) - len(mod.lstrip())) // 2,
+                     "self_ms": self_us / 1000, "cumulative_ms": cum_us / 1000})
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--target", default="app.main")
+    ap.add_argument("--top", type=int, default=25)
+    ap.add_argument("--json", help="γράψε την αναφορά και σε JSON")
+    ap.add_argument("--forbid", default="", help="πακέτα (comma) που ΔΕΝ πρέπει να φορτώνονται")
+    args = ap.parse_args()
+
+    rows = profile(args.target)
+    total = next((r["cumulative_ms"] for r in rows if r["module"] == args.target), 0.0)
+
+    by_pkg = defaultdict(float)
+    for r in rows:
+        by_pkg[r["module"].split(".")[0]] += r["self_ms"]
+    packages = sorted(by_pkg.items(), key=lambda kv: -kv[1])
+    top = sorted(rows, key=lambda r: -r["cumulative_ms"])[: args.top]
+    loaded = sorted({r["module"].split(".")[0] for r in rows})
+    heavy = [p for p in HEAVY if p in loaded]
+
+    print(f"import {args.target}: {total:.1f} ms, {len(rows)} modules")
+    print("\n-- top modules (cumulative) --")
+    for r in top:
+        print(f"{r['cumulative_ms']:9.1f} ms  {'  ' * r['depth']}{r['module']}")
+    print("\n-- per package (self) --")
+    for pkg, ms in packages[:15]:
+        print(f"{ms:9.1f} ms  {pkg}")
+    print(f"\nheavy deps loaded at import: {', '.join(heavy) or '-'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "target": args.target, "total_ms": total, "modules": len(rows),
+            "heavy_loaded": heavy, "top": top,
+            "packages": [{"package": p, "self_ms": round(ms, 3)} for p, ms in packages],
+        }, indent=2), encoding="utf-8")
+
+    forbidden = [p for p in args.forbid.split(",") if p and p in loaded]
+    if forbidden:
+        sys.exit(f"forbidden imports at startup: {', '.join(forbidden)}")
+
+
+if __name__ == "__main__":
+    main()